@@ -50,6 +50,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "yonetim.middleware.SorguButcesiMiddleware",  # SORGU_BUTCESI kapalıysa yüklenmez
+    "yonetim.veritabani.ReplikaMiddleware",  # Replika tanımlı değilse yüklenmez
     "whitenoise.middleware.WhiteNoiseMiddleware", # Yeni eklendi
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -59,6 +61,17 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# İstek başına sorgu bütçesi / N+1 dedektörü (yük testleri için açılabilir)
+SORGU_BUTCESI = {
+    "ETKIN": os.environ.get("SORGU_BUTCESI", "False") == "True",
+    "VARSAYILAN_LIMIT": int(os.environ.get("SORGU_BUTCESI_LIMIT", "30")),
+    "SURE_LIMITI_MS": int(os.environ.get("SORGU_BUTCESI_SURE_MS", "500")),
+    "TEKRAR_ESIGI": int(os.environ.get("SORGU_BUTCESI_TEKRAR", "5")),
+    # View adına özel limitler, ör. {"yonetim:ana_sayfa": 10}
+    "VIEW_LIMITLERI": {},
+    "BASLIKLAR": True,
+}
+
 ROOT_URLCONF = "sube_yonetim.urls"
 
 TEMPLATES = [
@@ -85,17 +98,108 @@ LOGOUT_REDIRECT_URL = "login"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Bağlantı havuzu: DB_POOL=True iken PostgreSQL bağlantıları her süreçte
+# psycopg 3 havuzundan alınır (iş parçacıklı worker'larda süreç başına en fazla
+# DB_POOL_MAX bağlantı). Havuz kalıcı bağlantıyla birlikte kullanılamadığından
+# CONN_MAX_AGE 0 olur. Havuz kapalıyken bağlantılar CONN_MAX_AGE boyunca
+# tutulur. Her iki durumda da kopmuş bağlantı istek başında yenilenir.
+DB_POOL = os.environ.get("DB_POOL", "False") == "True"
+DB_POOL_AYARLARI = {
+    "min_size": int(os.environ.get("DB_POOL_MIN", "2")),
+    "max_size": int(os.environ.get("DB_POOL_MAX", "10")),
+    # Boş bağlantı beklerken en fazla bu kadar saniye beklenir
+    "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "10")),
+}
+_CONN_MAX_AGE = int(os.environ.get("CONN_MAX_AGE", "600"))  # Bağlantı ömrü (saniye)
+_CONN_HEALTH_CHECKS = os.environ.get("CONN_HEALTH_CHECKS", "True") == "True"
+
+
+def _veritabani_ayari(ayar):
+    if DB_POOL and "postgresql" in ayar.get("ENGINE", ""):
+        ayar["CONN_MAX_AGE"] = 0
+        ayar.setdefault("OPTIONS", {})["pool"] = dict(DB_POOL_AYARLARI)
+    return ayar
+
+
 DATABASES = {
-    'default': dj_database_url.config(
+    'default': _veritabani_ayari(dj_database_url.config(
         default=os.environ.get('DATABASE_URL'),
-        conn_max_age=600 # Bağlantı ömrü (saniye)
-    )
+        conn_max_age=_CONN_MAX_AGE,
+        conn_health_checks=_CONN_HEALTH_CHECKS,
+    ))
 }
 
+# Okuma replikaları: DATABASE_REPLICA_URLS virgülle ayrılmış URL listesidir.
+# Ana sayfa, listeler, yazdırma/dışa aktarım ve raporlar bu veritabanlarından
+# okur (bkz. yonetim/veritabani.py). Testlerde replikalar birincilin aynası
+# sayılır, ayrı test veritabanı kurulmaz.
+REPLIKA_VERITABANLARI = []
+for _sira, _url in enumerate(
+    [u.strip() for u in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if u.strip()],
+    start=1,
+):
+    _alias = f"replika_{_sira}"
+    DATABASES[_alias] = _veritabani_ayari(dj_database_url.parse(
+        _url, conn_max_age=_CONN_MAX_AGE, conn_health_checks=_CONN_HEALTH_CHECKS
+    ))
+    DATABASES[_alias]["TEST"] = {"MIRROR": "default"}
+    REPLIKA_VERITABANLARI.append(_alias)
+
+DATABASE_ROUTERS = ["yonetim.veritabani.ReplikaRouter"]
+
+REPLIKA = {
+    # Bu kadar saniyeden fazla geride kalan replika atlanır (PostgreSQL)
+    "GECIKME_LIMITI": float(os.environ.get("REPLIKA_GECIKME_LIMITI", "5")),
+    # Replika sağlığı kaç saniyede bir yeniden ölçülür
+    "KONTROL_ARALIGI": float(os.environ.get("REPLIKA_KONTROL_ARALIGI", "5")),
+    # Veri değiştiren bir istekten sonra kullanıcı kaç saniye birincilden okur
+    "YAPISKANLIK_SURESI": int(os.environ.get("REPLIKA_YAPISKANLIK_SURESI", "10")),
+}
+
+
+# Önbellek
+# CACHE_BACKEND: "locmem" (varsayılan, süreç içi), "file" veya "redis".
+# Birden fazla worker çalışıyorsa geçersiz kılmaların tüm süreçlere ulaşması
+# için paylaşılan bir backend (file/redis) seçilmelidir. "redis" için
+# ``redis`` paketi kurulu olmalıdır (Redis uyumlu herhangi bir sunucu olur).
+_CACHE_BACKENDLERI = {
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "sube-yonetim"),
+    "file": (
+        "django.core.cache.backends.filebased.FileBasedCache",
+        str(BASE_DIR / ".cache"),
+    ),
+    "redis": ("django.core.cache.backends.redis.RedisCache", "redis://127.0.0.1:6379/1"),
+    "dummy": ("django.core.cache.backends.dummy.DummyCache", ""),
+}
+_cache_backend, _cache_location = _CACHE_BACKENDLERI[
+    os.environ.get("CACHE_BACKEND", "locmem")
+]
+# Veri sürümleri önbellekte tutulur; ETag'li koşullu GET ve sürümlü parça/sonuç
+# önbellekleri yalnızca tüm süreçlerin (worker'lar, yönetim komutları) aynı
+# önbelleği gördüğü bir backend'de açılır (bkz. yonetim/onbellek.py)
+ONBELLEK_PAYLASIMLI = os.environ.get("CACHE_BACKEND", "locmem") in ("file", "redis")
+CACHES = {
+    "default": {
+        "BACKEND": _cache_backend,
+        "LOCATION": os.environ.get("CACHE_LOCATION", _cache_location),
+        "TIMEOUT": int(os.environ.get("CACHE_TIMEOUT", "300")),
+        "KEY_PREFIX": "sube_yonetim",
+    }
+}
+
+# Ana sayfa / şube listesi şablon parçalarının önbellekte kalma süresi (saniye).
+# Veri değiştiğinde sinyaller parçaları ayrıca geçersiz kılar.
+PARCA_ONBELLEK_SURESI = int(os.environ.get("PARCA_ONBELLEK_SURESI", "600"))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
+# Rol ve izinleri istekler arası önbellekte tutan backend (bkz. yonetim/roller.py)
+AUTHENTICATION_BACKENDS = [
+    "yonetim.backends.OnbellekliModelBackend",
+]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -132,6 +236,14 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
+# Arka planda üretilen dışa aktarım dosyaları (yalnızca indirme view'ı üzerinden sunulur)
+MEDIA_URL = "media/"
+MEDIA_ROOT = Path(os.environ.get("MEDIA_ROOT", BASE_DIR / "media"))
+
+# Bu boyuttan (bayt) büyük içe aktarım dosyaları istek içinde değil,
+# run_export_worker kuyruğunda işlenir
+ICE_AKTARIM_KUYRUK_ESIGI = int(os.environ.get("ICE_AKTARIM_KUYRUK_ESIGI", 2 * 1024 * 1024))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User, Group
+from django.db.models import F
 from django.utils.html import format_html
 from .models import Sube, Personel, GelirGider, Mesai
 
@@ -24,6 +25,9 @@ class UserAdmin(BaseUserAdmin):
         "user_permissions",
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related("groups")
+
     def get_groups(self, obj):
         return ", ".join([g.name for g in obj.groups.all()])
 
@@ -60,50 +64,37 @@ class SubeAdmin(admin.ModelAdmin):
     readonly_fields = ["olusturma_tarihi", "guncelleme_tarihi"]
 
     def get_queryset(self, request):
-        qs = super().get_queryset(request)
-        return qs.annotate(
-            _personel_sayisi=Count("personel", distinct=True),
-            _toplam_gelir=Sum(
-                Case(
-                    When(gelirgider__tip="gelir", then="gelirgider__tutar"),
-                    default=Value(0),
-                    output_field=DecimalField(),
-                )
-            ),
-            _toplam_gider=Sum(
-                Case(
-                    When(gelirgider__tip="gider", then="gelirgider__tutar"),
-                    default=Value(0),
-                    output_field=DecimalField(),
-                )
-            ),
+        # Toplamlar Sube üzerindeki sayaçlardan okunur (bkz. Sube.sayaclari_degistir);
+        # personel ve gelir/gider tabloları birleştirilmez, satırlar çoğalmaz
+        return super().get_queryset(request).annotate(
+            _net_kar=F("gelir_toplami") - F("gider_toplami")
         )
 
     def personel_sayisi_display(self, obj):
-        return obj._personel_sayisi
+        return obj.personel_sayisi()
 
     personel_sayisi_display.short_description = "Personel Sayısı"
-    personel_sayisi_display.admin_order_field = "_personel_sayisi"
+    personel_sayisi_display.admin_order_field = "personel_adedi"
 
     def toplam_gelir_display(self, obj):
-        return f"{obj._toplam_gelir:,.2f} ₺"
+        return f"{obj.toplam_gelir():,.2f} ₺"
 
     toplam_gelir_display.short_description = "Toplam Gelir"
-    toplam_gelir_display.admin_order_field = "_toplam_gelir"
+    toplam_gelir_display.admin_order_field = "gelir_toplami"
 
     def toplam_gider_display(self, obj):
-        return f"{obj._toplam_gider:,.2f} ₺"
+        return f"{obj.toplam_gider():,.2f} ₺"
 
     toplam_gider_display.short_description = "Toplam Gider"
-    toplam_gider_display.admin_order_field = "_toplam_gider"
+    toplam_gider_display.admin_order_field = "gider_toplami"
 
     def net_kar_display(self, obj):
-        net = obj._toplam_gelir - obj._toplam_gider
+        net = obj.net_kar()
         color = "green" if net >= 0 else "red"
-        return format_html('<span style="color: {};">{:.2f} ₺</span>', color, net)
+        return format_html('<span style="color: {};">{} ₺</span>', color, f"{net:.2f}")
 
     net_kar_display.short_description = "Net Kar/Zarar"
-    net_kar_display.admin_order_field = "_toplam_gelir" # Can't order by calculated field directly, use one of its components
+    net_kar_display.admin_order_field = "_net_kar"
 
 
 @admin.register(Personel)
@@ -112,6 +103,7 @@ class PersonelAdmin(admin.ModelAdmin):
         "tam_ad",
         "sube",
         "pozisyon",
+        "bu_ay_mesai_display",
         "toplam_mesai_display",
         "ise_baslama_tarihi",
         "telefon",
@@ -119,18 +111,23 @@ class PersonelAdmin(admin.ModelAdmin):
     list_filter = ["sube", "pozisyon", "ise_baslama_tarihi"]
     search_fields = ["ad", "soyad", "pozisyon", "email"]
     readonly_fields = ["olusturma_tarihi", "guncelleme_tarihi"]
+    list_select_related = ["sube"]
 
     def get_queryset(self, request):
-        qs = super().get_queryset(request)
-        return qs.annotate(
-            _toplam_mesai=Sum("mesai__saat")
-        )
+        # Mesai toplamları PersonelAylikMesai özet tablosundan okunur
+        return super().get_queryset(request).mesai_toplamlari()
+
+    def bu_ay_mesai_display(self, obj):
+        return f"{obj.bu_ay_mesai:.2f} saat"
+
+    bu_ay_mesai_display.short_description = "Bu Ay Mesai"
+    bu_ay_mesai_display.admin_order_field = "bu_ay_mesai"
 
     def toplam_mesai_display(self, obj):
-        return f"{obj._toplam_mesai or 0} saat"
+        return f"{obj.toplam_mesai:.2f} saat"
 
     toplam_mesai_display.short_description = "Toplam Mesai"
-    toplam_mesai_display.admin_order_field = "_toplam_mesai"
+    toplam_mesai_display.admin_order_field = "toplam_mesai"
 
 
 @admin.register(Mesai)
@@ -6,4 +6,4 @@ class YonetimConfig(AppConfig):
     name = "yonetim"
 
     def ready(self):
-        pass
+        from . import checks, signals  # noqa: F401
@@ -0,0 +1,83 @@
+"""Personel ve mesai araması.
+
+``icontains`` her aramada ``ILIKE '%q%'`` ile tabloyu baştan sona tarar ve
+Türkçe büyük/küçük harfleri (``İ/i``, ``I/ı``) doğru eşleştirmez. Bunun
+yerine aranacak alanlar kayıt edilirken ``turkce_katla`` ile küçük harfe ve
+Türkçe karakterlerden arındırılmış tek bir ``arama_metni`` sütununa yazılır;
+arama terimi de aynı şekilde katlanıp bu sütunda aranır. PostgreSQL'de sütun
+üzerinde ``pg_trgm`` GIN indeksi bulunduğundan ``LIKE '%q%'`` indeksle
+çözülür (bkz. migration 0014). SQLite'ta aynı sorgu indekssiz çalışır.
+"""
+
+import unicodedata
+
+from django.db.models import Case, IntegerField, Q, Value, When
+
+_KATLAMA_TABLOSU = str.maketrans(
+    {
+        "İ": "i",
+        "I": "i",
+        "ı": "i",
+        "Ş": "s",
+        "ş": "s",
+        "Ğ": "g",
+        "ğ": "g",
+        "Ü": "u",
+        "ü": "u",
+        "Ö": "o",
+        "ö": "o",
+        "Ç": "c",
+        "ç": "c",
+    }
+)
+
+
+def turkce_katla(metin):
+    """Metni aramaya uygun hâle getirir: ``"IŞIK İnce"`` -> ``"isik ince"``.
+
+    Türkçe harfler ASCII karşılıklarına indirgenir; böylece ``ışık``, ``IŞIK``
+    ve ``isik`` aynı terime katlanır. Boşluklar teke indirilir.
+    """
+    if not metin:
+        return ""
+    metin = unicodedata.normalize("NFC", str(metin)).translate(_KATLAMA_TABLOSU)
+    metin = unicodedata.normalize("NFKD", metin.lower())
+    metin = "".join(harf for harf in metin if not unicodedata.combining(harf))
+    return " ".join(metin.split())
+
+
+def arama_metni(*parcalar):
+    return turkce_katla(" ".join(str(p) for p in parcalar if p))
+
+
+def arama_terimleri(q):
+    return turkce_katla(q).split()
+
+
+def arama_kosulu(q, *alanlar):
+    """Her terimin verilen ``arama_metni`` alanlarından en az birinde geçmesi koşulu."""
+    kosul = Q()
+    for terim in arama_terimleri(q):
+        terim_kosulu = Q()
+        for alan in alanlar:
+            terim_kosulu |= Q(**{f"{alan}__contains": terim})
+        kosul &= terim_kosulu
+    return kosul
+
+
+def arama_sirasi(q, alan):
+    """Sonuçları ilgiye göre sıralamak için puan (küçük olan önce gelir).
+
+    Metin ilk terimle başlıyorsa 0, bir kelime ilk terimle başlıyorsa 1,
+    terim yalnızca kelime ortasında geçiyorsa 2.
+    """
+    terimler = arama_terimleri(q)
+    if not terimler:
+        return Value(0, output_field=IntegerField())
+    ilk = terimler[0]
+    return Case(
+        When(**{f"{alan}__startswith": ilk}, then=Value(0)),
+        When(**{f"{alan}__contains": f" {ilk}"}, then=Value(1)),
+        default=Value(2),
+        output_field=IntegerField(),
+    )
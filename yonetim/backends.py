@@ -0,0 +1,19 @@
+from django.contrib.auth.backends import ModelBackend
+
+from .roller import kullanici_rolleri
+
+
+class OnbellekliModelBackend(ModelBackend):
+    """İzinleri istekler arası önbellekten okuyan ``ModelBackend``.
+
+    Django'nun varsayılan backend'i izinleri yalnızca tek istek boyunca
+    (``user._perm_cache``) saklar; burada aynı küme ``yonetim.roller``
+    önbelleğinden gelir ve grup adlarıyla birlikte hesaplanır.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, "_perm_cache"):
+            user_obj._perm_cache = set(kullanici_rolleri(user_obj)["izinler"])
+        return user_obj._perm_cache
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+
+@register(Tags.caches, deploy=True)
+def paylasimli_onbellek(app_configs, **kwargs):
+    """Sürümlü önbellekler süreç içi backend'de kapalı kalır; dağıtımda uyarır."""
+    if settings.ONBELLEK_PAYLASIMLI:
+        return []
+    return [
+        Error(
+            "Önbellek süreç içi (locmem/dummy); veri sürümleri worker'lar ve "
+            "yönetim komutları arasında paylaşılmıyor. Koşullu GET ve şablon "
+            "parçası önbellekleri kapalı.",
+            hint="CACHE_BACKEND=redis ya da CACHE_BACKEND=file ayarlayın.",
+            id="yonetim.E001",
+        )
+    ]
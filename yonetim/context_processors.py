@@ -1,9 +1,9 @@
+from .roller import sube_muduru_mu
+
+
 def user_roles_processor(request):
     """
     Tüm şablonlara kullanıcının temel rol bilgilerini ekler.
+    Roller önbellekten okunur (bkz. ``yonetim.roller``); her render'da sorgu atılmaz.
     """
-    is_sube_muduru = False
-    if request.user.is_authenticated:
-        is_sube_muduru = request.user.groups.filter(name="Şube Müdürü").exists()
-
-    return {"is_sube_muduru": is_sube_muduru}
+    return {"is_sube_muduru": sube_muduru_mu(request.user)}
@@ -0,0 +1,82 @@
+"""Excel (.xlsx) dışa aktarımları için ortak, bellek dostu yardımcılar.
+
+Çalışma kitapları openpyxl'in yazma modunda (``write_only=True``) oluşturulur;
+satırlar sorgudan parça parça okunup doğrudan sayfaya eklenir ve sonuç
+``SpooledTemporaryFile`` üzerinden ``FileResponse`` ile akıtılır. Böylece
+bellek kullanımı satır sayısından bağımsız kalır.
+"""
+
+import tempfile
+
+from django.http import FileResponse
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+XLSX_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+)
+
+# Sorgu iteratörünün veritabanından tek seferde çektiği satır sayısı
+EXPORT_CHUNK_SIZE = 2000
+
+# Bu boyutu aşan dosyalar bellekten diske taşınır
+BELLEK_ESIGI = 8 * 1024 * 1024
+
+PERSONEL_EXCEL_BASLIKLARI = [
+    "Ad",
+    "Soyad",
+    "Pozisyon",
+    "Şube",
+    "İşe Başlama Tarihi",
+    "Telefon",
+    "Email",
+]
+PERSONEL_EXCEL_ALANLARI = [
+    "ad",
+    "soyad",
+    "pozisyon",
+    "sube__ad",
+    "ise_baslama_tarihi",
+    "telefon",
+    "email",
+]
+
+
+def yazma_modunda_kitap():
+    """Satır satır yazılacak, hücreleri bellekte tutmayan bir çalışma kitabı döner."""
+    return Workbook(write_only=True)
+
+
+def sayfa_olustur(workbook, baslik, basliklar, genislikler=None):
+    """Kalın başlık satırı ve sütun genişlikleri ayarlanmış yeni bir sayfa ekler."""
+    worksheet = workbook.create_sheet(title=baslik)
+    for col_idx, genislik in enumerate(genislikler or [], 1):
+        worksheet.column_dimensions[get_column_letter(col_idx)].width = genislik
+
+    header_font = Font(bold=True)
+    header_row = []
+    for header in basliklar:
+        cell = WriteOnlyCell(worksheet, value=header)
+        cell.font = header_font
+        header_row.append(cell)
+    worksheet.append(header_row)
+    return worksheet
+
+
+def xlsx_yaniti(yazici, params):
+    """``yazici(params, hedef)`` ile üretilen dosyayı indirme yanıtı olarak akıtır.
+
+    Yazıcı önerilen dosya adını döner; dosya önce bellekte, ``BELLEK_ESIGI``
+    aşılınca diskte tutulan geçici bir dosyaya yazılır.
+    """
+    dosya = tempfile.SpooledTemporaryFile(max_size=BELLEK_ESIGI)
+    dosya_adi = yazici(params, dosya)
+    dosya.seek(0)
+    return FileResponse(
+        dosya,
+        as_attachment=True,
+        filename=dosya_adi,
+        content_type=XLSX_CONTENT_TYPE,
+    )
@@ -0,0 +1,217 @@
+"""Liste, yazdırma ve dışa aktarım görünümlerinin ortak filtre motoru.
+
+Her filtre sınıfı sorgu parametrelerini (``request.GET`` ya da arka plan
+işinde saklanan sözlük) bir kez form ile doğrular, geçersiz değerleri yok
+sayar ve kanonik bir queryset üretir. Aynı filtreler her yolda aynı SQL'i
+(aynı ``WHERE`` ve ``ORDER BY``) üretir; ``anahtar`` ise parametrelerin
+yazılış sırasından ve boş değerlerden bağımsızdır. Böylece sayım ve toplamlar
+liste, yazdırma ve dışa aktarım arasında önbellekten paylaşılabilir.
+"""
+
+import hashlib
+import json
+from datetime import date
+
+from django import forms
+from django.conf import settings
+from django.db.models import Count, Sum
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from . import onbellek
+from .arama import arama_kosulu, arama_sirasi
+from .models import GelirGider, Mesai, Personel
+
+TARIH_GIRIS_BICIMLERI = ["%Y-%m-%d", "%d.%m.%Y"]
+
+
+class PersonelFiltreFormu(forms.Form):
+    sube = forms.IntegerField(required=False, min_value=1)
+    q = forms.CharField(required=False, max_length=100)
+
+
+class GelirGiderFiltreFormu(forms.Form):
+    tip = forms.ChoiceField(required=False, choices=GelirGider.TIP_SECENEKLERI)
+    sube = forms.IntegerField(required=False, min_value=1)
+    baslangic = forms.DateField(required=False, input_formats=TARIH_GIRIS_BICIMLERI)
+    bitis = forms.DateField(required=False, input_formats=TARIH_GIRIS_BICIMLERI)
+
+
+class AySecimFormu(forms.Form):
+    year = forms.IntegerField(required=False, min_value=1900, max_value=2100)
+    month = forms.IntegerField(required=False, min_value=1, max_value=12)
+
+
+class MesaiFiltreFormu(AySecimFormu):
+    personel = forms.IntegerField(required=False, min_value=1)
+    sube = forms.IntegerField(required=False, min_value=1)
+    q = forms.CharField(required=False, max_length=100)
+
+
+class Filtre:
+    """Doğrulanmış filtre değerleri ve bunlardan üretilen kanonik queryset.
+
+    Alt sınıflar ``ad``, ``form_sinifi``, ``siralama`` ve ``_sorgu()``
+    tanımlar. Geçersiz parametreler hata vermez, filtre hiç verilmemiş gibi
+    davranılır.
+    """
+
+    ad = None
+    form_sinifi = None
+    siralama = ()
+
+    def __init__(self, params):
+        form = self.form_sinifi(params)
+        form.is_valid()
+        self.hatalar = form.errors
+        self.degerler = {
+            alan: deger
+            for alan, deger in form.cleaned_data.items()
+            if deger not in (None, "")
+        }
+        self.varsayilanlari_uygula()
+
+    def varsayilanlari_uygula(self):
+        pass
+
+    def get(self, alan, varsayilan=None):
+        return self.degerler.get(alan, varsayilan)
+
+    def metin(self, alan):
+        """Şablonda ``<option>`` karşılaştırması ve URL için değerin metin hâli."""
+        deger = self.degerler.get(alan)
+        if deger is None:
+            return ""
+        if isinstance(deger, date):
+            return deger.isoformat()
+        return str(deger)
+
+    def parametreler(self):
+        """Kanonik değerleri arka plan işine saklanabilecek bir sözlük olarak döner."""
+        return {alan: self.metin(alan) for alan in sorted(self.degerler)}
+
+    @cached_property
+    def anahtar(self):
+        veri = json.dumps(self.parametreler(), sort_keys=True)
+        return f"{self.ad}:{hashlib.sha1(veri.encode()).hexdigest()[:16]}"
+
+    def _sorgu(self):
+        raise NotImplementedError
+
+    def queryset(self):
+        return self._sorgu().order_by(*self.siralama)
+
+    def sayi(self):
+        return self.onbellekli("sayi", lambda: self._sorgu().count())
+
+    def onbellekli(self, ad, hesapla):
+        """Bu filtreye ait bir sonucu (sayım, toplam) veri sürümüyle önbellekler.
+
+        ``signals.py`` ilgili model yazıldığında sürümü artırır, eski sonuçlar
+        bir daha okunmaz.
+        """
+        if not onbellek.paylasimli():
+            return hesapla()
+        surum = onbellek.surum(self.ad)
+        return onbellek.getir(
+            f"yonetim:filtre:{surum}:{self.anahtar}:{ad}",
+            hesapla,
+            settings.PARCA_ONBELLEK_SURESI,
+        )
+
+
+class PersonelFiltresi(Filtre):
+    ad = onbellek.PERSONEL
+    form_sinifi = PersonelFiltreFormu
+
+    @property
+    def siralama(self):
+        # Aramada önce ilgiye göre (bkz. arama.arama_sirasi), sonra ada göre
+        if self.degerler.get("q"):
+            return ("arama_sirasi", "ad", "soyad", "id")
+        return ("ad", "soyad", "id")
+
+    def _sorgu(self):
+        personeller = Personel.objects.select_related("sube")
+        if "sube" in self.degerler:
+            personeller = personeller.filter(sube_id=self.degerler["sube"])
+        q = self.degerler.get("q")
+        if q:
+            personeller = personeller.filter(arama_kosulu(q, "arama_metni")).annotate(
+                arama_sirasi=arama_sirasi(q, "arama_metni")
+            )
+        return personeller
+
+
+class GelirGiderFiltresi(Filtre):
+    ad = onbellek.GELIR_GIDER
+    form_sinifi = GelirGiderFiltreFormu
+    siralama = ("-tarih", "-id")
+
+    def _sorgu(self):
+        gelir_giderler = GelirGider.objects.select_related("sube")
+        if "tip" in self.degerler:
+            gelir_giderler = gelir_giderler.filter(tip=self.degerler["tip"])
+        if "sube" in self.degerler:
+            gelir_giderler = gelir_giderler.filter(sube_id=self.degerler["sube"])
+        if "baslangic" in self.degerler:
+            gelir_giderler = gelir_giderler.filter(tarih__gte=self.degerler["baslangic"])
+        if "bitis" in self.degerler:
+            gelir_giderler = gelir_giderler.filter(tarih__lte=self.degerler["bitis"])
+        return gelir_giderler
+
+    def ozet(self):
+        """Kayıt sayısı ve gelir/gider toplamları (bkz. ``GelirGiderQuerySet.ozet``)."""
+        return self.onbellekli("ozet", lambda: self._sorgu().ozet())
+
+
+class MesaiFiltresi(Filtre):
+    ad = onbellek.MESAI
+    form_sinifi = MesaiFiltreFormu
+    siralama = ("-tarih", "-saat")
+
+    def varsayilanlari_uygula(self):
+        bugun = timezone.now().date()
+        self.degerler.setdefault("year", bugun.year)
+        self.degerler.setdefault("month", bugun.month)
+
+    @property
+    def ay_baslangici(self):
+        return date(self.degerler["year"], self.degerler["month"], 1)
+
+    @property
+    def ay_bitisi(self):
+        """Ayın ertesi ayının ilk günü (aralık sonu hariç)."""
+        baslangic = self.ay_baslangici
+        if baslangic.month == 12:
+            return baslangic.replace(year=baslangic.year + 1, month=1)
+        return baslangic.replace(month=baslangic.month + 1)
+
+    def _sorgu(self):
+        mesailer = Mesai.objects.select_related("personel", "personel__sube").filter(
+            tarih__gte=self.ay_baslangici, tarih__lt=self.ay_bitisi
+        )
+        if "personel" in self.degerler:
+            mesailer = mesailer.filter(personel_id=self.degerler["personel"])
+        if "sube" in self.degerler:
+            mesailer = mesailer.filter(personel__sube_id=self.degerler["sube"])
+        q = self.degerler.get("q")
+        if q:
+            mesailer = mesailer.filter(
+                arama_kosulu(q, "personel__arama_metni", "arama_metni")
+            )
+        return mesailer
+
+    def ozet(self):
+        """Kayıt sayısı, toplam mesai saati ve mesaisi olan personel sayısı."""
+
+        def hesapla():
+            sonuc = self._sorgu().aggregate(
+                kayit_sayisi=Count("id"),
+                toplam_mesai=Sum("saat"),
+                personel_sayisi=Count("personel", distinct=True),
+            )
+            sonuc["toplam_mesai"] = sonuc["toplam_mesai"] or 0
+            return sonuc
+
+        return self.onbellekli("ozet", hesapla)
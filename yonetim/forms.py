@@ -1,6 +1,8 @@
 from django import forms
 from .models import Sube, Personel, GelirGider, Mesai
+from .ice_aktarim import IceAktarimHatasi, dosya_bicimi
 from django.utils import timezone
+from decimal import Decimal
 
 
 class SubeForm(forms.ModelForm):
@@ -181,3 +183,91 @@ class GelirGiderForm(forms.ModelForm):
                 }
             ),
         }
+
+
+GIRIS_SINIFI = "w-full px-3 py-2 border border-gray-300 dark:border-gray-600 rounded-md bg-white dark:bg-gray-700 text-gray-900 dark:text-gray-200 focus:outline-none focus:ring-2 focus:ring-blue-500"
+
+
+class TopluMesaiSecimForm(forms.Form):
+    """Toplu mesai girişinde şube ve tarih seçimi."""
+
+    sube = forms.ModelChoiceField(
+        queryset=Sube.objects.all(),
+        label="Şube",
+        widget=forms.Select(attrs={"class": GIRIS_SINIFI}),
+    )
+    tarih = forms.DateField(
+        label="Tarih",
+        widget=forms.DateInput(format="%Y-%m-%d", attrs={"class": GIRIS_SINIFI, "type": "date"}),
+    )
+
+
+class TopluMesaiSatirForm(forms.Form):
+    """Toplu mesai girişinde tek personelin satırı; saat boşsa satır atlanır."""
+
+    personel = forms.IntegerField(widget=forms.HiddenInput)
+    saat = forms.DecimalField(
+        label="Mesai Saati",
+        required=False,
+        max_digits=5,
+        decimal_places=2,
+        min_value=Decimal("0.00"),
+        widget=forms.NumberInput(attrs={"class": GIRIS_SINIFI, "min": "0", "step": "0.5"}),
+    )
+    aciklama = forms.CharField(
+        label="Açıklama",
+        required=False,
+        widget=forms.TextInput(attrs={"class": GIRIS_SINIFI, "placeholder": "Opsiyonel"}),
+    )
+
+
+class BaseTopluMesaiFormSet(forms.BaseFormSet):
+    """Satırları birlikte doğrular: personel şubeye ait olmalı ve tekrar etmemeli."""
+
+    def __init__(self, *args, personeller=None, **kwargs):
+        self.personeller = personeller or {}
+        super().__init__(*args, **kwargs)
+
+    def clean(self):
+        super().clean()
+        gorulenler = set()
+        for form in self.forms:
+            personel_id = form.cleaned_data.get("personel")
+            if personel_id is None:
+                continue
+            if personel_id not in self.personeller:
+                form.add_error(None, "Personel seçilen şubeye ait değil.")
+            elif personel_id in gorulenler:
+                form.add_error(None, "Bu personel için birden fazla satır gönderildi.")
+            gorulenler.add(personel_id)
+
+    def doldurulan_satirlar(self):
+        return [
+            form.cleaned_data
+            for form in self.forms
+            if form.cleaned_data.get("saat") is not None
+        ]
+
+
+TopluMesaiFormSet = forms.formset_factory(
+    TopluMesaiSatirForm, formset=BaseTopluMesaiFormSet, extra=0
+)
+
+
+class GelirGiderIceAktarimForm(forms.Form):
+    dosya = forms.FileField(
+        label="Dosya (.csv veya .xlsx)",
+        widget=forms.ClearableFileInput(attrs={"class": GIRIS_SINIFI, "accept": ".csv,.xlsx"}),
+    )
+    kuru = forms.BooleanField(
+        label="Yalnızca doğrula (kayıt yazma)",
+        required=False,
+    )
+
+    def clean_dosya(self):
+        dosya = self.cleaned_data["dosya"]
+        try:
+            dosya_bicimi(dosya.name)
+        except IceAktarimHatasi as e:
+            raise forms.ValidationError(str(e))
+        return dosya
@@ -0,0 +1,343 @@
+"""POS/kasa dökümlerinden GelirGider kayıtlarının toplu içe aktarımı.
+
+CSV ve XLSX dosyaları satır satır okunur (XLSX için openpyxl salt-okuma
+modu), satırlar ``parca_boyutu`` kadarlık parçalar hâlinde model kurallarına
+göre doğrulanır ve her parça tek ``bulk_create`` ile yazılır. Bellekte hiçbir
+anda bir parçadan fazla satır tutulmaz; milyon satırlık dosyalar da sabit
+bellekle işlenir.
+
+Her parça kendi transaction'ında yazılır ve commit edilir; aylık özet
+kovaları ve şube sayaçları da aynı transaction'da güncellenir. Milyon satırlık
+bir dosya tek uzun transaction olup kilit tutmaz. Yarıda kesilen bir içe
+aktarım yeniden çalıştırılabilir: yazılmış parçalar mükerrer sayılıp atlanır.
+
+Mükerrer kontrolü doğal anahtarla yapılır: (şube, tip, kategori, tarih,
+tutar, açıklama). Her parça veritabanındaki mevcut kayıtlarla karşılaştırılır;
+önceki parçalar commit edilmiş olduğundan dosya içindeki tekrarlar da
+yakalanır. Kuru çalıştırmada parçalar geri alındığından yalnızca aynı parça
+içindeki tekrarlar görülür.
+
+Web'den yüklenen büyük dosyalar istek içinde değil, ``DisaAktarimIsi``
+kuyruğunda ``run_export_worker`` tarafından işlenir (bkz. ``ice_aktarim_isi``).
+
+Beklenen sütunlar dışa aktarımdakiyle aynıdır: Şube, Tip, Kategori, Tutar,
+Tarih, Açıklama. Şube adı veya numarası, tip ve kategori kodu veya etiketi
+kabul edilir.
+"""
+
+import csv
+import io
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from . import onbellek
+from .arama import turkce_katla
+from .models import GelirGider, Sube, SubeAylikOzet
+
+VARSAYILAN_PARCA_BOYUTU = 2000
+HATA_ORNEK_SINIRI = 100
+
+ALANLAR = ("sube", "tip", "kategori", "tutar", "tarih", "aciklama")
+ZORUNLU_ALANLAR = ("sube", "tip", "tutar", "tarih")
+TARIH_BICIMLERI = ("%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y")
+KURUS = Decimal("0.01")
+
+
+class IceAktarimHatasi(Exception):
+    """Dosya bütünüyle okunamadığında (biçim, başlık) yükseltilir."""
+
+
+class IceAktarimSonucu:
+    def __init__(self):
+        self.okunan = 0
+        self.eklenen = 0
+        self.mukerrer = 0
+        self.reddedilen = 0
+        self.hatalar = []  # (satır no, mesaj); ilk HATA_ORNEK_SINIRI kadarı
+        self.sure = 0.0
+
+    def hata_ekle(self, satir_no, mesaj):
+        self.reddedilen += 1
+        if len(self.hatalar) < HATA_ORNEK_SINIRI:
+            self.hatalar.append((satir_no, mesaj))
+
+    @property
+    def satir_per_saniye(self):
+        return self.okunan / self.sure if self.sure else 0
+
+
+# --- Dosya okuyucular: (satır no, değerler) üretir, ilk satır başlıktır ---
+
+
+def csv_satirlari(dosya):
+    metin = io.TextIOWrapper(dosya, encoding="utf-8-sig", newline="")
+    ornek = metin.read(4096)
+    metin.seek(0)
+    try:
+        lehce = csv.Sniffer().sniff(ornek, delimiters=",;\t")
+    except csv.Error:
+        lehce = csv.excel
+    try:
+        yield from enumerate(csv.reader(metin, lehce), start=1)
+    finally:
+        metin.detach()
+
+
+def xlsx_satirlari(dosya):
+    from openpyxl import load_workbook
+
+    try:
+        kitap = load_workbook(dosya, read_only=True, data_only=True)
+    except Exception as e:
+        raise IceAktarimHatasi(f"XLSX dosyası okunamadı: {e}")
+    try:
+        yield from enumerate(kitap.active.iter_rows(values_only=True), start=1)
+    finally:
+        kitap.close()
+
+
+OKUYUCULAR = {"csv": csv_satirlari, "xlsx": xlsx_satirlari}
+
+
+def dosya_bicimi(dosya_adi):
+    uzanti = dosya_adi.rsplit(".", 1)[-1].lower() if "." in dosya_adi else ""
+    if uzanti not in OKUYUCULAR:
+        raise IceAktarimHatasi("Yalnızca .csv ve .xlsx dosyaları içe aktarılabilir.")
+    return uzanti
+
+
+# --- Değer çözümleyiciler ---
+
+
+def tutar_coz(deger):
+    """``1.234,56``, ``1234.56`` ve ``₺ 1 234,56`` gibi yazımları kabul eder."""
+    if isinstance(deger, (int, float, Decimal)):
+        return Decimal(str(deger))
+    metin = str(deger).replace("₺", "").replace("TL", "").replace(" ", "").strip()
+    if "," in metin and "." in metin:
+        if metin.rfind(",") > metin.rfind("."):
+            metin = metin.replace(".", "").replace(",", ".")
+        else:
+            metin = metin.replace(",", "")
+    elif "," in metin:
+        metin = metin.replace(",", ".")
+    try:
+        return Decimal(metin)
+    except InvalidOperation:
+        raise ValidationError(f"Geçersiz tutar: {deger}")
+
+
+def tarih_coz(deger):
+    if isinstance(deger, datetime):
+        return deger.date()
+    if isinstance(deger, date):
+        return deger
+    metin = str(deger).strip()
+    for bicim in TARIH_BICIMLERI:
+        try:
+            return datetime.strptime(metin, bicim).date()
+        except ValueError:
+            continue
+    raise ValidationError(f"Geçersiz tarih: {deger}")
+
+
+class GelirGiderIceAktarici:
+    def __init__(self, parca_boyutu=VARSAYILAN_PARCA_BOYUTU):
+        self.parca_boyutu = parca_boyutu
+        self.subeler = {}
+        for sube_id, ad in Sube.objects.values_list("id", "ad"):
+            self.subeler.setdefault(turkce_katla(ad), sube_id)
+            self.subeler[str(sube_id)] = sube_id
+        self.tipler = self._secenek_haritasi(GelirGider.TIP_SECENEKLERI)
+        self.kategoriler = self._secenek_haritasi(GelirGider.KATEGORI_SECENEKLERI)
+
+    @staticmethod
+    def _secenek_haritasi(secenekler):
+        harita = {}
+        for kod, etiket in secenekler:
+            harita[turkce_katla(kod)] = kod
+            harita[turkce_katla(etiket)] = kod
+        return harita
+
+    def _sutunlar(self, baslik):
+        sutunlar = {}
+        for indeks, ad in enumerate(baslik):
+            ad = turkce_katla(ad)
+            if ad in ALANLAR:
+                sutunlar[ad] = indeks
+        eksik = [alan for alan in ZORUNLU_ALANLAR if alan not in sutunlar]
+        if eksik:
+            raise IceAktarimHatasi(f"Eksik sütun(lar): {', '.join(eksik)}")
+        return sutunlar
+
+    def _kayit(self, degerler, sutunlar):
+        """Satırı doğrulanmış, kaydedilmemiş bir GelirGider nesnesine çevirir."""
+
+        def deger(alan):
+            indeks = sutunlar.get(alan)
+            if indeks is None or indeks >= len(degerler) or degerler[indeks] is None:
+                return ""
+            hucre = degerler[indeks]
+            return hucre.strip() if isinstance(hucre, str) else hucre
+
+        for alan in ZORUNLU_ALANLAR:
+            if deger(alan) == "":
+                raise ValidationError(f"{alan} boş olamaz.")
+
+        sube = deger("sube")
+        sube_id = self.subeler.get(
+            str(int(sube)) if isinstance(sube, (int, float)) else turkce_katla(sube)
+        )
+        if sube_id is None:
+            raise ValidationError(f"Şube bulunamadı: {sube}")
+        tip = self.tipler.get(turkce_katla(deger("tip")))
+        if tip is None:
+            raise ValidationError(f"Geçersiz tip: {deger('tip')}")
+        kategori_degeri = deger("kategori")
+        kategori = (
+            self.kategoriler.get(turkce_katla(kategori_degeri))
+            if kategori_degeri != ""
+            else "nakit"
+        )
+        if kategori is None:
+            raise ValidationError(f"Geçersiz kategori: {kategori_degeri}")
+
+        kayit = GelirGider(
+            sube_id=sube_id,
+            tip=tip,
+            kategori=kategori,
+            tutar=tutar_coz(deger("tutar")),
+            tarih=tarih_coz(deger("tarih")),
+            aciklama=str(deger("aciklama")),
+        )
+        # Şube yukarıda çözüldü; full_clean satır başına FK sorgusu atmasın
+        kayit.full_clean(exclude=["sube"], validate_unique=False, validate_constraints=False)
+        kayit.tutar = kayit.tutar.quantize(KURUS)
+        return kayit
+
+    @staticmethod
+    def _dogal_anahtar(kayit):
+        return (
+            kayit.sube_id,
+            kayit.tip,
+            kayit.kategori,
+            kayit.tarih,
+            kayit.tutar,
+            kayit.aciklama,
+        )
+
+    def _parcayi_yaz(self, parca, sonuc, kuru):
+        """Parçayı tek transaction'da yazar; kuru çalıştırmada geri alır."""
+        with transaction.atomic():
+            self._parcayi_ekle(parca, sonuc)
+            if kuru:
+                transaction.set_rollback(True)
+
+    def _parcayi_ekle(self, parca, sonuc):
+        kovalar = defaultdict(lambda: (Decimal("0.00"), 0))
+        tutarlar = defaultdict(Decimal)
+        mevcut = set(
+            GelirGider.objects.filter(
+                sube_id__in={k.sube_id for _, k in parca},
+                tarih__in={k.tarih for _, k in parca},
+            )
+            .order_by()
+            .values_list("sube_id", "tip", "kategori", "tarih", "tutar", "aciklama")
+        )
+        yeni = []
+        for _, kayit in parca:
+            anahtar = self._dogal_anahtar(kayit)
+            if anahtar in mevcut:
+                sonuc.mukerrer += 1
+                continue
+            mevcut.add(anahtar)
+            yeni.append(kayit)
+            kova = (kayit.sube_id, SubeAylikOzet.ay_baslangici(kayit.tarih), kayit.tip)
+            kovalar[kova] = (kovalar[kova][0] + kayit.tutar, kovalar[kova][1] + 1)
+            tutarlar[kayit.sube_id, kayit.tip] += kayit.tutar
+        GelirGider.objects.bulk_create(yeni, batch_size=self.parca_boyutu)
+        sonuc.eklenen += len(yeni)
+
+        # bulk_create sinyalleri atlar: özet kovaları ve şube sayaçları elle
+        # güncellenir
+        SubeAylikOzet.farklari_ekle(kovalar)
+        for (sube_id, tip), tutar in tutarlar.items():
+            Sube.sayaclari_degistir(sube_id, **{tip: tutar})
+        # Sürümler parça commit edilince artar; geri alınan parça artırmaz
+        if yeni:
+            onbellek.model_yazildi(GelirGider)
+            onbellek.gecmis_yazildi(GelirGider, *(ay for _, ay, _ in kovalar))
+
+    def ice_aktar(self, dosya, bicim, kuru=False):
+        """Dosyayı içe aktarır ve bir ``IceAktarimSonucu`` döner.
+
+        ``kuru`` ise her şey doğrulanır ama her parçanın transaction'ı geri
+        alınır. Bir parça hata verirse önceki parçalar yazılmış kalır.
+        """
+        sonuc = IceAktarimSonucu()
+        baslangic = time.perf_counter()
+        satirlar = OKUYUCULAR[bicim](dosya)
+
+        try:
+            _, baslik = next(satirlar)
+        except StopIteration:
+            raise IceAktarimHatasi("Dosya boş.")
+        sutunlar = self._sutunlar(baslik)
+
+        parca = []
+        for satir_no, degerler in satirlar:
+            if not any(d not in (None, "") for d in degerler):
+                continue
+            sonuc.okunan += 1
+            try:
+                parca.append((satir_no, self._kayit(degerler, sutunlar)))
+            except ValidationError as e:
+                sonuc.hata_ekle(satir_no, "; ".join(e.messages))
+            if len(parca) >= self.parca_boyutu:
+                self._parcayi_yaz(parca, sonuc, kuru)
+                parca = []
+        if parca:
+            self._parcayi_yaz(parca, sonuc, kuru)
+        sonuc.sure = time.perf_counter() - baslangic
+        return sonuc
+
+
+def ice_aktarim_isi(params, hedef):
+    """Kuyruğa alınmış bir içe aktarımı çalıştırır ve sonucu CSV olarak yazar.
+
+    ``run_export_worker`` tarafından ``DisaAktarimIsi`` yazıcısı olarak
+    çağrılır. ``params``: ``kaynak`` (yüklenen dosyanın varsayılan depodaki
+    adı), ``bicim`` ve ``kuru``. Kaynak dosya içe aktarım bitince silinir;
+    süreç yarıda ölürse dosya kalır ve iş yeniden kuyruğa alındığında kaldığı
+    yerden (mükerrerler atlanarak) devam eder.
+    """
+    kaynak = params["kaynak"]
+    try:
+        with default_storage.open(kaynak, "rb") as dosya:
+            sonuc = GelirGiderIceAktarici().ice_aktar(
+                dosya, params["bicim"], kuru=params.get("kuru", False)
+            )
+    except IceAktarimHatasi:
+        default_storage.delete(kaynak)
+        raise
+    default_storage.delete(kaynak)
+
+    metin = io.TextIOWrapper(hedef, encoding="utf-8-sig", newline="")
+    yazici = csv.writer(metin, delimiter=";")
+    yazici.writerow(["Okunan", "Eklenen", "Mükerrer", "Reddedilen", "Süre (sn)"])
+    yazici.writerow(
+        [sonuc.okunan, sonuc.eklenen, sonuc.mukerrer, sonuc.reddedilen, f"{sonuc.sure:.2f}"]
+    )
+    if sonuc.hatalar:
+        yazici.writerow([])
+        yazici.writerow(["Satır", "Hata"])
+        yazici.writerows(sonuc.hatalar)
+    metin.flush()
+    metin.detach()
+    return "gelir_gider_ice_aktarim_sonucu.csv"
@@ -0,0 +1,115 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models import Sum
+
+from yonetim.models import GelirGider, Personel, Sube
+from yonetim.veritabani import havuz_istatistikleri
+
+
+def _istek():
+    """Ana sayfadakine benzer birkaç kısa sorgu; istek sinyalleriyle sarılır.
+
+    ``request_started``/``request_finished`` Django'nun gerçek istekte yaptığı
+    gibi eskimiş bağlantıları kapatır ya da havuza geri verir.
+    """
+    request_started.send(sender=None)
+    try:
+        Sube.objects.count()
+        Personel.objects.count()
+        GelirGider.objects.aggregate(toplam=Sum("tutar"))
+    finally:
+        request_finished.send(sender=None)
+
+
+class Command(BaseCommand):
+    help = (
+        "Eşzamanlı istemcilerle kısa istekler çalıştırıp gecikme yüzdeliklerini, "
+        "açılan bağlantı sayısını ve havuz durumunu raporlar. Havuzlu ve havuzsuz "
+        "kurulumu karşılaştırmak için DB_POOL=True/False ile ayrı ayrı çalıştırın."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--istemci",
+            type=int,
+            default=50,
+            help="Aynı anda istek atan iş parçacığı sayısı (varsayılan: 50).",
+        )
+        parser.add_argument(
+            "--istek",
+            type=int,
+            default=20,
+            help="İstemci başına istek sayısı (varsayılan: 20).",
+        )
+
+    def handle(self, *args, **options):
+        istemci, istek = options["istemci"], options["istek"]
+        sureler = []
+        kilit = threading.Lock()
+        acilan = []
+
+        def baglanti_acildi(sender, connection, **kwargs):
+            with kilit:
+                acilan.append(connection.alias)
+
+        def calistir(_):
+            yerel = []
+            try:
+                for _ in range(istek):
+                    baslangic = time.perf_counter()
+                    _istek()
+                    yerel.append(time.perf_counter() - baslangic)
+            finally:
+                connections.close_all()
+            with kilit:
+                sureler.extend(yerel)
+
+        ayar = settings.DATABASES["default"]
+        havuz = ayar.get("OPTIONS", {}).get("pool")
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{ayar['ENGINE'].rsplit('.', 1)[-1]}, "
+            f"{'havuz ' + str(havuz) if havuz else 'havuz yok'}, "
+            f"CONN_MAX_AGE={ayar.get('CONN_MAX_AGE')}, "
+            f"{istemci} istemci x {istek} istek"
+        ))
+
+        connection_created.connect(baglanti_acildi)
+        try:
+            baslangic = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=istemci) as havuz_yurutucu:
+                list(havuz_yurutucu.map(calistir, range(istemci)))
+            toplam_sure = time.perf_counter() - baslangic
+        finally:
+            connection_created.disconnect(baglanti_acildi)
+
+        yuzdelikler = statistics.quantiles(sureler, n=100, method="inclusive")
+        self.stdout.write(
+            f"  {len(sureler):,} istek, {toplam_sure:.2f} sn, "
+            f"saniyede {len(sureler) / toplam_sure:,.0f} istek"
+        )
+        self.stdout.write(
+            "  gecikme (ms)  "
+            f"p50 {yuzdelikler[49] * 1000:7.1f}   p95 {yuzdelikler[94] * 1000:7.1f}   "
+            f"p99 {yuzdelikler[98] * 1000:7.1f}   en yüksek {max(sureler) * 1000:7.1f}"
+        )
+        istatistikler = havuz_istatistikleri()
+        if istatistikler.get("default") is not None:
+            # Havuzda connection_created her ödünç almada gönderilir; sunucuya
+            # açılan gerçek bağlantı sayısını havuz tutar
+            self.stdout.write(
+                f"  açılan veritabanı bağlantısı: {istatistikler['default'].get('connections_num', 0)} "
+                f"(havuzdan {len(acilan)} kez alındı)"
+            )
+        else:
+            self.stdout.write(f"  açılan veritabanı bağlantısı: {len(acilan)}")
+        for alias, istatistik in istatistikler.items():
+            if istatistik is not None:
+                self.stdout.write(f"  havuz {alias}: {istatistik}")
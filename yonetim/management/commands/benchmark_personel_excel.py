@@ -0,0 +1,83 @@
+import time
+import tracemalloc
+from datetime import date
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+from openpyxl import Workbook
+
+from yonetim.excel import (
+    PERSONEL_EXCEL_BASLIKLARI,
+    sayfa_olustur,
+    yazma_modunda_kitap,
+)
+
+
+def _ornek_satirlar(adet):
+    """Veritabanına dokunmadan values_list() çıktısına benzeyen satırlar üretir."""
+    for i in range(adet):
+        yield (
+            f"Ad{i}",
+            f"Soyad{i}",
+            "Garson",
+            f"Şube {i % 50}",
+            date(2024, 1, 1 + i % 28),
+            f"0555{i:07d}",
+            f"personel{i}@example.com",
+        )
+
+
+def hucre_hucre_yaz(satirlar, hedef):
+    """Eski yöntem: normal çalışma kitabı, her değer için ayrı cell() çağrısı."""
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = "Personel Listesi"
+    for col_num, header in enumerate(PERSONEL_EXCEL_BASLIKLARI, 1):
+        worksheet.cell(row=1, column=col_num).value = header
+    for row_num, satir in enumerate(satirlar, 2):
+        for col_num, deger in enumerate(satir, 1):
+            worksheet.cell(row=row_num, column=col_num).value = deger
+    workbook.save(hedef)
+
+
+def satir_satir_yaz(satirlar, hedef):
+    """Yeni yöntem: yazma modunda çalışma kitabı, satır başına tek append()."""
+    workbook = yazma_modunda_kitap()
+    worksheet = sayfa_olustur(workbook, "Personel Listesi", PERSONEL_EXCEL_BASLIKLARI)
+    for satir in satirlar:
+        worksheet.append(satir)
+    workbook.save(hedef)
+
+
+class Command(BaseCommand):
+    help = (
+        "Personel Excel dışa aktarımının eski (hücre hücre) ve yeni (yazma modu, "
+        "satır satır) yöntemlerini süre ve en yüksek bellek açısından karşılaştırır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--adet",
+            type=int,
+            nargs="+",
+            default=[10_000, 100_000],
+            help="Denenecek personel sayıları (varsayılan: 10000 100000).",
+        )
+
+    def handle(self, *args, **options):
+        yontemler = [
+            ("hücre hücre", hucre_hucre_yaz),
+            ("yazma modu", satir_satir_yaz),
+        ]
+        for adet in options["adet"]:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{adet:,} personel"))
+            for ad, yontem in yontemler:
+                tracemalloc.start()
+                baslangic = time.perf_counter()
+                yontem(_ornek_satirlar(adet), BytesIO())
+                sure = time.perf_counter() - baslangic
+                _, tepe = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.stdout.write(
+                    f"  {ad:<12} {sure:8.2f} sn   en yüksek bellek {tepe / 1024 / 1024:8.1f} MB"
+                )
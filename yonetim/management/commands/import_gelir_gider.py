@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from yonetim.ice_aktarim import (
+    VARSAYILAN_PARCA_BOYUTU,
+    GelirGiderIceAktarici,
+    IceAktarimHatasi,
+    dosya_bicimi,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "CSV veya XLSX dosyasındaki gelir/gider satırlarını doğrulayıp mükerrerleri "
+        "atlayarak toplu olarak içe aktarır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("dosya", help="İçe aktarılacak .csv veya .xlsx dosyası")
+        parser.add_argument(
+            "--parca",
+            type=int,
+            default=VARSAYILAN_PARCA_BOYUTU,
+            help=f"Tek seferde doğrulanıp yazılacak satır sayısı (varsayılan: {VARSAYILAN_PARCA_BOYUTU}).",
+        )
+        parser.add_argument(
+            "--kuru",
+            action="store_true",
+            help="Yalnızca doğrula; hiçbir kayıt yazma.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            bicim = dosya_bicimi(options["dosya"])
+            with open(options["dosya"], "rb") as dosya:
+                sonuc = GelirGiderIceAktarici(options["parca"]).ice_aktar(
+                    dosya, bicim, kuru=options["kuru"]
+                )
+        except (OSError, IceAktarimHatasi) as e:
+            raise CommandError(str(e))
+
+        for satir_no, mesaj in sonuc.hatalar:
+            self.stdout.write(self.style.WARNING(f"  Satır {satir_no}: {mesaj}"))
+        if sonuc.reddedilen > len(sonuc.hatalar):
+            self.stdout.write(
+                self.style.WARNING(f"  ... ve {sonuc.reddedilen - len(sonuc.hatalar)} hata daha")
+            )
+
+        self.stdout.write(
+            f"{sonuc.okunan} satır okundu, {sonuc.mukerrer} mükerrer atlandı, "
+            f"{sonuc.reddedilen} satır reddedildi."
+        )
+        self.stdout.write(
+            f"Süre: {sonuc.sure:.2f} sn ({sonuc.satir_per_saniye:,.0f} satır/sn)"
+        )
+        if options["kuru"]:
+            self.stdout.write(
+                self.style.SUCCESS(f"Kuru çalıştırma: {sonuc.eklenen} kayıt eklenebilir, hiçbiri yazılmadı.")
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{sonuc.eklenen} kayıt içe aktarıldı."))
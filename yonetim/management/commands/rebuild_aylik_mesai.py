@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from yonetim.models import PersonelAylikMesai
+
+
+class Command(BaseCommand):
+    help = "Personel aylık mesai özet tablosunu Mesai kayıtlarından yeniden oluşturur."
+
+    def handle(self, *args, **options):
+        self.stdout.write("Personel aylık mesai özetleri yeniden oluşturuluyor...")
+        adet = PersonelAylikMesai.tumunu_yeniden_olustur()
+        self.stdout.write(self.style.SUCCESS(f"{adet} adet özet satırı oluşturuldu."))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from yonetim.models import SubeAylikOzet
+
+
+class Command(BaseCommand):
+    help = "Şube aylık gelir/gider özet tablosunu GelirGider kayıtlarından yeniden oluşturur."
+
+    def handle(self, *args, **options):
+        self.stdout.write("Şube aylık özetleri yeniden oluşturuluyor...")
+        adet = SubeAylikOzet.tumunu_yeniden_olustur()
+        self.stdout.write(self.style.SUCCESS(f"{adet} adet özet satırı oluşturuldu."))
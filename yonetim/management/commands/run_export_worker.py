@@ -0,0 +1,115 @@
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections, connections
+
+from yonetim.models import DisaAktarimIsi
+from yonetim.raporlar import isi_calistir
+
+
+@contextmanager
+def sinyal_verirken(is_id, aralik):
+    """Blok sürdükçe işin ``son_sinyal`` alanını ``aralik`` saniyede bir tazeler.
+
+    Sinyal ayrı bir iş parçacığından (kendi bağlantısıyla) verilir; iş
+    çalışırken uzun bir sorguda beklese de çalışanın yaşadığı görünür.
+    """
+    dur = threading.Event()
+
+    def dongu():
+        try:
+            while not dur.wait(aralik):
+                try:
+                    DisaAktarimIsi.sinyal_ver(is_id)
+                except DatabaseError:
+                    # Geçici bir bağlantı hatası; sonraki turda yeniden denenir
+                    close_old_connections()
+        finally:
+            connections.close_all()
+
+    sinyalci = threading.Thread(target=dongu, name=f"is-{is_id}-sinyal", daemon=True)
+    sinyalci.start()
+    try:
+        yield
+    finally:
+        dur.set()
+        sinyalci.join()
+
+
+class Command(BaseCommand):
+    help = (
+        "Veritabanı kuyruğundaki dışa aktarım işlerini web süreçlerinden bağımsız "
+        "olarak çalıştırır. Harici bir mesaj kuyruğu gerektirmez."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--bekleme",
+            type=float,
+            default=2.0,
+            help="Kuyruk boşken iki kontrol arasında beklenecek saniye (varsayılan: 2).",
+        )
+        parser.add_argument(
+            "--zaman-asimi",
+            type=int,
+            default=5,
+            help=(
+                "Bu kadar dakikadır çalışanından sinyal gelmeyen işler yeniden "
+                "kuyruğa alınır (varsayılan: 5)."
+            ),
+        )
+        parser.add_argument(
+            "--sinyal-araligi",
+            type=float,
+            default=30.0,
+            help="Çalışan iş için kaç saniyede bir sinyal verileceği (varsayılan: 30).",
+        )
+        parser.add_argument(
+            "--tek-sefer",
+            action="store_true",
+            help="Kuyruktaki işleri bitirip çık (cron veya test için).",
+        )
+
+    def handle(self, *args, **options):
+        bekleme = options["bekleme"]
+        zaman_asimi = timedelta(minutes=options["zaman_asimi"])
+        self.stdout.write(self.style.SUCCESS("Dışa aktarım çalışanı başlatıldı."))
+
+        try:
+            while True:
+                close_old_connections()
+                geri_alinan = DisaAktarimIsi.takilanlari_kuyruga_al(zaman_asimi)
+                if geri_alinan:
+                    self.stdout.write(
+                        self.style.WARNING(f"{geri_alinan} takılı iş yeniden kuyruğa alındı.")
+                    )
+
+                is_ = DisaAktarimIsi.siradakini_al()
+                if is_ is None:
+                    if options["tek_sefer"]:
+                        break
+                    time.sleep(bekleme)
+                    continue
+
+                self.stdout.write(f"İş #{is_.pk} ({is_.rapor}) çalıştırılıyor...")
+                baslangic = time.monotonic()
+                try:
+                    with sinyal_verirken(is_.pk, options["sinyal_araligi"]):
+                        isi_calistir(is_)
+                except Exception as e:
+                    self.stdout.write(self.style.ERROR(f"İş #{is_.pk} başarısız: {e}"))
+                    continue
+                sure = time.monotonic() - baslangic
+                if is_.durum == "tamamlandi":
+                    self.stdout.write(
+                        self.style.SUCCESS(f"İş #{is_.pk} tamamlandı ({sure:.1f} sn).")
+                    )
+                else:
+                    self.stdout.write(
+                        self.style.WARNING(f"İş #{is_.pk}: {is_.hata_mesaji}")
+                    )
+        except KeyboardInterrupt:
+            self.stdout.write("Dışa aktarım çalışanı durduruldu.")
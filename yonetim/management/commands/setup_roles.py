@@ -6,6 +6,8 @@ from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
 from django.db.utils import IntegrityError
 
+from yonetim.roller import tum_rolleri_gecersiz_kil
+
 class Command(BaseCommand):
     help = 'Kullanıcı rollerini (Patron, Şube Müdürü, Muhasebe) ve izinlerini ayarlar.'
 
@@ -81,4 +83,6 @@ class Command(BaseCommand):
                     self.stdout.write(self.style.WARNING(f"  Uyarı: '{perm_str}' izni mevcut değil. Atlanıyor."))
             self.stdout.write(self.style.SUCCESS(f"'{role_name}' grubunun izinleri güncellendi."))
 
+        # Sinyaller de temizler; yine de toplu değişiklik sonunda açıkça eskitilir.
+        tum_rolleri_gecersiz_kil()
         self.stdout.write(self.style.SUCCESS("\nRol yapılandırması tamamlandı. Kullanıcılarınıza rolleri atamayı unutmayın!"))
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from yonetim import onbellek
+from yonetim.models import Sube
+
+
+class Command(BaseCommand):
+    help = (
+        "Şube gelir/gider toplamı ve personel sayısı sayaçlarını kaynak tablolarla "
+        "karşılaştırır; --onar ile tutarsız olanları düzeltir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--onar",
+            action="store_true",
+            help="Tutarsız sayaçları kaynak tablolardan hesaplanan değerlerle günceller.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            # Onarımda sayaçlar hesaplanırken araya yazma girmesin
+            subeler = Sube.objects.order_by("pk").values("pk", "ad", *Sube.SAYAC_ALANLARI)
+            if options["onar"]:
+                subeler = subeler.select_for_update()
+            subeler = list(subeler)
+            gercek = Sube.gercek_sayaclar()
+
+            tutarsiz = 0
+            for sube in subeler:
+                beklenen = gercek.get(sube["pk"], {})
+                farklar = {
+                    alan: beklenen.get(alan, 0)
+                    for alan in Sube.SAYAC_ALANLARI
+                    if sube[alan] != beklenen.get(alan, 0)
+                }
+                if not farklar:
+                    continue
+                tutarsiz += 1
+                ayrinti = ", ".join(
+                    f"{alan}: {sube[alan]} -> {deger}" for alan, deger in farklar.items()
+                )
+                self.stdout.write(self.style.WARNING(f"{sube['ad']} (#{sube['pk']}): {ayrinti}"))
+                if options["onar"]:
+                    Sube.objects.filter(pk=sube["pk"]).update(**farklar)
+            if tutarsiz and options["onar"]:
+                onbellek.model_yazildi(Sube)
+
+        if not tutarsiz:
+            self.stdout.write(self.style.SUCCESS(f"{len(subeler)} şubenin sayaçları tutarlı."))
+        elif options["onar"]:
+            self.stdout.write(self.style.SUCCESS(f"{tutarsiz} şubenin sayaçları onarıldı."))
+        else:
+            self.stdout.write(
+                self.style.ERROR(f"{tutarsiz} şubenin sayaçları tutarsız; düzeltmek için --onar kullanın.")
+            )
@@ -0,0 +1,165 @@
+"""İstek başına sorgu bütçesi ve N+1 dedektörü.
+
+``SorguButcesiMiddleware`` her istekte çalışan SQL sorgularını ve veritabanında
+geçen süreyi sayar. View'a tanımlı bütçe aşıldığında veya aynı biçimdeki
+(yalnızca parametreleri farklı) sorgu bir istekte tekrar tekrar çalıştığında
+uyarı loglar. Ölçümler ``Server-Timing`` ve ``X-Sorgu-*`` başlıklarıyla
+yanıta eklenir; yük testlerinde DEBUG kapalıyken de okunabilir.
+
+Ayarlar ``settings.SORGU_BUTCESI`` sözlüğünden okunur; ``ETKIN`` kapalıysa
+middleware hiç yüklenmez. Middleware hem senkron hem async zincirde çalışır;
+async view'lar senkron adaptasyona zorlanmaz.
+
+Async ORM sorguları eşzamanlı isteklerde aynı iş parçacığında, aynı bağlantı
+üzerinden çalışabilir; sayaç bu yüzden bağlantıya değil isteğin bağlamına
+(``ContextVar``) bağlanır. Her bağlantıya bir kez takılan ``_sayaca_yaz``
+sorguyu, onu çalıştıran isteğin sayacına yazar.
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_METIN = re.compile(r"'(?:[^']|'')*'")
+_SAYI = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LISTESI = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+_aktif_sayac = ContextVar("yonetim_sorgu_sayaci", default=None)
+
+
+def sorgu_kalibi(sql):
+    """Sabitleri ve parametreleri ayıklayarak sorgunun biçimini döner.
+
+    ``WHERE id = 1`` ile ``WHERE id = 2`` aynı kalıba indirgenir; N+1 tespiti
+    bu kalıpların istek içindeki tekrar sayısına bakar.
+    """
+    sql = _METIN.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _SAYI.sub("?", sql)
+    sql = _IN_LISTESI.sub("(...)", sql)
+    return " ".join(sql.split())
+
+
+class SorguSayaci:
+    """Bir isteğin sorgu sayısını ve süresini toplar (bkz. ``_sayaca_yaz``)."""
+
+    def __init__(self):
+        self.sayi = 0
+        self.sure = 0.0
+        self.kaliplar = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        baslangic = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sure += time.perf_counter() - baslangic
+            self.sayi += 1
+            self.kaliplar[sorgu_kalibi(sql)] += 1
+
+
+def _sayaca_yaz(execute, sql, params, many, context):
+    sayac = _aktif_sayac.get()
+    if sayac is None:
+        return execute(sql, params, many, context)
+    return sayac(execute, sql, params, many, context)
+
+
+def _sayaca_yaz_tak():
+    """Bu iş parçacığının bağlantılarına ``_sayaca_yaz``'ı bir kez takar."""
+    for connection in connections.all():
+        if _sayaca_yaz not in connection.execute_wrappers:
+            connection.execute_wrappers.append(_sayaca_yaz)
+
+
+class SorguButcesiMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        ayarlar = getattr(settings, "SORGU_BUTCESI", {})
+        if not ayarlar.get("ETKIN"):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.varsayilan_limit = ayarlar.get("VARSAYILAN_LIMIT", 30)
+        self.view_limitleri = ayarlar.get("VIEW_LIMITLERI", {})
+        self.sure_limiti_ms = ayarlar.get("SURE_LIMITI_MS", 500)
+        self.tekrar_esigi = ayarlar.get("TEKRAR_ESIGI", 5)
+        self.basliklar = ayarlar.get("BASLIKLAR", True)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        sayac = SorguSayaci()
+        baslangic = time.perf_counter()
+        _sayaca_yaz_tak()
+        belirtec = _aktif_sayac.set(sayac)
+        try:
+            response = self.get_response(request)
+        finally:
+            _aktif_sayac.reset(belirtec)
+        return self._raporla(request, response, sayac, baslangic)
+
+    async def __acall__(self, request):
+        sayac = SorguSayaci()
+        baslangic = time.perf_counter()
+        # Bağlantılar iş parçacığına özgüdür; wrapper async ORM sorgularının
+        # çalıştığı (thread_sensitive) iş parçacığındaki bağlantılara takılır.
+        # Bağlam değişkeni sync_to_async ile o iş parçacığına da geçer.
+        await sync_to_async(_sayaca_yaz_tak)()
+        belirtec = _aktif_sayac.set(sayac)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _aktif_sayac.reset(belirtec)
+        return self._raporla(request, response, sayac, baslangic)
+
+    def _raporla(self, request, response, sayac, baslangic):
+        toplam_ms = (time.perf_counter() - baslangic) * 1000
+        db_ms = sayac.sure * 1000
+
+        match = getattr(request, "resolver_match", None)
+        view_adi = match.view_name if match else request.path
+        limit = self.view_limitleri.get(view_adi, self.varsayilan_limit)
+        butce_asildi = sayac.sayi > limit or db_ms > self.sure_limiti_ms
+        tekrarlar = [
+            (kalip, adet)
+            for kalip, adet in sayac.kaliplar.most_common()
+            if adet >= self.tekrar_esigi
+        ]
+
+        if butce_asildi:
+            logger.warning(
+                "Sorgu bütçesi aşıldı: %s %d sorgu (limit %d), %.1f ms veritabanı",
+                view_adi,
+                sayac.sayi,
+                limit,
+                db_ms,
+            )
+        for kalip, adet in tekrarlar:
+            logger.warning(
+                "Olası N+1: %s aynı sorguyu %d kez çalıştırdı: %s", view_adi, adet, kalip
+            )
+
+        if self.basliklar:
+            response["Server-Timing"] = (
+                f'db;dur={db_ms:.1f};desc="{sayac.sayi} sorgu", app;dur={toplam_ms:.1f}'
+            )
+            response["X-Sorgu-Sayisi"] = str(sayac.sayi)
+            if butce_asildi:
+                response["X-Sorgu-Butcesi-Asildi"] = "1"
+            if tekrarlar:
+                response["X-Sorgu-Tekrari"] = str(max(adet for _, adet in tekrarlar))
+        return response
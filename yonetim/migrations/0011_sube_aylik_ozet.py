@@ -0,0 +1,58 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:40
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def ozetleri_doldur(apps, schema_editor):
+    GelirGider = apps.get_model("yonetim", "GelirGider")
+    SubeAylikOzet = apps.get_model("yonetim", "SubeAylikOzet")
+
+    satirlar = (
+        GelirGider.objects.annotate(ay=TruncMonth("tarih"))
+        .values("sube_id", "ay", "tip")
+        .annotate(toplam=Sum("tutar"), kayit_sayisi=Count("id"))
+        .order_by()
+    )
+    SubeAylikOzet.objects.bulk_create(
+        SubeAylikOzet(
+            sube_id=satir["sube_id"],
+            ay=satir["ay"],
+            tip=satir["tip"],
+            toplam=satir["toplam"],
+            kayit_sayisi=satir["kayit_sayisi"],
+        )
+        for satir in satirlar
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yonetim', '0010_alter_personel_options_alter_personel_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubeAylikOzet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ay', models.DateField(verbose_name='Ay')),
+                ('tip', models.CharField(choices=[('gelir', 'Gelir'), ('gider', 'Gider')], max_length=10, verbose_name='Tip')),
+                ('toplam', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Toplam')),
+                ('kayit_sayisi', models.PositiveIntegerField(default=0, verbose_name='Kayıt Sayısı')),
+                ('guncelleme_tarihi', models.DateTimeField(auto_now=True, verbose_name='Güncelleme Tarihi')),
+                ('sube', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aylik_ozetler', to='yonetim.sube', verbose_name='Şube')),
+            ],
+            options={
+                'verbose_name': 'Şube Aylık Özeti',
+                'verbose_name_plural': 'Şube Aylık Özetleri',
+                'ordering': ['-ay', 'sube'],
+                'constraints': [models.UniqueConstraint(fields=('sube', 'ay', 'tip'), name='uniq_sube_aylik_ozet')],
+            },
+        ),
+        migrations.RunPython(ozetleri_doldur, migrations.RunPython.noop),
+    ]
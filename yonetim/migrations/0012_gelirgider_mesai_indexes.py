@@ -0,0 +1,76 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:41
+
+from django.db import migrations, models
+
+# Yalnızca PostgreSQL'de anlamlı olan indeksler (BRIN ve INCLUDE'lu kapsayan
+# indeksler). SQLite gibi yerel veritabanlarında bu adım atlanır.
+POSTGRES_INDEKSLERI = [
+    (
+        "gg_tarih_brin",
+        "CREATE INDEX IF NOT EXISTS gg_tarih_brin "
+        "ON yonetim_gelirgider USING brin (tarih)",
+    ),
+    (
+        "gg_tip_tarih_cov_idx",
+        "CREATE INDEX IF NOT EXISTS gg_tip_tarih_cov_idx "
+        "ON yonetim_gelirgider (tip, tarih) INCLUDE (tutar, sube_id)",
+    ),
+    (
+        "mesai_tarih_cov_idx",
+        "CREATE INDEX IF NOT EXISTS mesai_tarih_cov_idx "
+        "ON yonetim_mesai (tarih) INCLUDE (saat, personel_id)",
+    ),
+]
+
+
+def postgres_indekslerini_olustur(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for _, sql in POSTGRES_INDEKSLERI:
+        schema_editor.execute(sql)
+
+
+def postgres_indekslerini_kaldir(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for ad, _ in POSTGRES_INDEKSLERI:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {ad}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yonetim', '0011_sube_aylik_ozet'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gelirgider',
+            index=models.Index(fields=['-tarih', '-id'], name='gg_tarih_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gelirgider',
+            index=models.Index(fields=['sube', '-tarih', '-id'], name='gg_sube_tarih_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gelirgider',
+            index=models.Index(fields=['sube', 'tip', '-tarih', '-id'], name='gg_sube_tip_tarih_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gelirgider',
+            index=models.Index(condition=models.Q(('tip', 'gelir')), fields=['-tarih', '-id'], name='gg_gelir_tarih_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gelirgider',
+            index=models.Index(condition=models.Q(('tip', 'gider')), fields=['-tarih', '-id'], name='gg_gider_tarih_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mesai',
+            index=models.Index(fields=['-tarih', '-saat'], name='mesai_tarih_saat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mesai',
+            index=models.Index(fields=['personel', '-tarih'], name='mesai_personel_tarih_idx'),
+        ),
+        migrations.RunPython(postgres_indekslerini_olustur, postgres_indekslerini_kaldir),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yonetim', '0012_gelirgider_mesai_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DisaAktarimIsi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rapor', models.CharField(choices=[('personel_excel', 'Personel Listesi (Excel)'), ('gelir_gider_excel', 'Gelir/Gider Listesi (Excel)'), ('mesai_excel', 'Mesai Raporu (Excel)'), ('personel_yazdir', 'Personel Listesi (Yazdır)'), ('mesai_yazdir', 'Mesai Listesi (Yazdır)'), ('gelir_gider_yazdir', 'Gelir/Gider Listesi (Yazdır)')], max_length=30, verbose_name='Rapor')),
+                ('parametreler', models.JSONField(blank=True, default=dict, verbose_name='Parametreler')),
+                ('durum', models.CharField(choices=[('bekliyor', 'Bekliyor'), ('calisiyor', 'Çalışıyor'), ('tamamlandi', 'Tamamlandı'), ('hata', 'Hata')], default='bekliyor', max_length=10, verbose_name='Durum')),
+                ('dosya', models.FileField(blank=True, upload_to='disa_aktarimlar/%Y/%m/', verbose_name='Dosya')),
+                ('dosya_adi', models.CharField(blank=True, max_length=200, verbose_name='Dosya Adı')),
+                ('hata_mesaji', models.TextField(blank=True, verbose_name='Hata Mesajı')),
+                ('olusturma_tarihi', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturma Tarihi')),
+                ('baslama_tarihi', models.DateTimeField(blank=True, null=True, verbose_name='Başlama Tarihi')),
+                ('bitis_tarihi', models.DateTimeField(blank=True, null=True, verbose_name='Bitiş Tarihi')),
+                ('kullanici', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='Kullanıcı')),
+            ],
+            options={
+                'verbose_name': 'Dışa Aktarım İşi',
+                'verbose_name_plural': 'Dışa Aktarım İşleri',
+                'ordering': ['-olusturma_tarihi'],
+                'indexes': [models.Index(fields=['durum', 'olusturma_tarihi'], name='disa_aktarim_kuyruk_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,118 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:58
+
+import unicodedata
+
+from django.db import migrations, models
+
+PARCA_BOYUTU = 2000
+
+# yonetim.arama.turkce_katla'nın bu migration yazıldığı andaki kopyası. Uygulama
+# kodu sonradan değişse de bu adım aynı sonucu üretsin diye buraya alındı.
+_KATLAMA_TABLOSU = str.maketrans(
+    {
+        "İ": "i",
+        "I": "i",
+        "ı": "i",
+        "Ş": "s",
+        "ş": "s",
+        "Ğ": "g",
+        "ğ": "g",
+        "Ü": "u",
+        "ü": "u",
+        "Ö": "o",
+        "ö": "o",
+        "Ç": "c",
+        "ç": "c",
+    }
+)
+
+
+def arama_metni(*parcalar):
+    metin = " ".join(str(p) for p in parcalar if p)
+    if not metin:
+        return ""
+    metin = unicodedata.normalize("NFC", metin).translate(_KATLAMA_TABLOSU)
+    metin = unicodedata.normalize("NFKD", metin.lower())
+    metin = "".join(harf for harf in metin if not unicodedata.combining(harf))
+    return " ".join(metin.split())
+
+# Katlanmış arama sütunlarında "LIKE '%terim%'" sorgularını indeksle çözen
+# trigram indeksleri. Yalnızca PostgreSQL'de (pg_trgm eklentisiyle) oluşturulur.
+POSTGRES_INDEKSLERI = [
+    (
+        "personel_arama_trgm_idx",
+        "CREATE INDEX IF NOT EXISTS personel_arama_trgm_idx "
+        "ON yonetim_personel USING gin (arama_metni gin_trgm_ops)",
+    ),
+    (
+        "mesai_arama_trgm_idx",
+        "CREATE INDEX IF NOT EXISTS mesai_arama_trgm_idx "
+        "ON yonetim_mesai USING gin (arama_metni gin_trgm_ops)",
+    ),
+]
+
+
+def _parca_parca_guncelle(model, sorgu, hesapla):
+    """Satırları ``PARCA_BOYUTU``'luk parçalarla okuyup her parçayı ayrı yazar."""
+    parca = []
+    for nesne in sorgu.order_by("pk").iterator(chunk_size=PARCA_BOYUTU):
+        nesne.arama_metni = hesapla(nesne)
+        parca.append(nesne)
+        if len(parca) == PARCA_BOYUTU:
+            model.objects.bulk_update(parca, ["arama_metni"])
+            parca = []
+    if parca:
+        model.objects.bulk_update(parca, ["arama_metni"])
+
+
+def arama_metinlerini_doldur(apps, schema_editor):
+    Personel = apps.get_model("yonetim", "Personel")
+    Mesai = apps.get_model("yonetim", "Mesai")
+
+    _parca_parca_guncelle(
+        Personel,
+        Personel.objects.only("ad", "soyad", "pozisyon"),
+        lambda p: arama_metni(p.ad, p.soyad, p.pozisyon),
+    )
+    _parca_parca_guncelle(
+        Mesai,
+        Mesai.objects.exclude(aciklama="").only("aciklama"),
+        lambda m: arama_metni(m.aciklama),
+    )
+
+
+def postgres_indekslerini_olustur(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for _, sql in POSTGRES_INDEKSLERI:
+        schema_editor.execute(sql)
+
+
+def postgres_indekslerini_kaldir(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for ad, _ in POSTGRES_INDEKSLERI:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {ad}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yonetim', '0013_disa_aktarim_isi'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mesai',
+            name='arama_metni',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Arama Metni'),
+        ),
+        migrations.AddField(
+            model_name='personel',
+            name='arama_metni',
+            field=models.CharField(blank=True, default='', editable=False, max_length=310, verbose_name='Arama Metni'),
+        ),
+        migrations.RunPython(arama_metinlerini_doldur, migrations.RunPython.noop),
+        migrations.RunPython(postgres_indekslerini_olustur, postgres_indekslerini_kaldir),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:05
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def ozetleri_doldur(apps, schema_editor):
+    Mesai = apps.get_model("yonetim", "Mesai")
+    PersonelAylikMesai = apps.get_model("yonetim", "PersonelAylikMesai")
+
+    satirlar = (
+        Mesai.objects.annotate(ay=TruncMonth("tarih"))
+        .values("personel_id", "ay")
+        .annotate(toplam_saat=Sum("saat"), kayit_sayisi=Count("id"))
+        .order_by()
+    )
+    PersonelAylikMesai.objects.bulk_create(
+        PersonelAylikMesai(
+            personel_id=satir["personel_id"],
+            ay=satir["ay"],
+            toplam_saat=satir["toplam_saat"],
+            kayit_sayisi=satir["kayit_sayisi"],
+        )
+        for satir in satirlar
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yonetim', '0014_arama_metni'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonelAylikMesai',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ay', models.DateField(verbose_name='Ay')),
+                ('toplam_saat', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=9, verbose_name='Toplam Saat')),
+                ('kayit_sayisi', models.PositiveIntegerField(default=0, verbose_name='Kayıt Sayısı')),
+                ('guncelleme_tarihi', models.DateTimeField(auto_now=True, verbose_name='Güncelleme Tarihi')),
+                ('personel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aylik_mesailer', to='yonetim.personel', verbose_name='Personel')),
+            ],
+            options={
+                'verbose_name': 'Personel Aylık Mesaisi',
+                'verbose_name_plural': 'Personel Aylık Mesaileri',
+                'ordering': ['-ay', 'personel'],
+                'constraints': [models.UniqueConstraint(fields=('personel', 'ay'), name='uniq_personel_aylik_mesai')],
+            },
+        ),
+        migrations.RunPython(ozetleri_doldur, migrations.RunPython.noop),
+    ]
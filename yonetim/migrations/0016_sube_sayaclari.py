@@ -0,0 +1,44 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:09
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def sayaclari_doldur(apps, schema_editor):
+    Sube = apps.get_model("yonetim", "Sube")
+    GelirGider = apps.get_model("yonetim", "GelirGider")
+    Personel = apps.get_model("yonetim", "Personel")
+
+    for satir in GelirGider.objects.values("sube_id", "tip").annotate(toplam=Sum("tutar")).order_by():
+        Sube.objects.filter(pk=satir["sube_id"]).update(
+            **{f"{satir['tip']}_toplami": satir["toplam"]}
+        )
+    for satir in Personel.objects.values("sube_id").annotate(adet=Count("id")).order_by():
+        Sube.objects.filter(pk=satir["sube_id"]).update(personel_adedi=satir["adet"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yonetim', '0015_personel_aylik_mesai'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sube',
+            name='gelir_toplami',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), editable=False, max_digits=14, verbose_name='Gelir Toplamı'),
+        ),
+        migrations.AddField(
+            model_name='sube',
+            name='gider_toplami',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), editable=False, max_digits=14, verbose_name='Gider Toplamı'),
+        ),
+        migrations.AddField(
+            model_name='sube',
+            name='personel_adedi',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Personel Adedi'),
+        ),
+        migrations.RunPython(sayaclari_doldur, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# 0012'de ham SQL ile eklenen PostgreSQL indeksleri Meta'daki B-tree
+# indekslerinin kopyasıydı: BRIN (tarih) gg_tarih_id_idx'in, kapsayan
+# (tip, tarih) gg_tip_tarih_idx'in, kapsayan mesai (tarih)
+# mesai_tarih_saat_idx'in işini görüyordu.
+ESKI_POSTGRES_INDEKSLERI = [
+    (
+        "gg_tarih_brin",
+        "CREATE INDEX IF NOT EXISTS gg_tarih_brin "
+        "ON yonetim_gelirgider USING brin (tarih)",
+    ),
+    (
+        "gg_tip_tarih_cov_idx",
+        "CREATE INDEX IF NOT EXISTS gg_tip_tarih_cov_idx "
+        "ON yonetim_gelirgider (tip, tarih) INCLUDE (tutar, sube_id)",
+    ),
+    (
+        "mesai_tarih_cov_idx",
+        "CREATE INDEX IF NOT EXISTS mesai_tarih_cov_idx "
+        "ON yonetim_mesai (tarih) INCLUDE (saat, personel_id)",
+    ),
+]
+
+
+def eski_indeksleri_kaldir(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for ad, _ in ESKI_POSTGRES_INDEKSLERI:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {ad}")
+
+
+def eski_indeksleri_olustur(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for _, sql in ESKI_POSTGRES_INDEKSLERI:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yonetim', '0016_sube_sayaclari'),
+    ]
+
+    operations = [
+        migrations.RunPython(eski_indeksleri_kaldir, eski_indeksleri_olustur),
+        migrations.RemoveIndex(
+            model_name='gelirgider',
+            name='gg_gelir_tarih_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='gelirgider',
+            name='gg_gider_tarih_idx',
+        ),
+        migrations.AlterField(
+            model_name='gelirgider',
+            name='sube',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='yonetim.sube', verbose_name='Şube'),
+        ),
+        migrations.AlterField(
+            model_name='mesai',
+            name='personel',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='yonetim.personel', verbose_name='Personel'),
+        ),
+        migrations.AddIndex(
+            model_name='gelirgider',
+            index=models.Index(fields=['tip', '-tarih', '-id'], name='gg_tip_tarih_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yonetim', '0017_indeks_sadelestirme'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='disaaktarimisi',
+            name='rapor',
+            field=models.CharField(choices=[('personel_excel', 'Personel Listesi (Excel)'), ('gelir_gider_excel', 'Gelir/Gider Listesi (Excel)'), ('mesai_excel', 'Mesai Raporu (Excel)'), ('personel_yazdir', 'Personel Listesi (Yazdır)'), ('mesai_yazdir', 'Mesai Listesi (Yazdır)'), ('gelir_gider_yazdir', 'Gelir/Gider Listesi (Yazdır)'), ('gelir_gider_ice_aktarim', 'Gelir/Gider İçe Aktarım (Sonuç)')], max_length=30, verbose_name='Rapor'),
+        ),
+    ]
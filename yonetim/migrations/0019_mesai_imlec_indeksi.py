@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yonetim', '0018_ice_aktarim_isi'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mesai',
+            index=models.Index(fields=['-tarih', '-id'], name='mesai_tarih_id_idx'),
+        ),
+    ]
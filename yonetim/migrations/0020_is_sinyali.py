@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yonetim', '0019_mesai_imlec_indeksi'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='disaaktarimisi',
+            name='son_sinyal',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Son Sinyal'),
+        ),
+    ]
@@ -1,7 +1,34 @@
-from django.db import models
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Coalesce, TruncMonth
 from django.core.validators import MinValueValidator
+from django.utils import timezone
 from decimal import Decimal
 
+from . import onbellek
+from .arama import arama_metni
+
+
+def _kovaya_ekle(model, kova, farklar):
+    """Özet ``kova`` satırına ``farklar`` değerlerini ``F()`` ile ekler.
+
+    Kova yeniden toplanmaz; ``UPDATE ... SET x = x + d`` ile güncellendiğinden
+    aynı kovaya eşzamanlı iki yazma birbirinin tutarını ezmez. Kova yoksa
+    oluşturulur (eşzamanlı biri önce oluşturduysa ona eklenir), kayıt sayısı
+    sıfıra inen kova silinir.
+    """
+    sorgu = model.objects.filter(**kova)
+    guncelleme = {alan: models.F(alan) + fark for alan, fark in farklar.items()}
+    guncelleme["guncelleme_tarihi"] = timezone.now()
+    if not sorgu.update(**guncelleme) and farklar["kayit_sayisi"] > 0:
+        try:
+            with transaction.atomic():
+                model.objects.create(**kova, **farklar)
+        except IntegrityError:
+            sorgu.update(**guncelleme)
+    if farklar["kayit_sayisi"] < 0:
+        sorgu.filter(kayit_sayisi=0).delete()
+
 
 class Sube(models.Model):
     TUR_SECENEKLERI = [
@@ -16,6 +43,19 @@ class Sube(models.Model):
     adres = models.TextField(verbose_name="Adres")
     telefon = models.CharField(max_length=20, verbose_name="Telefon")
     yonetici = models.CharField(max_length=100, verbose_name="Yönetici")
+    # GelirGider ve Personel yazıldıkça sinyallerle F() ile güncellenen sayaçlar
+    # (bkz. signals.py); ``sube_sayaclarini_denetle`` komutu ile doğrulanır
+    gelir_toplami = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00"), editable=False,
+        verbose_name="Gelir Toplamı",
+    )
+    gider_toplami = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00"), editable=False,
+        verbose_name="Gider Toplamı",
+    )
+    personel_adedi = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Personel Adedi"
+    )
     olusturma_tarihi = models.DateTimeField(
         auto_now_add=True, verbose_name="Oluşturma Tarihi"
     )
@@ -28,26 +68,109 @@ class Sube(models.Model):
         verbose_name_plural = "Şubeler"
         ordering = ["ad"]
 
+    SAYAC_ALANLARI = ("gelir_toplami", "gider_toplami", "personel_adedi")
+
     def __str__(self):
         return self.ad
 
+    def save(self, *args, **kwargs):
+        # Sayaçlar yalnızca F() güncellemeleriyle değişir; formdan kaydedilen
+        # şube bellekteki eski sayaç değerlerini geri yazmasın
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                alan.attname
+                for alan in self._meta.concrete_fields
+                if not alan.primary_key and alan.attname not in self.SAYAC_ALANLARI
+            ]
+        super().save(*args, **kwargs)
+
     def toplam_gelir(self):
-        return self.gelirgider_set.filter(tip="gelir").aggregate(
-            toplam=models.Sum("tutar")
-        )["toplam"] or Decimal("0.00")
+        return self.gelir_toplami
 
     def toplam_gider(self):
-        return self.gelirgider_set.filter(tip="gider").aggregate(
-            toplam=models.Sum("tutar")
-        )["toplam"] or Decimal("0.00")
+        return self.gider_toplami
 
     def net_kar(self):
-        return self.toplam_gelir() - self.toplam_gider()
+        return self.gelir_toplami - self.gider_toplami
 
     def personel_sayisi(self):
-        return self.personel_set.count()
+        return self.personel_adedi
+
+    @classmethod
+    def sayaclari_degistir(cls, sube_id, gelir=0, gider=0, personel=0):
+        """Şube sayaçlarına verilen farkları tek bir ``UPDATE ... SET x = x + d`` ile ekler.
+
+        Değer veritabanında artırıldığından eşzamanlı yazmalarda güncelleme
+        kaybolmaz; çağıranın transaction'ı geri alınırsa fark da geri alınır.
+        """
+        farklar = {}
+        if gelir:
+            farklar["gelir_toplami"] = models.F("gelir_toplami") + gelir
+        if gider:
+            farklar["gider_toplami"] = models.F("gider_toplami") + gider
+        if personel:
+            farklar["personel_adedi"] = models.F("personel_adedi") + personel
+        if farklar:
+            cls.objects.filter(pk=sube_id).update(**farklar)
+
+    @classmethod
+    def gercek_sayaclar(cls):
+        """Sayaçların kaynak tablolardan hesaplanmış değerleri: ``{sube_id: {alan: değer}}``.
 
-    
+        Yalnızca kaydı olan şubeler döner; olmayanlar için değerler sıfırdır.
+        """
+        sayaclar = {}
+
+        def sube_sayaclari(sube_id):
+            return sayaclar.setdefault(
+                sube_id,
+                {
+                    "gelir_toplami": Decimal("0.00"),
+                    "gider_toplami": Decimal("0.00"),
+                    "personel_adedi": 0,
+                },
+            )
+
+        for satir in (
+            GelirGider.objects.values("sube_id", "tip")
+            .annotate(toplam=models.Sum("tutar"))
+            .order_by()
+        ):
+            sube_sayaclari(satir["sube_id"])[f"{satir['tip']}_toplami"] = satir["toplam"]
+        for satir in (
+            Personel.objects.values("sube_id").annotate(adet=models.Count("id")).order_by()
+        ):
+            sube_sayaclari(satir["sube_id"])["personel_adedi"] = satir["adet"]
+        return sayaclar
+
+
+class PersonelQuerySet(models.QuerySet):
+    def mesai_toplamlari(self, ay=None):
+        """``bu_ay_mesai`` ve ``toplam_mesai`` alanlarını ekler.
+
+        Değerler ``PersonelAylikMesai`` özet tablosundan alt sorgu ile okunur;
+        ``Mesai`` tablosu taranmaz ve personel satırları çoğalmaz. ``ay``
+        verilmezse bu ay kullanılır.
+        """
+        ay = PersonelAylikMesai.ay_baslangici(ay or timezone.localdate())
+        ozetler = PersonelAylikMesai.objects.filter(personel=models.OuterRef("pk")).order_by()
+        saat_alani = models.DecimalField(max_digits=9, decimal_places=2)
+        return self.annotate(
+            bu_ay_mesai=Coalesce(
+                models.Subquery(ozetler.filter(ay=ay).values("toplam_saat")[:1]),
+                models.Value(Decimal("0.00")),
+                output_field=saat_alani,
+            ),
+            toplam_mesai=Coalesce(
+                models.Subquery(
+                    ozetler.values("personel")
+                    .annotate(toplam=models.Sum("toplam_saat"))
+                    .values("toplam")
+                ),
+                models.Value(Decimal("0.00")),
+                output_field=saat_alani,
+            ),
+        )
 
 
 class Personel(models.Model):
@@ -58,6 +181,10 @@ class Personel(models.Model):
     ise_baslama_tarihi = models.DateField(verbose_name="İşe Başlama Tarihi")
     telefon = models.CharField(max_length=20, verbose_name="Telefon")
     email = models.EmailField(verbose_name="E-posta", blank=True, null=True)
+    # ad, soyad ve pozisyonun aramaya göre katlanmış hâli (bkz. arama.py)
+    arama_metni = models.CharField(
+        max_length=310, blank=True, default="", editable=False, verbose_name="Arama Metni"
+    )
     olusturma_tarihi = models.DateTimeField(
         auto_now_add=True, verbose_name="Oluşturma Tarihi"
     )
@@ -65,6 +192,8 @@ class Personel(models.Model):
         auto_now=True, verbose_name="Güncelleme Tarihi"
     )
 
+    objects = PersonelQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Personel"
         verbose_name_plural = "Personeller"
@@ -73,17 +202,30 @@ class Personel(models.Model):
     def __str__(self):
         return f"{self.ad} {self.soyad} - {self.pozisyon}"
 
+    def arama_metnini_guncelle(self):
+        self.arama_metni = arama_metni(self.ad, self.soyad, self.pozisyon)
+
+    def save(self, *args, **kwargs):
+        self.arama_metnini_guncelle()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "arama_metni"}
+        # Şube sayacı post_save sinyalinde güncellenir; kayıtla birlikte geri alınsın
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     @property
     def tam_ad(self):
         return f"{self.ad} {self.soyad}"
 
     def toplam_mesai_saati(self):
-        return self.mesai_set.aggregate(toplam=models.Sum("saat"))["toplam"] or 0
+        return self.aylik_mesailer.aggregate(toplam=models.Sum("toplam_saat"))["toplam"] or 0
 
 
 class Mesai(models.Model):
+    # Personel aramaları mesai_personel_tarih_idx'in önekini kullanır
     personel = models.ForeignKey(
-        Personel, on_delete=models.CASCADE, verbose_name="Personel"
+        Personel, on_delete=models.CASCADE, db_index=False, verbose_name="Personel"
     )
     tarih = models.DateField(verbose_name="Tarih")
     saat = models.DecimalField(
@@ -93,6 +235,10 @@ class Mesai(models.Model):
         verbose_name="Mesai Saati",
     )
     aciklama = models.TextField(blank=True, verbose_name="Açıklama")
+    # açıklamanın aramaya göre katlanmış hâli; personel adı Personel.arama_metni'nde
+    arama_metni = models.TextField(
+        blank=True, default="", editable=False, verbose_name="Arama Metni"
+    )
     olusturma_tarihi = models.DateTimeField(
         auto_now_add=True, verbose_name="Oluşturma Tarihi"
     )
@@ -104,10 +250,152 @@ class Mesai(models.Model):
         verbose_name = "Mesai"
         verbose_name_plural = "Mesailer"
         ordering = ["-tarih", "-olusturma_tarihi"]
+        indexes = [
+            # mesai_listesi: ay aralığı + "-tarih, -saat" sıralaması
+            models.Index(fields=["-tarih", "-saat"], name="mesai_tarih_saat_idx"),
+            # mesai_listesi imleç modu: "-tarih, -id" keyset sayfalaması
+            models.Index(fields=["-tarih", "-id"], name="mesai_tarih_id_idx"),
+            # personel filtresi ve personel bazında toplamlar
+            models.Index(fields=["personel", "-tarih"], name="mesai_personel_tarih_idx"),
+        ]
 
     def __str__(self):
         return f"{self.personel.tam_ad} - {self.tarih} - {self.saat} saat"
 
+    def arama_metnini_guncelle(self):
+        self.arama_metni = arama_metni(self.aciklama)
+
+    @classmethod
+    def toplu_olustur(cls, mesailer, batch_size=500):
+        """Mesaileri tek transaction'da ``bulk_create`` ile ekler.
+
+        ``bulk_create`` ``save()`` ve ``post_save`` sinyallerini atladığından
+        arama metni, aylık mesai özeti ve önbellek sürümü burada güncellenir.
+        """
+        kovalar = {}
+        for mesai in mesailer:
+            mesai.arama_metnini_guncelle()
+            kova = (mesai.personel_id, PersonelAylikMesai.ay_baslangici(mesai.tarih))
+            saat, adet = kovalar.get(kova, (Decimal("0.00"), 0))
+            kovalar[kova] = (saat + Decimal(mesai.saat), adet + 1)
+        with transaction.atomic():
+            olusturulanlar = cls.objects.bulk_create(mesailer, batch_size=batch_size)
+            PersonelAylikMesai.farklari_ekle(kovalar)
+            # Sürümler commit edilince artar
+            onbellek.model_yazildi(cls)
+            onbellek.gecmis_yazildi(cls, *(ay for _, ay in kovalar))
+        return olusturulanlar
+
+    def save(self, *args, **kwargs):
+        self.arama_metnini_guncelle()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "arama_metni"}
+        super().save(*args, **kwargs)
+
+
+class PersonelAylikMesai(models.Model):
+    """Personel ve ay bazında önceden toplanmış mesai saatleri.
+
+    Mesai kayıtları kaydedildikçe/silindikçe sinyallerle güncel tutulur;
+    ``rebuild_aylik_mesai`` komutu ile baştan oluşturulabilir.
+    """
+
+    personel = models.ForeignKey(
+        Personel,
+        on_delete=models.CASCADE,
+        related_name="aylik_mesailer",
+        verbose_name="Personel",
+    )
+    ay = models.DateField(verbose_name="Ay")  # Ayın ilk günü
+    toplam_saat = models.DecimalField(
+        max_digits=9, decimal_places=2, default=Decimal("0.00"), verbose_name="Toplam Saat"
+    )
+    kayit_sayisi = models.PositiveIntegerField(default=0, verbose_name="Kayıt Sayısı")
+    guncelleme_tarihi = models.DateTimeField(
+        auto_now=True, verbose_name="Güncelleme Tarihi"
+    )
+
+    class Meta:
+        verbose_name = "Personel Aylık Mesaisi"
+        verbose_name_plural = "Personel Aylık Mesaileri"
+        ordering = ["-ay", "personel"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["personel", "ay"], name="uniq_personel_aylik_mesai"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.personel_id} - {self.ay:%Y-%m}: {self.toplam_saat} saat"
+
+    @staticmethod
+    def ay_baslangici(tarih):
+        return tarih.replace(day=1)
+
+    @classmethod
+    def farklari_ekle(cls, farklar):
+        """``{(personel_id, ay): (saat farkı, kayıt farkı)}`` farklarını kovalara ekler.
+
+        Kovalar Mesai tablosundan yeniden toplanmaz (bkz. ``_kovaya_ekle``).
+        """
+        for (personel_id, ay), (saat, adet) in farklar.items():
+            if saat or adet:
+                _kovaya_ekle(
+                    cls,
+                    {"personel_id": personel_id, "ay": cls.ay_baslangici(ay)},
+                    {"toplam_saat": saat, "kayit_sayisi": adet},
+                )
+
+    @classmethod
+    def tumunu_yeniden_olustur(cls):
+        """Tüm özet tablosunu tek bir gruplu sorgu ile baştan oluşturur."""
+        satirlar = (
+            Mesai.objects.annotate(ay=TruncMonth("tarih"))
+            .values("personel_id", "ay")
+            .annotate(toplam_saat=models.Sum("saat"), kayit_sayisi=models.Count("id"))
+            .order_by()
+        )
+        with transaction.atomic():
+            cls.objects.all().delete()
+            ozetler = cls.objects.bulk_create(
+                cls(
+                    personel_id=satir["personel_id"],
+                    ay=satir["ay"],
+                    toplam_saat=satir["toplam_saat"],
+                    kayit_sayisi=satir["kayit_sayisi"],
+                )
+                for satir in satirlar
+            )
+        # Özetler sayfalarda mesai toplamı olarak görünür
+        onbellek.model_yazildi(Mesai)
+        return len(ozetler)
+
+
+class GelirGiderQuerySet(models.QuerySet):
+    def ozet(self):
+        """Kayıt sayısı, gelir/gider toplamları ve net tutarı tek sorguda döner.
+
+        Filtrelenmiş sorgu üzerinde koşullu toplama (``SUM ... FILTER``) yapılır;
+        liste, yazdırma ve dışa aktarım aynı satırları yeniden taramaz.
+        """
+        tutar_alani = models.DecimalField(max_digits=14, decimal_places=2)
+        sonuc = self.order_by().aggregate(
+            kayit_sayisi=models.Count("id"),
+            toplam_gelir=Coalesce(
+                models.Sum("tutar", filter=models.Q(tip="gelir")),
+                models.Value(Decimal("0.00")),
+                output_field=tutar_alani,
+            ),
+            toplam_gider=Coalesce(
+                models.Sum("tutar", filter=models.Q(tip="gider")),
+                models.Value(Decimal("0.00")),
+                output_field=tutar_alani,
+            ),
+        )
+        sonuc["net_kar"] = sonuc["toplam_gelir"] - sonuc["toplam_gider"]
+        return sonuc
+
 
 class GelirGider(models.Model):
     TIP_SECENEKLERI = [
@@ -120,7 +408,10 @@ class GelirGider(models.Model):
         # Gelecekte buraya yeni seçenekler eklenebilir
     ]
 
-    sube = models.ForeignKey(Sube, on_delete=models.CASCADE, verbose_name="Şube")
+    # Şube aramaları gg_sube_tarih_idx'in önekini kullanır; ayrı FK indeksi yok
+    sube = models.ForeignKey(
+        Sube, on_delete=models.CASCADE, db_index=False, verbose_name="Şube"
+    )
     tip = models.CharField(max_length=10, choices=TIP_SECENEKLERI, verbose_name="Tip")
     kategori = models.CharField(
         max_length=100,
@@ -143,10 +434,235 @@ class GelirGider(models.Model):
         auto_now=True, verbose_name="Güncelleme Tarihi"
     )
 
+    objects = GelirGiderQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Gelir/Gider"
         verbose_name_plural = "Gelir/Giderler"
         ordering = ["-tarih", "-olusturma_tarihi"]
+        # Erişim yolu başına tek indeks; her ekleme (toplu içe aktarım dahil)
+        # hepsini günceller
+        indexes = [
+            # Filtresiz liste/yazdır/dışa aktar: "-tarih, -id" sıralaması
+            models.Index(fields=["-tarih", "-id"], name="gg_tarih_id_idx"),
+            # Şube filtresi (ve şube silmede CASCADE araması)
+            models.Index(fields=["sube", "-tarih", "-id"], name="gg_sube_tarih_idx"),
+            # Şube + tip filtresi ve aylık özet yeniden hesaplama
+            models.Index(
+                fields=["sube", "tip", "-tarih", "-id"], name="gg_sube_tip_tarih_idx"
+            ),
+            # Yalnızca tip filtresi
+            models.Index(fields=["tip", "-tarih", "-id"], name="gg_tip_tarih_idx"),
+        ]
 
     def __str__(self):
         return f"{self.sube.ad} - {self.get_tip_display()} - {self.kategori} - {self.tutar}₺"
+
+    def save(self, *args, **kwargs):
+        # Aylık özet ve şube sayaçları post_save sinyalinde güncellenir;
+        # kayıtla birlikte geri alınabilmeleri için aynı transaction'da çalışır
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class SubeAylikOzet(models.Model):
+    """Şube, ay ve tip bazında önceden toplanmış gelir/gider özeti.
+
+    GelirGider kayıtları kaydedildikçe/silindikçe sinyallerle güncel tutulur;
+    ``rebuild_aylik_ozet`` komutu ile baştan oluşturulabilir.
+    """
+
+    sube = models.ForeignKey(
+        Sube,
+        on_delete=models.CASCADE,
+        related_name="aylik_ozetler",
+        verbose_name="Şube",
+    )
+    ay = models.DateField(verbose_name="Ay")  # Ayın ilk günü
+    tip = models.CharField(
+        max_length=10, choices=GelirGider.TIP_SECENEKLERI, verbose_name="Tip"
+    )
+    toplam = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00"), verbose_name="Toplam"
+    )
+    kayit_sayisi = models.PositiveIntegerField(default=0, verbose_name="Kayıt Sayısı")
+    guncelleme_tarihi = models.DateTimeField(
+        auto_now=True, verbose_name="Güncelleme Tarihi"
+    )
+
+    class Meta:
+        verbose_name = "Şube Aylık Özeti"
+        verbose_name_plural = "Şube Aylık Özetleri"
+        ordering = ["-ay", "sube"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["sube", "ay", "tip"], name="uniq_sube_aylik_ozet"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.sube_id} - {self.ay:%Y-%m} - {self.tip}: {self.toplam}₺"
+
+    @staticmethod
+    def ay_baslangici(tarih):
+        return tarih.replace(day=1)
+
+    @classmethod
+    def farklari_ekle(cls, farklar):
+        """``{(sube_id, ay, tip): (tutar farkı, kayıt farkı)}`` farklarını kovalara ekler.
+
+        Sinyaller ve toplu içe aktarım yazdıkları kayıtların farklarını verir;
+        kovalar GelirGider tablosundan yeniden toplanmaz.
+        """
+        for (sube_id, ay, tip), (tutar, adet) in farklar.items():
+            if tutar or adet:
+                _kovaya_ekle(
+                    cls,
+                    {"sube_id": sube_id, "ay": cls.ay_baslangici(ay), "tip": tip},
+                    {"toplam": tutar, "kayit_sayisi": adet},
+                )
+
+    @classmethod
+    def tumunu_yeniden_olustur(cls):
+        """Tüm özet tablosunu tek bir gruplu sorgu ile baştan oluşturur."""
+        satirlar = (
+            GelirGider.objects.annotate(ay=TruncMonth("tarih"))
+            .values("sube_id", "ay", "tip")
+            .annotate(toplam=models.Sum("tutar"), kayit_sayisi=models.Count("id"))
+            .order_by()
+        )
+        with transaction.atomic():
+            cls.objects.all().delete()
+            ozetler = cls.objects.bulk_create(
+                cls(
+                    sube_id=satir["sube_id"],
+                    ay=satir["ay"],
+                    tip=satir["tip"],
+                    toplam=satir["toplam"],
+                    kayit_sayisi=satir["kayit_sayisi"],
+                )
+                for satir in satirlar
+            )
+        # Özetler ana sayfada gelir/gider toplamı olarak görünür
+        onbellek.model_yazildi(GelirGider)
+        return len(ozetler)
+
+
+class DisaAktarimIsi(models.Model):
+    """Arka planda ``run_export_worker`` tarafından üretilen dışa aktarım işi.
+
+    Veritabanı tabanlı basit bir kuyruk: view'lar ``bekliyor`` durumunda iş
+    ekler, çalışan süreç işleri sırayla alıp dosyayı ``dosya`` alanına yazar.
+    Çalışan süreç iş sürdükçe ``son_sinyal`` alanını tazeler; yalnızca sinyali
+    kesilen (süreci ölmüş) işler yeniden kuyruğa alınır.
+    """
+
+    RAPOR_SECENEKLERI = [
+        ("personel_excel", "Personel Listesi (Excel)"),
+        ("gelir_gider_excel", "Gelir/Gider Listesi (Excel)"),
+        ("mesai_excel", "Mesai Raporu (Excel)"),
+        ("personel_yazdir", "Personel Listesi (Yazdır)"),
+        ("mesai_yazdir", "Mesai Listesi (Yazdır)"),
+        ("gelir_gider_yazdir", "Gelir/Gider Listesi (Yazdır)"),
+        ("gelir_gider_ice_aktarim", "Gelir/Gider İçe Aktarım (Sonuç)"),
+    ]
+
+    DURUM_SECENEKLERI = [
+        ("bekliyor", "Bekliyor"),
+        ("calisiyor", "Çalışıyor"),
+        ("tamamlandi", "Tamamlandı"),
+        ("hata", "Hata"),
+    ]
+
+    kullanici = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, verbose_name="Kullanıcı"
+    )
+    rapor = models.CharField(
+        max_length=30, choices=RAPOR_SECENEKLERI, verbose_name="Rapor"
+    )
+    parametreler = models.JSONField(default=dict, blank=True, verbose_name="Parametreler")
+    durum = models.CharField(
+        max_length=10, choices=DURUM_SECENEKLERI, default="bekliyor", verbose_name="Durum"
+    )
+    dosya = models.FileField(
+        upload_to="disa_aktarimlar/%Y/%m/", blank=True, verbose_name="Dosya"
+    )
+    dosya_adi = models.CharField(max_length=200, blank=True, verbose_name="Dosya Adı")
+    hata_mesaji = models.TextField(blank=True, verbose_name="Hata Mesajı")
+    olusturma_tarihi = models.DateTimeField(
+        auto_now_add=True, verbose_name="Oluşturma Tarihi"
+    )
+    baslama_tarihi = models.DateTimeField(null=True, blank=True, verbose_name="Başlama Tarihi")
+    son_sinyal = models.DateTimeField(null=True, blank=True, verbose_name="Son Sinyal")
+    bitis_tarihi = models.DateTimeField(null=True, blank=True, verbose_name="Bitiş Tarihi")
+
+    class Meta:
+        verbose_name = "Dışa Aktarım İşi"
+        verbose_name_plural = "Dışa Aktarım İşleri"
+        ordering = ["-olusturma_tarihi"]
+        indexes = [
+            models.Index(fields=["durum", "olusturma_tarihi"], name="disa_aktarim_kuyruk_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_rapor_display()} - {self.get_durum_display()}"
+
+    @classmethod
+    def siradakini_al(cls):
+        """En eski bekleyen işi atomik olarak ``calisiyor`` durumuna alıp döner.
+
+        Koşullu UPDATE kullanıldığından birden fazla çalışan süreç aynı işi
+        alamaz; kilit desteği olmayan SQLite'ta da güvenle çalışır.
+        """
+        while True:
+            is_id = (
+                cls.objects.filter(durum="bekliyor")
+                .order_by("olusturma_tarihi", "id")
+                .values_list("id", flat=True)
+                .first()
+            )
+            if is_id is None:
+                return None
+            simdi = timezone.now()
+            alindi = cls.objects.filter(id=is_id, durum="bekliyor").update(
+                durum="calisiyor", baslama_tarihi=simdi, son_sinyal=simdi
+            )
+            if alindi:
+                return cls.objects.get(id=is_id)
+
+    @classmethod
+    def sinyal_ver(cls, is_id):
+        """Çalışan işin ``son_sinyal`` zamanını tazeler; iş artık çalışmıyorsa False."""
+        return bool(
+            cls.objects.filter(id=is_id, durum="calisiyor").update(son_sinyal=timezone.now())
+        )
+
+    @classmethod
+    def takilanlari_kuyruga_al(cls, zaman_asimi):
+        """``zaman_asimi`` süresinden uzun süredir sinyal vermeyen işleri yeniden kuyruğa alır.
+
+        Uzun süren ama çalışanı hâlâ sinyal veren işler (ör. büyük bir içe
+        aktarım) yerinde kalır; aynı iş iki çalışanda birden yürümez.
+        """
+        esik = timezone.now() - zaman_asimi
+        return (
+            cls.objects.filter(durum="calisiyor")
+            .filter(
+                models.Q(son_sinyal__lt=esik)
+                | models.Q(son_sinyal__isnull=True, baslama_tarihi__lt=esik)
+            )
+            .update(durum="bekliyor", baslama_tarihi=None, son_sinyal=None)
+        )
+
+    def basariyla_bitir(self, dosya_adi, icerik):
+        self.dosya_adi = dosya_adi
+        self.dosya.save(dosya_adi, icerik, save=False)
+        self.durum = "tamamlandi"
+        self.bitis_tarihi = timezone.now()
+        self.save(update_fields=["dosya", "dosya_adi", "durum", "bitis_tarihi"])
+
+    def hatali_bitir(self, mesaj):
+        self.hata_mesaji = mesaj
+        self.durum = "hata"
+        self.bitis_tarihi = timezone.now()
+        self.save(update_fields=["hata_mesaji", "durum", "bitis_tarihi"])
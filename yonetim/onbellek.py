@@ -0,0 +1,214 @@
+"""Önbellek sürüm anahtarları.
+
+``{% cache %}`` etiketinin ve filtre sonuçlarının anahtarları ay/şube/filtre
+gibi değerlerden oluşur; bunların tüm kombinasyonlarını tek tek silmek yerine
+her veri grubunun bir sürüm numarası tutulur ve anahtara eklenir. Veri
+değiştiğinde ``signals.py`` sürümü artırır, eski kayıtlar bir daha okunmaz ve
+süreleri dolunca önbellekten düşer.
+
+Her model için ayrıca bir veri sürümü tutulur; liste sayfaları ve ana sayfa
+ETag'lerini bu sürümlerden üretir (bkz. ``kosullu_sayfa``). Veri değişmediyse
+tarayıcıya 304 dönülür ve view'daki sorgular hiç çalışmaz.
+
+Sürümler yalnızca paylaşılan bir önbellekte (file/redis) anlamlıdır: süreç içi
+önbellekte başka bir worker'ın ya da yönetim komutunun yazması bu sürece
+ulaşmaz, ETag ve parçalar süresiz eski kalır. ``ONBELLEK_PAYLASIMLI`` kapalıyken
+koşullu GET ve sürümlü önbellekler devre dışıdır; ``check --deploy`` de hata
+verir (bkz. checks.py). Replikadan okunan isteklerde önbelleğe yazılmaz ve ETag
+üretilmez (bkz. ``yazilabilir``).
+"""
+
+import hashlib
+import json
+import time
+from functools import partial
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from .veritabani import replika_modunda
+
+# Şablon parçaları
+ANA_SAYFA = "ana_sayfa"
+SUBELER_LISTESI = "subeler_listesi"
+# Filtre sonuçları (bkz. filtreler.py)
+PERSONEL = "personel"
+GELIR_GIDER = "gelir_gider"
+MESAI = "mesai"
+
+# Bu aydan önceki verinin sürümü (model_name -> grup). Zaman serisinin kapanmış
+# kovaları yalnızca geriye dönük bir yazmada eskir (bkz. zaman_serisi.py)
+GECMIS_GRUPLARI = {
+    "gelirgider": "gelir_gider_gecmis",
+    "mesai": "mesai_gecmis",
+}
+
+# Model yazıldığında sürümü artırılacak gruplar (model_name -> gruplar)
+MODEL_BAGIMLILIKLARI = {
+    "gelirgider": (ANA_SAYFA, SUBELER_LISTESI, GELIR_GIDER),
+    # mesai araması personel adına da baktığı için MESAI de eskir
+    "personel": (ANA_SAYFA, SUBELER_LISTESI, PERSONEL, MESAI),
+    "sube": (ANA_SAYFA, SUBELER_LISTESI),
+    "mesai": (MESAI,),
+}
+
+
+def paylasimli():
+    """Sürüm sayaçlarını tüm süreçler aynı önbellekte görüyorsa True."""
+    return settings.ONBELLEK_PAYLASIMLI
+
+
+def yazilabilir():
+    """Bu istekte hesaplanan sonuçlar önbelleğe yazılıp ETag'e bağlanabilirse True.
+
+    Replikadan okunan veri birincilin gerisinde olabilir, sürüm ise birincilde
+    çoktan artmıştır; bu veri yeni sürümle saklanırsa bir sonraki yazmaya kadar
+    eski kalır.
+    """
+    return paylasimli() and not replika_modunda()
+
+
+def getir(anahtar, hesapla, sure):
+    """``cache.get_or_set``; önbelleğe yazılamayan istekte yalnızca okur."""
+    if not paylasimli():
+        return hesapla()
+    if yazilabilir():
+        return cache.get_or_set(anahtar, hesapla, sure)
+    deger = cache.get(anahtar)
+    return hesapla() if deger is None else deger
+
+
+def _anahtar(ad):
+    return f"yonetim:surum:{ad}"
+
+
+def _ilk_surum():
+    # Önbellek boşalırsa sürüm 1'e dönüp eski bir ETag ile çakışmasın diye
+    # sayaç o anki zamandan (ms) başlatılır
+    return int(time.time() * 1000)
+
+
+def surum(ad):
+    return cache.get_or_set(_anahtar(ad), _ilk_surum, timeout=None)
+
+
+async def asurum(ad):
+    return await cache.aget_or_set(_anahtar(ad), _ilk_surum, timeout=None)
+
+
+def gecersiz_kil(*adlar):
+    for ad in adlar:
+        try:
+            cache.incr(_anahtar(ad))
+        except ValueError:
+            cache.set(_anahtar(ad), _ilk_surum(), timeout=None)
+
+
+def model_yazildi(model):
+    """``model`` tablosuna yazıldığında veri sürümünü ve ona bağlı grupları eskitir.
+
+    Sinyaller bunu her kayıt için çağırır; ``bulk_create`` gibi sinyal
+    göndermeyen toplu işlemler ise işlem sonunda kendisi çağırmalıdır.
+
+    Sürüm yazmanın transaction'ı commit edilince artırılır. Önce artırılsaydı
+    aradaki istekler eski satırları yeni sürümün anahtarıyla önbelleğe
+    yazabilir, bu kayıt da bir sonraki yazmaya kadar eski kalırdı. Transaction
+    geri alınırsa sürüm hiç artmaz; transaction yoksa hemen artırılır.
+    """
+    model_adi = model._meta.model_name
+    transaction.on_commit(partial(gecersiz_kil, model_adi, *MODEL_BAGIMLILIKLARI[model_adi]))
+
+
+def gecmis_yazildi(model, *tarihler):
+    """Tarihlerden biri bu aydan önceyse ``model`` için geçmiş sürümünü eskitir.
+
+    Sinyaller kaydın yeni ve (güncellemede) eski tarihiyle çağırır; toplu
+    işlemler yazdıkları tarihlerle kendileri çağırmalıdır. ``model_yazildi``
+    gibi sürüm commit edilince artar.
+    """
+    bu_ay = timezone.localdate().replace(day=1)
+    if any(tarih < bu_ay for tarih in tarihler if tarih is not None):
+        transaction.on_commit(partial(gecersiz_kil, GECMIS_GRUPLARI[model._meta.model_name]))
+
+
+def parca_baglami(ad):
+    """``{% cache %}`` etiketinin ihtiyaç duyduğu süre ve sürüm değerleri.
+
+    Önbelleğe yazılamıyorsa (bkz. ``yazilabilir``) süre 0'dır; parça varsa
+    önbellekten okunur, yoksa çizilir ama saklanmaz.
+    """
+    return {
+        "parca_suresi": settings.PARCA_ONBELLEK_SURESI if yazilabilir() else 0,
+        "parca_surumu": surum(ad),
+    }
+
+
+def sayfa_etagi(request, modeller):
+    """Sayfanın dayandığı verinin ve isteği yapanın özetinden bir ETag üretir.
+
+    Sayfa yalnızca modellerin verisine değil kullanıcıya (menü, izinler),
+    güne (varsayılan ay) ve CSRF çerezine de bağlıdır; bunlar da özete
+    katılır. Bekleyen bir mesaj varsa ya da sonuç önbelleğe yazılamıyorsa
+    (paylaşılmayan önbellek, replikadan okuma) ETag üretilmez, sayfa baştan
+    çizilir. Sürümler commit'ten sonra arttığından
+    commit edilmemiş veriyle çizilen sayfa hiçbir zaman yeni ETag'i taşımaz.
+    """
+    from .roller import kullanici_rolleri
+
+    if not yazilabilir() or len(get_messages(request)):
+        return None
+    roller = kullanici_rolleri(request.user)
+    parcalar = [
+        request.user.pk,
+        sorted(roller["gruplar"]),
+        sorted(roller["izinler"]),
+        timezone.localdate().isoformat(),
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+        [surum(model._meta.model_name) for model in modeller],
+    ]
+    return hashlib.sha1(json.dumps(parcalar).encode()).hexdigest()
+
+
+def kosullu_sayfa(*modeller):
+    """View'ı ``modeller`` verisi değişmedikçe 304 dönen koşullu GET ile sarar.
+
+    ``login_required``/``permission_required`` altında kullanılmalıdır; ETag
+    yalnızca yetkili istekte hesaplanır. Tarayıcı sayfayı her seferinde
+    doğrulasın diye ``Cache-Control: private, no-cache`` eklenir.
+    """
+
+    def etag(request, *args, **kwargs):
+        return sayfa_etagi(request, modeller)
+
+    def dekorator(view):
+        return cache_control(private=True, no_cache=True)(condition(etag_func=etag)(view))
+
+    return dekorator
+
+
+async def kosullu_yanit(request, etag, son_degisiklik, uret):
+    """Async view'lar için ``condition`` dekoratörünün karşılığı.
+
+    ``condition`` ETag fonksiyonunu senkron çağırır; async view'da ETag'i
+    ``aaggregate`` gibi bir sorgudan hesaplamak mümkün olmadığından view
+    ETag'i kendisi hesaplayıp buraya verir. İstemcinin kopyası güncelse 304
+    döner, değilse ``uret`` beklenir.
+    """
+    etag = quote_etag(etag) if etag is not None else None
+    son_degisiklik = int(son_degisiklik.timestamp()) if son_degisiklik else None
+    response = get_conditional_response(request, etag=etag, last_modified=son_degisiklik)
+    if response is None:
+        response = await uret()
+    if request.method in ("GET", "HEAD"):
+        if son_degisiklik and not response.has_header("Last-Modified"):
+            response.headers["Last-Modified"] = http_date(son_degisiklik)
+        if etag:
+            response.headers.setdefault("ETag", etag)
+    return response
@@ -0,0 +1,244 @@
+"""Dışa aktarım ve yazdırma raporlarının istekten bağımsız üreticileri.
+
+Buradaki fonksiyonlar ``request.GET`` yerine herhangi bir sözlük benzeri
+``params`` alır; böylece aynı rapor hem view içinde senkron olarak hem de
+``run_export_worker`` komutunun çalıştırdığı arka plan işlerinde üretilebilir.
+"""
+
+import tempfile
+from contextlib import nullcontext
+
+import pandas as pd
+from openpyxl.styles import Font
+
+from django.core.files import File
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .excel import (
+    BELLEK_ESIGI,
+    EXPORT_CHUNK_SIZE,
+    PERSONEL_EXCEL_ALANLARI,
+    PERSONEL_EXCEL_BASLIKLARI,
+    sayfa_olustur,
+    yazma_modunda_kitap,
+)
+from .filtreler import GelirGiderFiltresi, MesaiFiltresi, PersonelFiltresi
+from .ice_aktarim import IceAktarimHatasi, ice_aktarim_isi
+from .models import GelirGider
+from .veritabani import replikadan_oku
+
+
+class BosRaporHatasi(Exception):
+    """Filtrelere uyan, dışa aktarılacak kayıt bulunmadığında yükseltilir."""
+
+
+# --- Excel raporları: hedef dosyaya yazar, önerilen dosya adını döner ---
+
+
+def personel_excel_yaz(params, hedef):
+    """Personel listesini .xlsx olarak yazar."""
+    workbook = yazma_modunda_kitap()
+    worksheet = sayfa_olustur(workbook, "Personel Listesi", PERSONEL_EXCEL_BASLIKLARI)
+    satirlar = (
+        PersonelFiltresi(params)
+        .queryset()
+        .values_list(*PERSONEL_EXCEL_ALANLARI)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    for satir in satirlar:
+        worksheet.append(satir)
+    workbook.save(hedef)
+    return "personel_listesi.xlsx"
+
+
+def gelir_gider_excel_yaz(params, hedef):
+    """Gelir/Gider listesini tek sayfalı bir .xlsx olarak yazar."""
+    filtre = GelirGiderFiltresi(params)
+    ozet = filtre.ozet()
+    if not ozet["kayit_sayisi"]:
+        raise BosRaporHatasi("Dışa aktarılacak veri bulunamadı.")
+
+    kategori_etiketleri = dict(GelirGider.KATEGORI_SECENEKLERI)
+    tip_etiketleri = dict(GelirGider.TIP_SECENEKLERI)
+
+    workbook = yazma_modunda_kitap()
+    worksheet = sayfa_olustur(
+        workbook,
+        "Gelir Gider Listesi",
+        ["Şube", "Tip", "Kategori", "Tutar", "Tarih", "Açıklama"],
+        genislikler=[20] * 6,
+    )
+    satirlar = filtre.queryset().values_list(
+        "sube__ad", "tip", "kategori", "tutar", "tarih", "aciklama"
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for sube_ad, tip, kategori, tutar, tarih, aciklama in satirlar:
+        worksheet.append(
+            [
+                sube_ad,
+                tip_etiketleri.get(tip, tip),
+                kategori_etiketleri.get(kategori, kategori),
+                tutar,
+                tarih,
+                aciklama,
+            ]
+        )
+    worksheet.append([])
+    worksheet.append(["Toplam Gelir", None, None, ozet["toplam_gelir"]])
+    worksheet.append(["Toplam Gider", None, None, ozet["toplam_gider"]])
+    worksheet.append(["Net Kar/Zarar", None, None, ozet["net_kar"]])
+    workbook.save(hedef)
+    return f"Gelir_Gider_Detay_{timezone.now().strftime('%Y-%m-%d')}.xlsx"
+
+
+def mesai_excel_yaz(params, hedef):
+    """Mesai listesini ve personel bazında özetini .xlsx olarak yazar."""
+    filtre = MesaiFiltresi(params)
+    if not filtre.ozet()["kayit_sayisi"]:
+        raise BosRaporHatasi("Dışa aktarılacak mesai verisi bulunamadı.")
+
+    df = pd.DataFrame.from_records(
+        filtre.queryset().values(
+            "personel__ad",
+            "personel__soyad",
+            "personel__sube__ad",
+            "tarih",
+            "saat",
+            "aciklama",
+        )
+    )
+    df["Personel"] = df["personel__ad"] + " " + df["personel__soyad"]
+    df = df.rename(
+        columns={
+            "personel__sube__ad": "Şube",
+            "tarih": "Tarih",
+            "saat": "Saat",
+            "aciklama": "Açıklama",
+        }
+    )
+    df = df[["Personel", "Şube", "Tarih", "Saat", "Açıklama"]]
+
+    personel_ozet = df.groupby("Personel")["Saat"].sum().reset_index()
+    personel_ozet = personel_ozet.rename(columns={"Saat": "Toplam Mesai Saati"})
+    personel_ozet = personel_ozet.sort_values(by="Toplam Mesai Saati", ascending=False)
+
+    with pd.ExcelWriter(hedef, engine="openpyxl") as writer:
+        personel_ozet.to_excel(writer, sheet_name="Personel Mesai Özeti", index=False)
+        df.to_excel(writer, sheet_name="Tüm Mesai Kayıtları", index=False)
+
+        ozet_sheet = writer.sheets["Personel Mesai Özeti"]
+        detay_sheet = writer.sheets["Tüm Mesai Kayıtları"]
+
+        header_font = Font(bold=True)
+        for cell in ozet_sheet["1:1"]:
+            cell.font = header_font
+        for cell in detay_sheet["1:1"]:
+            cell.font = header_font
+
+        ozet_sheet.column_dimensions["A"].width = 30
+        ozet_sheet.column_dimensions["B"].width = 25
+
+        detay_sheet.column_dimensions["A"].width = 30
+        detay_sheet.column_dimensions["B"].width = 20
+        detay_sheet.column_dimensions["C"].width = 15
+        detay_sheet.column_dimensions["D"].width = 10
+        detay_sheet.column_dimensions["E"].width = 40
+
+    return f"Mesai_Raporu_{filtre.get('year')}-{filtre.get('month')}.xlsx"
+
+
+# --- Yazdırma raporları: şablon bağlamını üretir ---
+
+
+def personel_yazdir_baglami(params):
+    personeller = PersonelFiltresi(params).queryset().mesai_toplamlari()
+    return {"personeller": personeller}
+
+
+def mesai_yazdir_baglami(params):
+    filtre = MesaiFiltresi(params)
+    return {"mesailer": filtre.queryset(), "current_date": filtre.ay_baslangici}
+
+
+def gelir_gider_yazdir_baglami(params):
+    filtre = GelirGiderFiltresi(params)
+    return {
+        "gelir_giderler": filtre.queryset(),
+        "ozet": filtre.ozet(),
+        "baslangic": filtre.get("baslangic"),
+        "bitis": filtre.get("bitis"),
+    }
+
+
+def _yazdir_raporu(sablon, baglam_ureticisi, dosya_adi):
+    def yaz(params, hedef):
+        html = render_to_string(sablon, baglam_ureticisi(params))
+        hedef.write(html.encode("utf-8"))
+        return dosya_adi
+
+    return yaz
+
+
+# Arka plan işlerinin çalıştırabildiği raporlar: ad -> (gerekli izin, yazıcı).
+# Adlar DisaAktarimIsi.RAPOR_SECENEKLERI ile aynı olmalıdır.
+RAPORLAR = {
+    "personel_excel": ("yonetim.view_personel", personel_excel_yaz),
+    "gelir_gider_excel": ("yonetim.view_gelirgider", gelir_gider_excel_yaz),
+    "mesai_excel": ("yonetim.view_mesai", mesai_excel_yaz),
+    "personel_yazdir": (
+        "yonetim.view_personel",
+        _yazdir_raporu(
+            "yonetim/personel_listesi_print.html",
+            personel_yazdir_baglami,
+            "personel_listesi.html",
+        ),
+    ),
+    "mesai_yazdir": (
+        "yonetim.view_mesai",
+        _yazdir_raporu(
+            "yonetim/mesai_listesi_print.html",
+            mesai_yazdir_baglami,
+            "mesai_listesi.html",
+        ),
+    ),
+    "gelir_gider_yazdir": (
+        "yonetim.view_gelirgider",
+        _yazdir_raporu(
+            "yonetim/gelir_gider_listesi_print.html",
+            gelir_gider_yazdir_baglami,
+            "gelir_gider_listesi.html",
+        ),
+    ),
+}
+
+
+# Veri yazan, yalnızca sunucu tarafında kuyruğa alınan işler. Parametreleri
+# (ör. yüklenen dosyanın yolu) kullanıcıdan gelmediğinden ``disa_aktarim_baslat``
+# ile başlatılamazlar; okumaları da birincilden yapılır.
+YAZAN_ISLER = {
+    "gelir_gider_ice_aktarim": ("yonetim.add_gelirgider", ice_aktarim_isi),
+}
+
+
+def isi_calistir(is_):
+    """Sıradan alınmış bir DisaAktarimIsi'ni çalıştırıp sonucunu kaydeder."""
+    if is_.rapor in YAZAN_ISLER:
+        _, yazici = YAZAN_ISLER[is_.rapor]
+        baglam = nullcontext()
+    else:
+        _, yazici = RAPORLAR[is_.rapor]
+        # Rapor yalnızca okur; replika tanımlıysa birincili yormasın
+        baglam = replikadan_oku()
+    dosya = tempfile.SpooledTemporaryFile(max_size=BELLEK_ESIGI)
+    try:
+        with baglam:
+            dosya_adi = yazici(is_.parametreler, dosya)
+    except (BosRaporHatasi, IceAktarimHatasi) as e:
+        is_.hatali_bitir(str(e))
+        return is_
+    except Exception as e:
+        is_.hatali_bitir(f"Beklenmeyen hata: {e}")
+        raise
+    dosya.seek(0)
+    is_.basariyla_bitir(dosya_adi, File(dosya))
+    return is_
@@ -0,0 +1,72 @@
+"""Kullanıcı rol (grup) ve izinlerinin istekler arası önbelleği.
+
+Her sayfa render'ında ``request.user.groups.filter(...).exists()`` ve
+``permission_required`` için izin sorguları çalışmasın diye kullanıcının grup
+adları ve izinleri Django önbelleğinde tutulur. Grup üyeliği, grup izinleri
+veya kullanıcı izinleri değiştiğinde ``signals.py`` ilgili kaydı siler ya da
+tüm rol önbelleğinin sürümünü artırır.
+
+Bu geçersiz kılmalar yalnızca paylaşılan bir önbellekte tüm süreçlere ulaşır.
+Süreç içi önbellekte başka bir worker'da ya da ``setup_roles`` ile geri alınan
+bir izin ``ROL_ONBELLEK_SURESI`` boyunca çalışmaya devam ederdi; bu yüzden
+``ONBELLEK_PAYLASIMLI`` kapalıyken roller yalnızca istek boyunca saklanır.
+"""
+
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from . import onbellek
+
+SUBE_MUDURU = "Şube Müdürü"
+
+ROL_ONBELLEK_SURESI = 60 * 60
+_SURUM_ANAHTARI = "yonetim:roller:surum"
+
+
+def _anahtar(kullanici_id):
+    surum = cache.get_or_set(_SURUM_ANAHTARI, 1, timeout=None)
+    return f"yonetim:roller:{surum}:{kullanici_id}"
+
+
+def kullanici_rolleri(user):
+    """Kullanıcının ``{"gruplar": [...], "izinler": [...]}`` kaydını döner.
+
+    Sonuç istek boyunca kullanıcı nesnesinde, paylaşılan önbellek varsa
+    istekler arasında da önbellekte saklanır; yoksa iki sorguyla yeniden
+    hesaplanır.
+    """
+    if not hasattr(user, "_yonetim_roller"):
+        paylasimli = onbellek.paylasimli()
+        anahtar = _anahtar(user.pk) if paylasimli else None
+        roller = cache.get(anahtar) if paylasimli else None
+        if roller is None:
+            roller = {
+                "gruplar": sorted(user.groups.values_list("name", flat=True)),
+                "izinler": sorted(ModelBackend().get_all_permissions(user)),
+            }
+            if paylasimli:
+                cache.set(anahtar, roller, ROL_ONBELLEK_SURESI)
+        user._yonetim_roller = roller
+    return user._yonetim_roller
+
+
+def rolu_var_mi(user, grup_adi):
+    if not user.is_authenticated:
+        return False
+    return grup_adi in kullanici_rolleri(user)["gruplar"]
+
+
+def sube_muduru_mu(user):
+    return rolu_var_mi(user, SUBE_MUDURU)
+
+
+def kullanici_onbellegini_sil(kullanici_id):
+    cache.delete(_anahtar(kullanici_id))
+
+
+def tum_rolleri_gecersiz_kil():
+    """Grup tanımları veya izinleri değiştiğinde tüm kullanıcı kayıtlarını eskitir."""
+    try:
+        cache.incr(_SURUM_ANAHTARI)
+    except ValueError:
+        cache.set(_SURUM_ANAHTARI, 2, timeout=None)
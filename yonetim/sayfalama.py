@@ -0,0 +1,197 @@
+"""İmleç (keyset) tabanlı sayfalama.
+
+Django'nun ``Paginator``'ı her istekte filtrelenmiş sorgu üzerinde ``COUNT(*)``
+çalıştırır ve derin sayfalarda ``OFFSET`` giderek yavaşlar. Buradaki
+sayfalayıcı ise son görülen satırın sıralama değerlerini (ör. ``tarih, id``)
+imzalı, opak bir imlece koyar ve bir sonraki sayfayı
+``WHERE (tarih, id) < (...) ORDER BY ... LIMIT n`` biçiminde okur; böylece
+N. sayfa da 1. sayfa kadar ucuzdur.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core import signing
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+
+VARSAYILAN_SAYFA_BOYUTU = 15
+SAYFA_BOYUTU_UST_SINIRI = 100
+
+_IMLEC_SALT = "yonetim.sayfalama.imlec"
+
+
+def sayfa_boyutu(deger, varsayilan=VARSAYILAN_SAYFA_BOYUTU):
+    """Sorgu dizesinden gelen sayfa boyutunu doğrular ve üst sınıra kırpar."""
+    try:
+        boyut = int(deger)
+    except (TypeError, ValueError):
+        return varsayilan
+    return max(1, min(boyut, SAYFA_BOYUTU_UST_SINIRI))
+
+
+def imlec_modu(request):
+    return request.GET.get("sayfalama") == "imlec" or "imlec" in request.GET
+
+
+def tahmini_kayit_sayisi(queryset):
+    """PostgreSQL planlayıcı istatistiklerinden tahmini satır sayısını döner.
+
+    Sorguyu çalıştırmaz, yalnızca ``EXPLAIN`` eder; diğer veritabanlarında ``None``.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class SayisiBilinenPaginator(Paginator):
+    """Toplam kayıt sayısı başka bir sorguda zaten hesaplanmışsa ``COUNT(*)`` atlar."""
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._bilinen_sayi = count
+
+    @property
+    def count(self):
+        return self._bilinen_sayi
+
+
+def _deger_kodla(deger):
+    if isinstance(deger, (date, datetime)):
+        return deger.isoformat()
+    if isinstance(deger, Decimal):
+        return str(deger)
+    return deger
+
+
+class ImlecSayfasi:
+    def __init__(self, object_list, has_previous, has_next, onceki_imlec, sonraki_imlec):
+        self.object_list = object_list
+        self._has_previous = has_previous
+        self._has_next = has_next
+        self.onceki_imlec = onceki_imlec
+        self.sonraki_imlec = sonraki_imlec
+        self.tahmini_toplam = None
+        self.onceki_sorgu = ""
+        self.sonraki_sorgu = ""
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_next(self):
+        return self._has_next
+
+    def has_other_pages(self):
+        return self._has_previous or self._has_next
+
+
+class ImlecSayfalayici:
+    """``siralama`` alanlarına göre imleçle sayfalama yapar.
+
+    Sıralamanın benzersiz olması için son alan birincil anahtar olmalıdır,
+    ör. ``("-tarih", "-id")``.
+    """
+
+    def __init__(self, queryset, siralama, per_page=VARSAYILAN_SAYFA_BOYUTU):
+        self.queryset = queryset
+        self.siralama = tuple(siralama)
+        self.per_page = per_page
+        self.alanlar = [alan.lstrip("-") for alan in self.siralama]
+        self.azalan = [alan.startswith("-") for alan in self.siralama]
+
+    def imlec_olustur(self, nesne, yon):
+        degerler = [_deger_kodla(getattr(nesne, alan)) for alan in self.alanlar]
+        return signing.dumps({"d": degerler, "y": yon}, salt=_IMLEC_SALT, compress=True)
+
+    def imleci_coz(self, imlec):
+        """Geçersiz veya kurcalanmış imleçler için ``None`` döner (ilk sayfa)."""
+        try:
+            veri = signing.loads(imlec, salt=_IMLEC_SALT)
+        except signing.BadSignature:
+            return None
+        if (
+            not isinstance(veri, dict)
+            or veri.get("y") not in ("s", "o")
+            or len(veri.get("d") or []) != len(self.alanlar)
+        ):
+            return None
+        return veri["d"], veri["y"]
+
+    def _sonrasi(self, degerler, ters=False):
+        """Sıralamada ``degerler``den sonra (ters ise önce) gelen satırların koşulu."""
+        kosul = Q()
+        esitler = {}
+        for alan, azalan, deger in zip(self.alanlar, self.azalan, degerler):
+            kucuk = azalan != ters
+            kosul |= Q(**esitler, **{f"{alan}__{'lt' if kucuk else 'gt'}": deger})
+            esitler[alan] = deger
+        return kosul
+
+    def get_page(self, imlec=None):
+        cozulen = self.imleci_coz(imlec) if imlec else None
+
+        if cozulen and cozulen[1] == "o":
+            ters_siralama = [
+                alan[1:] if alan.startswith("-") else f"-{alan}" for alan in self.siralama
+            ]
+            satirlar = list(
+                self.queryset.filter(self._sonrasi(cozulen[0], ters=True)).order_by(
+                    *ters_siralama
+                )[: self.per_page + 1]
+            )
+            has_previous = len(satirlar) > self.per_page
+            satirlar = satirlar[: self.per_page][::-1]
+            has_next = True
+        else:
+            qs = self.queryset
+            if cozulen:
+                qs = qs.filter(self._sonrasi(cozulen[0]))
+            satirlar = list(qs.order_by(*self.siralama)[: self.per_page + 1])
+            has_next = len(satirlar) > self.per_page
+            satirlar = satirlar[: self.per_page]
+            has_previous = cozulen is not None
+
+        return ImlecSayfasi(
+            satirlar,
+            has_previous=has_previous and bool(satirlar),
+            has_next=has_next and bool(satirlar),
+            onceki_imlec=self.imlec_olustur(satirlar[0], "o") if satirlar else None,
+            sonraki_imlec=self.imlec_olustur(satirlar[-1], "s") if satirlar else None,
+        )
+
+
+def imlec_sayfasi(request, queryset, siralama, per_page, tahmini_sayim=True):
+    """İstekteki ``imlec`` parametresine göre sayfayı ve gezinme sorgu dizelerini hazırlar."""
+    sayfa = ImlecSayfalayici(queryset, siralama, per_page).get_page(
+        request.GET.get("imlec")
+    )
+
+    def sorgu(imlec):
+        params = request.GET.copy()
+        params.pop("page", None)
+        params["sayfalama"] = "imlec"
+        params["imlec"] = imlec
+        return params.urlencode()
+
+    if sayfa.has_previous():
+        sayfa.onceki_sorgu = sorgu(sayfa.onceki_imlec)
+    if sayfa.has_next():
+        sayfa.sonraki_sorgu = sorgu(sayfa.sonraki_imlec)
+    if tahmini_sayim:
+        sayfa.tahmini_toplam = tahmini_kayit_sayisi(queryset)
+    return sayfa
@@ -1 +1,261 @@
-# Bu dosya artık kullanılmamaktadır.
+from collections import defaultdict
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, pre_delete, pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from . import onbellek
+from .models import GelirGider, Mesai, Personel, PersonelAylikMesai, Sube, SubeAylikOzet
+from .roller import kullanici_onbellegini_sil, tum_rolleri_gecersiz_kil
+
+User = get_user_model()
+
+
+@receiver(pre_save, sender=GelirGider)
+def gelir_gider_eski_kovayi_hatirla(sender, instance, raw=False, **kwargs):
+    """Güncellemede kaydın önceki (şube, ay, tip) kovasını ve tutarını saklar."""
+    instance._eski_ozet_kovasi = None
+    instance._eski_tutar = None
+    if raw or not instance.pk:
+        return
+    eski = (
+        GelirGider.objects.filter(pk=instance.pk)
+        .values_list("sube_id", "tarih", "tip", "tutar")
+        .first()
+    )
+    if eski:
+        instance._eski_ozet_kovasi = (eski[0], SubeAylikOzet.ay_baslangici(eski[1]), eski[2])
+        instance._eski_tutar = eski[3]
+
+
+def _kova_farki_ekle(farklar, kova, tutar, adet):
+    eski_tutar, eski_adet = farklar.get(kova, (Decimal("0.00"), 0))
+    farklar[kova] = (eski_tutar + tutar, eski_adet + adet)
+
+
+@receiver(post_save, sender=GelirGider)
+def gelir_gider_kaydedildi(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    tutar = Decimal(instance.tutar)
+    yeni_kova = (
+        instance.sube_id,
+        SubeAylikOzet.ay_baslangici(instance.tarih),
+        instance.tip,
+    )
+    eski_kova = getattr(instance, "_eski_ozet_kovasi", None)
+
+    # Özet kovaları ve şube sayaçları: eski tutar düşülür, yeni tutar eklenir
+    ozet_farklari = {}
+    farklar = defaultdict(Decimal)
+    if eski_kova:
+        eski_sube_id, _, eski_tip = eski_kova
+        _kova_farki_ekle(ozet_farklari, eski_kova, -instance._eski_tutar, -1)
+        farklar[eski_sube_id, eski_tip] -= instance._eski_tutar
+    _kova_farki_ekle(ozet_farklari, yeni_kova, tutar, 1)
+    farklar[instance.sube_id, instance.tip] += tutar
+    SubeAylikOzet.farklari_ekle(ozet_farklari)
+    for (sube_id, tip), fark in farklar.items():
+        Sube.sayaclari_degistir(sube_id, **{tip: fark})
+    onbellek.gecmis_yazildi(sender, instance.tarih, eski_kova and eski_kova[1])
+
+
+def gelir_gider_silindi(sender, satirlar):
+    ozet_farklari = {}
+    farklar = defaultdict(lambda: defaultdict(Decimal))
+    for satir in satirlar:
+        kova = (satir.sube_id, SubeAylikOzet.ay_baslangici(satir.tarih), satir.tip)
+        _kova_farki_ekle(ozet_farklari, kova, -Decimal(satir.tutar), -1)
+        farklar[satir.sube_id][satir.tip] -= Decimal(satir.tutar)
+    SubeAylikOzet.farklari_ekle(ozet_farklari)
+    for sube_id, fark in farklar.items():
+        Sube.sayaclari_degistir(sube_id, **fark)
+    onbellek.gecmis_yazildi(sender, min(satir.tarih for satir in satirlar))
+
+
+@receiver(pre_save, sender=Personel)
+def personel_eski_subeyi_hatirla(sender, instance, raw=False, **kwargs):
+    instance._eski_sube_id = None
+    if raw or not instance.pk:
+        return
+    instance._eski_sube_id = (
+        Personel.objects.filter(pk=instance.pk).values_list("sube_id", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Personel)
+def personel_kaydedildi(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    eski_sube_id = getattr(instance, "_eski_sube_id", None)
+    if eski_sube_id == instance.sube_id:
+        return
+    if eski_sube_id is not None:
+        Sube.sayaclari_degistir(eski_sube_id, personel=-1)
+    Sube.sayaclari_degistir(instance.sube_id, personel=1)
+
+
+def personel_silindi(sender, satirlar):
+    adetler = defaultdict(int)
+    for satir in satirlar:
+        adetler[satir.sube_id] += 1
+    for sube_id, adet in adetler.items():
+        Sube.sayaclari_degistir(sube_id, personel=-adet)
+
+
+@receiver(pre_save, sender=Mesai)
+def mesai_eski_kovayi_hatirla(sender, instance, raw=False, **kwargs):
+    """Güncellemede mesainin önceki (personel, ay) kovasını ve saatini saklar."""
+    instance._eski_ozet_kovasi = None
+    instance._eski_saat = None
+    if raw or not instance.pk:
+        return
+    eski = (
+        Mesai.objects.filter(pk=instance.pk)
+        .values_list("personel_id", "tarih", "saat")
+        .first()
+    )
+    if eski:
+        instance._eski_ozet_kovasi = (eski[0], PersonelAylikMesai.ay_baslangici(eski[1]))
+        instance._eski_saat = eski[2]
+
+
+@receiver(post_save, sender=Mesai)
+def mesai_kaydedildi(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    yeni_kova = (instance.personel_id, PersonelAylikMesai.ay_baslangici(instance.tarih))
+    eski_kova = getattr(instance, "_eski_ozet_kovasi", None)
+    farklar = {}
+    if eski_kova:
+        _kova_farki_ekle(farklar, eski_kova, -instance._eski_saat, -1)
+    _kova_farki_ekle(farklar, yeni_kova, Decimal(instance.saat), 1)
+    PersonelAylikMesai.farklari_ekle(farklar)
+    onbellek.gecmis_yazildi(sender, instance.tarih, eski_kova and eski_kova[1])
+
+
+def mesai_silindi(sender, satirlar):
+    farklar = {}
+    for satir in satirlar:
+        kova = (satir.personel_id, PersonelAylikMesai.ay_baslangici(satir.tarih))
+        _kova_farki_ekle(farklar, kova, -Decimal(satir.saat), -1)
+    PersonelAylikMesai.farklari_ekle(farklar)
+    onbellek.gecmis_yazildi(sender, min(satir.tarih for satir in satirlar))
+
+
+# --- Silmeler: silme işlemi başına tek güncelleme ---
+#
+# Django silinen her satır için ayrı pre_delete/post_delete gönderir; satır
+# başına özet ve sayaç güncellemek binlerce satırlık bir şube silmede binlerce
+# sorgu demektir. Bu yüzden satırlar pre_delete'te silmenin başladığı nesneye
+# (``origin``: model nesnesi ya da QuerySet) model başına toplanır ve o modelin
+# ilk post_delete'inde tek seferde işlenir: kovalara ve sayaçlara silinen
+# satırların farkları eklenir; hepsi silme transaction'ının içindedir.
+#
+# Üst kayıt da siliniyorsa (şube silinirken kayıtları, personel silinirken
+# mesaileri) özet satırları CASCADE ile, sayaçlar şubeyle birlikte gider;
+# güncelleme tamamen atlanır.
+
+SILME_ISLEYICILERI = {
+    GelirGider: gelir_gider_silindi,
+    Personel: personel_silindi,
+    Mesai: mesai_silindi,
+}
+UST_MODELLER = {
+    GelirGider: (Sube,),
+    Personel: (Sube,),
+    Mesai: (Sube, Personel),
+}
+
+
+class _SilmeKuyrugu(dict):
+    """pk -> silinecek satır; model başına bir kez işlenir."""
+
+    islendi = False
+
+
+def _silme_kuyrugu(sender, instance, origin, yeni=False):
+    sahip = instance if origin is None else origin
+    kuyruklar = sahip.__dict__.setdefault("_silme_kuyruklari", {})
+    kuyruk = kuyruklar.get(sender)
+    if yeni and (kuyruk is None or kuyruk.islendi):
+        kuyruk = kuyruklar[sender] = _SilmeKuyrugu()
+    return kuyruk
+
+
+def _ust_kayit_siliniyor(sender, origin):
+    if origin is None:
+        return False
+    kaynak = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return kaynak in UST_MODELLER.get(sender, ())
+
+
+def silinecek_satiri_kuyruga_ekle(sender, instance, origin=None, **kwargs):
+    _silme_kuyrugu(sender, instance, origin, yeni=True)[instance.pk] = instance
+
+
+def satirlar_silindi(sender, instance, origin=None, **kwargs):
+    kuyruk = _silme_kuyrugu(sender, instance, origin)
+    if kuyruk is None or kuyruk.islendi:
+        return
+    kuyruk.islendi = True
+    isleyici = SILME_ISLEYICILERI.get(sender)
+    if isleyici and not _ust_kayit_siliniyor(sender, origin):
+        isleyici(sender, list(kuyruk.values()))
+    onbellek.model_yazildi(sender)
+
+
+# --- Şablon parçası ve filtre sonucu önbelleklerinin geçersiz kılınması ---
+
+
+def onbellekleri_gecersiz_kil(sender, raw=False, **kwargs):
+    if raw:
+        return
+    onbellek.model_yazildi(sender)
+
+
+for _model in (GelirGider, Personel, Sube, Mesai):
+    post_save.connect(onbellekleri_gecersiz_kil, sender=_model)
+    pre_delete.connect(silinecek_satiri_kuyruga_ekle, sender=_model)
+    post_delete.connect(satirlar_silindi, sender=_model)
+
+
+# --- Rol/izin önbelleğinin geçersiz kılınması (bkz. roller.py) ---
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def kullanici_yetkileri_degisti(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        kullanici_onbellegini_sil(instance.pk)
+    elif pk_set:
+        for kullanici_id in pk_set:
+            kullanici_onbellegini_sil(kullanici_id)
+    else:
+        # group.user_set.clear(): etkilenen kullanıcılar bilinmiyor
+        tum_rolleri_gecersiz_kil()
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def grup_izinleri_degisti(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        tum_rolleri_gecersiz_kil()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def grup_degisti(sender, **kwargs):
+    tum_rolleri_gecersiz_kil()
+
+
+@receiver(post_save, sender=User)
+def kullanici_kaydedildi(sender, instance, created, update_fields=None, **kwargs):
+    # is_active / is_superuser değişmiş olabilir; girişteki last_login kaydı hariç
+    if created or update_fields == frozenset({"last_login"}):
+        return
+    kullanici_onbellegini_sil(instance.pk)
@@ -1,11 +1,43 @@
-from django.test import TestCase, Client
+import asyncio
+import tempfile
+import time
+from unittest import mock, skipUnless
+from asgiref.sync import iscoroutinefunction
+from datetime import date, timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.conf import settings
+from django.db import DatabaseError, connection, connections, transaction
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from openpyxl import load_workbook
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import (
+    TestCase, TransactionTestCase, SimpleTestCase, Client, RequestFactory, override_settings,
+)
 from django.urls import reverse
-from yonetim.models import Sube
+from yonetim.models import (
+    Sube, Personel, GelirGider, Mesai, SubeAylikOzet, PersonelAylikMesai, DisaAktarimIsi,
+)
+from yonetim.arama import turkce_katla
+from yonetim.filtreler import GelirGiderFiltresi, MesaiFiltresi
+from yonetim.roller import sube_muduru_mu
+from yonetim.middleware import SorguButcesiMiddleware, sorgu_kalibi
+from yonetim.sayfalama import ImlecSayfalayici, SAYFA_BOYUTU_UST_SINIRI, sayfa_boyutu
+from yonetim import onbellek, veritabani
 
 
 class YonetimViewsTestCase(TestCase):
     def setUp(self):
         """Her test öncesi çalışacak başlangıç kurulumu."""
+        cache.clear()
         self.client = Client()
         self.sube_data = {
             "ad": "Test Şube",
@@ -64,4 +96,1952 @@ class YonetimViewsTestCase(TestCase):
         self.sube.delete()
         self.assertEqual(Sube.objects.count(), 0)
         with self.assertRaises(Sube.DoesNotExist):
-            Sube.objects.get(ad="Test Şube")
\ No newline at end of file
+            Sube.objects.get(ad="Test Şube")
+
+class SubeAylikOzetTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cafe = Sube.objects.create(
+            ad="Cafe Şube", tur="cafe", adres="Adres", telefon="1", yonetici="Y"
+        )
+        self.otel = Sube.objects.create(
+            ad="Otel Şube", tur="otel", adres="Adres", telefon="2", yonetici="Y"
+        )
+        self.user = User.objects.create_user("patron", password="sifre12345")
+
+    def _kayit(self, sube, tip, tutar, tarih):
+        return GelirGider.objects.create(
+            sube=sube, tip=tip, tutar=Decimal(tutar), tarih=tarih
+        )
+
+    def test_ozet_kayit_guncelleme_ve_silmede_guncel_kalir(self):
+        """Özet tablosu GelirGider kayıt/güncelleme/silme işlemlerini izler."""
+        kayit = self._kayit(self.cafe, "gelir", "100.00", date(2025, 1, 10))
+        self._kayit(self.cafe, "gelir", "50.00", date(2025, 1, 20))
+
+        ozet = SubeAylikOzet.objects.get(sube=self.cafe, ay=date(2025, 1, 1), tip="gelir")
+        self.assertEqual(ozet.toplam, Decimal("150.00"))
+        self.assertEqual(ozet.kayit_sayisi, 2)
+
+        # Kaydı başka bir aya ve şubeye taşı: eski ve yeni kova güncellenmeli
+        kayit.sube = self.otel
+        kayit.tarih = date(2025, 2, 5)
+        kayit.save()
+        ozet.refresh_from_db()
+        self.assertEqual(ozet.toplam, Decimal("50.00"))
+        self.assertTrue(
+            SubeAylikOzet.objects.filter(
+                sube=self.otel, ay=date(2025, 2, 1), tip="gelir", toplam=Decimal("100.00")
+            ).exists()
+        )
+
+        kayit.delete()
+        self.assertFalse(
+            SubeAylikOzet.objects.filter(sube=self.otel, ay=date(2025, 2, 1)).exists()
+        )
+
+    def test_kova_yeniden_toplanmaz_fark_eklenir(self):
+        """Eşzamanlı bir yazmanın kovaya eklediği tutar sonraki yazmada ezilmez."""
+        self._kayit(self.cafe, "gelir", "100.00", date(2025, 1, 10))
+        kova = SubeAylikOzet.objects.filter(sube=self.cafe, ay=date(2025, 1, 1), tip="gelir")
+        # Başka bir transaction'ın henüz görünmeyen kaydının farkı
+        kova.update(toplam=F("toplam") + 50, kayit_sayisi=F("kayit_sayisi") + 1)
+
+        with CaptureQueriesContext(connection) as sorgular:
+            kayit = self._kayit(self.cafe, "gelir", "25.00", date(2025, 1, 11))
+        self.assertFalse(any("SUM(" in q["sql"].upper() for q in sorgular))
+        self.assertEqual(kova.get().toplam, Decimal("175.00"))
+
+        kayit.tutar = Decimal("40.00")
+        kayit.save()
+        self.assertEqual((kova.get().toplam, kova.get().kayit_sayisi), (Decimal("190.00"), 3))
+
+    def test_yeniden_olusturma_kaynak_tablo_ile_ayni(self):
+        self._kayit(self.cafe, "gelir", "100.00", date(2025, 1, 10))
+        self._kayit(self.cafe, "gider", "30.00", date(2025, 1, 11))
+        self._kayit(self.otel, "gelir", "70.00", date(2025, 3, 1))
+        SubeAylikOzet.objects.all().delete()
+
+        call_command("rebuild_aylik_ozet", stdout=StringIO())
+
+        self.assertEqual(SubeAylikOzet.objects.count(), 3)
+        self.assertEqual(
+            SubeAylikOzet.objects.get(sube=self.cafe, tip="gider").toplam,
+            Decimal("30.00"),
+        )
+
+    def test_ana_sayfa_toplamlari_ozet_tablosundan_okur(self):
+        self._kayit(self.cafe, "gelir", "100.00", date(2025, 1, 10))
+        self._kayit(self.cafe, "gider", "30.00", date(2025, 1, 11))
+        self._kayit(self.otel, "gelir", "70.00", date(2025, 2, 1))
+        Personel.objects.create(
+            sube=self.cafe, ad="A", soyad="B", pozisyon="Garson",
+            ise_baslama_tarihi=date(2024, 1, 1), telefon="3",
+        )
+        self.client.force_login(self.user)
+
+        with CaptureQueriesContext(connection) as sorgular:
+            response = self.client.get(reverse("yonetim:ana_sayfa"), {"year": 2025, "month": 1})
+
+        # Şube özeti + tür toplamları; GelirGider tablosu hiç taranmamalı
+        yonetim_sorgulari = [q["sql"] for q in sorgular if "yonetim_" in q["sql"]]
+        self.assertEqual(len(yonetim_sorgulari), 2)
+        self.assertFalse(any("yonetim_gelirgider" in sql for sql in yonetim_sorgulari))
+
+        self.assertEqual(response.status_code, 200)
+        ctx = response.context["istatistik"]
+        self.assertEqual(ctx["toplam_gelir"], Decimal("170.00"))
+        self.assertEqual(ctx["cafe_net"], Decimal("70.00"))
+        self.assertEqual(ctx["otel_gelir"], Decimal("70.00"))
+        self.assertEqual(ctx["cafe_personel"], 1)
+        self.assertEqual(ctx["otel_sube_sayisi"], 1)
+        ozetler = {s.ad: s for s in ctx["sube_ozetleri"]}
+        self.assertEqual(ozetler["Cafe Şube"].aylik_net_kar, Decimal("70.00"))
+        self.assertEqual(ozetler["Otel Şube"].aylik_gelir, Decimal("0.00"))
+
+
+class GelirGiderOzetiTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.sube = Sube.objects.create(
+            ad="Şube", tur="cafe", adres="Adres", telefon="1", yonetici="Y"
+        )
+        for tip, tutar in [("gelir", "100.00"), ("gelir", "25.50"), ("gider", "40.00")]:
+            GelirGider.objects.create(
+                sube=self.sube, tip=tip, tutar=Decimal(tutar), tarih=date(2025, 1, 1)
+            )
+
+    def test_ozet_tek_sorguda_hesaplanir(self):
+        with self.assertNumQueries(1):
+            ozet = GelirGider.objects.filter(sube=self.sube).ozet()
+        self.assertEqual(ozet["kayit_sayisi"], 3)
+        self.assertEqual(ozet["toplam_gelir"], Decimal("125.50"))
+        self.assertEqual(ozet["toplam_gider"], Decimal("40.00"))
+        self.assertEqual(ozet["net_kar"], Decimal("85.50"))
+
+    def test_bos_sorguda_sifir_doner(self):
+        ozet = GelirGider.objects.filter(tip="yok").ozet()
+        self.assertEqual(ozet["kayit_sayisi"], 0)
+        self.assertEqual(ozet["net_kar"], Decimal("0.00"))
+
+    def test_liste_toplamlari_tek_tarama_ile_hesaplar(self):
+        user = User.objects.create_superuser("muhasebe", password="sifre12345")
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as sorgular:
+            response = self.client.get(reverse("yonetim:gelir_gider_listesi"))
+        self.assertEqual(response.context["net_kar"], Decimal("85.50"))
+        self.assertEqual(response.context["page_obj"].paginator.count, 3)
+        # Özet sorgusu + sayfa satırları; ayrı COUNT(*) veya tip başına toplam yok
+        defter_sorgulari = [q for q in sorgular if 'FROM "yonetim_gelirgider"' in q["sql"]]
+        self.assertEqual(len(defter_sorgulari), 2)
+
+
+@skipUnless(connection.vendor == "postgresql", "Planlar PostgreSQL'e göre yazıldı")
+class SorguIndeksleriTestCase(TestCase):
+    """Sıcak liste sorgularının EXPLAIN çıktısında beklenen indeksleri kullandığını doğrular."""
+
+    def setUp(self):
+        cache.clear()
+        self.sube = Sube.objects.create(
+            ad="Şube", tur="cafe", adres="Adres", telefon="1", yonetici="Y"
+        )
+        self.personel = Personel.objects.create(
+            sube=self.sube, ad="A", soyad="B", pozisyon="Garson",
+            ise_baslama_tarihi=date(2024, 1, 1), telefon="3",
+        )
+        # Küçük test tablolarında planlayıcı sıralı taramayı tercih eder
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assertIndeksKullanir(self, queryset, indeks_adi):
+        plan = queryset.explain()
+        self.assertIn(indeks_adi, plan, msg=plan)
+
+    def test_gelir_gider_listesi_sube_ve_tip_filtresi(self):
+        qs = GelirGider.objects.filter(
+            sube_id=self.sube.pk, tip="gelir",
+            tarih__gte=date(2025, 1, 1), tarih__lte=date(2025, 1, 31),
+        ).order_by("-tarih", "-id")
+        self.assertIndeksKullanir(qs, "gg_sube_tip_tarih_idx")
+
+    def test_gelir_gider_listesi_sube_filtresi(self):
+        qs = GelirGider.objects.filter(sube_id=self.sube.pk).order_by("-tarih", "-id")
+        self.assertIndeksKullanir(qs, "gg_sube_tarih_idx")
+
+    def test_gelir_gider_listesi_yalnizca_tip_filtresi(self):
+        qs = GelirGider.objects.filter(tip="gider").order_by("-tarih", "-id")
+        self.assertIndeksKullanir(qs, "gg_tip_tarih_idx")
+
+    def test_gelir_gider_listesi_filtresiz(self):
+        qs = GelirGider.objects.order_by("-tarih", "-id")
+        self.assertIndeksKullanir(qs, "gg_tarih_id_idx")
+
+    def test_mesai_listesi_personel_filtresi(self):
+        qs = Mesai.objects.filter(
+            personel_id=self.personel.pk,
+            tarih__gte=date(2025, 1, 1), tarih__lt=date(2025, 2, 1),
+        ).order_by("-tarih", "-saat")
+        self.assertIndeksKullanir(qs, "mesai_personel_tarih_idx")
+
+    def test_mesai_listesi_ay_araligi(self):
+        qs = Mesai.objects.filter(
+            tarih__gte=date(2025, 1, 1), tarih__lt=date(2025, 2, 1)
+        ).order_by("-tarih", "-saat")
+        self.assertIndeksKullanir(qs, "mesai_tarih_saat_idx")
+
+    def test_mesai_listesi_imlec_sayfasi(self):
+        qs = Mesai.objects.filter(
+            tarih__gte=date(2025, 1, 1), tarih__lt=date(2025, 2, 1)
+        ).order_by("-tarih", "-id")
+        self.assertIndeksKullanir(qs, "mesai_tarih_id_idx")
+
+
+class ExcelDisaAktarimTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.sube = Sube.objects.create(
+            ad="Şube", tur="cafe", adres="Adres", telefon="1", yonetici="Y"
+        )
+        self.user = User.objects.create_superuser("muhasebe", password="sifre12345")
+        self.client.force_login(self.user)
+
+    def _indirilen_kitap(self, response):
+        return load_workbook(BytesIO(b"".join(response.streaming_content)))
+
+    def test_gelir_gider_disa_aktarimi_akis_olarak_doner(self):
+        GelirGider.objects.create(
+            sube=self.sube, tip="gelir", tutar=Decimal("100.00"), tarih=date(2025, 1, 2)
+        )
+        GelirGider.objects.create(
+            sube=self.sube, tip="gider", tutar=Decimal("40.00"), tarih=date(2025, 1, 1)
+        )
+
+        response = self.client.get(reverse("yonetim:export_gelir_gider_excel"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn("attachment", response["Content-Disposition"])
+        satirlar = list(
+            self._indirilen_kitap(response)["Gelir Gider Listesi"].iter_rows(values_only=True)
+        )
+        self.assertEqual(satirlar[0], ("Şube", "Tip", "Kategori", "Tutar", "Tarih", "Açıklama"))
+        self.assertEqual(satirlar[1][:3], ("Şube", "Gelir", "NAKİT"))
+        self.assertEqual(satirlar[2][1], "Gider")
+        self.assertEqual(satirlar[-3][0], "Toplam Gelir")
+        self.assertEqual(satirlar[-1][:4], ("Net Kar/Zarar", None, None, 60))
+
+    def test_personel_disa_aktarimi_filtreli_satirlari_yazar(self):
+        diger = Sube.objects.create(
+            ad="Diğer", tur="otel", adres="Adres", telefon="2", yonetici="Y"
+        )
+        for sube, ad in [(self.sube, "Ayşe"), (self.sube, "Ali"), (diger, "Can")]:
+            Personel.objects.create(
+                sube=sube, ad=ad, soyad="Yılmaz", pozisyon="Garson",
+                ise_baslama_tarihi=date(2024, 1, 1), telefon="3",
+            )
+
+        response = self.client.get(
+            reverse("yonetim:export_personel_excel"), {"sube": self.sube.pk}
+        )
+
+        self.assertTrue(response.streaming)
+        satirlar = list(
+            self._indirilen_kitap(response)["Personel Listesi"].iter_rows(values_only=True)
+        )
+        self.assertEqual(satirlar[0][0], "Ad")
+        self.assertEqual([s[0] for s in satirlar[1:]], ["Ali", "Ayşe"])
+        self.assertEqual(satirlar[1][3], "Şube")
+
+    def test_gelir_gider_disa_aktarimi_bos_veride_yonlendirir(self):
+        response = self.client.get(reverse("yonetim:export_gelir_gider_excel"))
+        self.assertRedirects(response, reverse("yonetim:gelir_gider_listesi"), fetch_redirect_response=False)
+
+
+class DisaAktarimIsiTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        ayarlar = override_settings(MEDIA_ROOT=self.media.name)
+        ayarlar.enable()
+        self.addCleanup(ayarlar.disable)
+
+        self.sube = Sube.objects.create(
+            ad="Şube", tur="cafe", adres="Adres", telefon="1", yonetici="Y"
+        )
+        GelirGider.objects.create(
+            sube=self.sube, tip="gelir", tutar=Decimal("100.00"), tarih=date(2025, 1, 2)
+        )
+        self.user = User.objects.create_superuser("muhasebe", password="sifre12345")
+        self.client.force_login(self.user)
+
+    def test_is_kuyruga_eklenir_calisan_tarafindan_uretilir_ve_indirilir(self):
+        response = self.client.post(
+            reverse("yonetim:disa_aktarim_baslat", args=["gelir_gider_excel"])
+            + "?tip=gelir"
+        )
+        self.assertEqual(response.status_code, 202)
+        veri = response.json()
+        self.assertEqual(veri["durum"], "bekliyor")
+        self.assertEqual(DisaAktarimIsi.objects.get().parametreler, {"tip": "gelir"})
+
+        call_command("run_export_worker", "--tek-sefer", stdout=StringIO())
+
+        durum = self.client.get(veri["durum_url"]).json()
+        self.assertEqual(durum["durum"], "tamamlandi")
+        indirilen = self.client.get(durum["indir_url"])
+        self.assertEqual(indirilen.status_code, 200)
+        kitap = load_workbook(BytesIO(b"".join(indirilen.streaming_content)))
+        satirlar = list(kitap["Gelir Gider Listesi"].iter_rows(values_only=True))
+        self.assertEqual(satirlar[1][1], "Gelir")
+        self.assertEqual(satirlar[-1][3], 100)
+
+    def test_bos_rapor_hata_durumunda_biter(self):
+        self.client.post(
+            reverse("yonetim:disa_aktarim_baslat", args=["mesai_excel"])
+        )
+        call_command("run_export_worker", "--tek-sefer", stdout=StringIO())
+        is_ = DisaAktarimIsi.objects.get()
+        self.assertEqual(is_.durum, "hata")
+        self.assertIn("bulunamadı", is_.hata_mesaji)
+
+    def test_ayni_is_iki_kez_alinamaz(self):
+        DisaAktarimIsi.objects.create(kullanici=self.user, rapor="personel_excel")
+        self.assertIsNotNone(DisaAktarimIsi.siradakini_al())
+        self.assertIsNone(DisaAktarimIsi.siradakini_al())
+
+    def test_yalnizca_sinyali_kesilen_is_kuyruga_doner(self):
+        simdi = timezone.now()
+        uzun_suren, olen, eski = [
+            DisaAktarimIsi.objects.create(
+                kullanici=self.user, rapor="personel_excel", durum="calisiyor",
+                baslama_tarihi=simdi - timedelta(hours=2), son_sinyal=son_sinyal,
+            )
+            for son_sinyal in (simdi, simdi - timedelta(minutes=10), None)
+        ]
+        self.assertEqual(DisaAktarimIsi.takilanlari_kuyruga_al(timedelta(minutes=5)), 2)
+        durumlar = dict(DisaAktarimIsi.objects.values_list("id", "durum"))
+        self.assertEqual(durumlar[uzun_suren.pk], "calisiyor")
+        self.assertEqual(durumlar[olen.pk], "bekliyor")
+        self.assertEqual(durumlar[eski.pk], "bekliyor")
+
+        # Kuyruğa dönen işe eski çalışanın sinyali işlemez
+        self.assertTrue(DisaAktarimIsi.sinyal_ver(uzun_suren.pk))
+        self.assertFalse(DisaAktarimIsi.sinyal_ver(olen.pk))
+
+    def test_calisan_is_surdukce_sinyal_verir(self):
+        from yonetim.management.commands.run_export_worker import sinyal_verirken
+
+        with mock.patch.object(DisaAktarimIsi, "sinyal_ver") as sinyal_ver:
+            with sinyal_verirken(42, 0.01):
+                time.sleep(0.1)
+            sinyal_sayisi = sinyal_ver.call_count
+            time.sleep(0.05)
+        self.assertGreater(sinyal_sayisi, 1)
+        self.assertEqual(sinyal_ver.call_count, sinyal_sayisi)
+        sinyal_ver.assert_called_with(42)
+
+    def test_baska_kullanicinin_isi_gorulemez_ve_izin_kontrol_edilir(self):
+        is_ = DisaAktarimIsi.objects.create(kullanici=self.user, rapor="personel_excel")
+        diger = User.objects.create_user("mudur", password="sifre12345")
+        self.client.force_login(diger)
+
+        response = self.client.get(reverse("yonetim:disa_aktarim_durum", args=[is_.pk]))
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post(
+            reverse("yonetim:disa_aktarim_baslat", args=["gelir_gider_excel"])
+        )
+        self.assertEqual(response.status_code, 403)
+
+
+class ImlecSayfalamaTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.sube = Sube.objects.create(
+            ad="Şube", tur="cafe", adres="Adres", telefon="1", yonetici="Y"
+        )
+        # Aynı tarihte birden fazla kayıt: sıralama "id" ile benzersizleşmeli
+        for i in range(7):
+            GelirGider.objects.create(
+                sube=self.sube, tip="gelir", tutar=Decimal("10.00"),
+                tarih=date(2025, 1, 1 + i // 3),
+            )
+        self.beklenen = list(
+            GelirGider.objects.order_by("-tarih", "-id").values_list("id", flat=True)
+        )
+        self.user = User.objects.create_superuser("muhasebe", password="sifre12345")
+        self.client.force_login(self.user)
+
+    def test_ileri_ve_geri_gezinme_tekrarsiz_ve_eksiksiz(self):
+        sayfalayici = ImlecSayfalayici(GelirGider.objects.all(), ("-tarih", "-id"), 3)
+        sayfalar = [sayfalayici.get_page()]
+        while sayfalar[-1].has_next():
+            sayfalar.append(sayfalayici.get_page(sayfalar[-1].sonraki_imlec))
+
+        self.assertEqual([g.id for s in sayfalar for g in s], self.beklenen)
+        self.assertFalse(sayfalar[0].has_previous())
+
+        onceki = sayfalayici.get_page(sayfalar[-1].onceki_imlec)
+        self.assertEqual([g.id for g in onceki], [g.id for g in sayfalar[-2]])
+        self.assertTrue(onceki.has_next())
+
+    def test_kurcalanmis_imlec_ilk_sayfaya_doner(self):
+        sayfalayici = ImlecSayfalayici(GelirGider.objects.all(), ("-tarih", "-id"), 3)
+        sayfa = sayfalayici.get_page("gecersiz-imlec")
+        self.assertEqual([g.id for g in sayfa], self.beklenen[:3])
+
+    def test_sayfa_boyutu_ust_siniri(self):
+        self.assertEqual(sayfa_boyutu("100000"), SAYFA_BOYUTU_UST_SINIRI)
+        self.assertEqual(sayfa_boyutu("abc"), 15)
+        self.assertEqual(sayfa_boyutu("0"), 1)
+
+    def test_liste_imlec_modunda_count_calistirmaz(self):
+        url = reverse("yonetim:gelir_gider_listesi")
+        with CaptureQueriesContext(connection) as sorgular:
+            response = self.client.get(url, {"sayfalama": "imlec", "per_page": 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [g.id for g in response.context["gelir_giderler"]], self.beklenen[:3]
+        )
+        self.assertFalse(
+            any("COUNT(*)" in q["sql"] and "yonetim_gelirgider" in q["sql"] for q in sorgular)
+        )
+        response = self.client.get(url + "?" + response.context["page_obj"].sonraki_sorgu)
+        self.assertEqual(
+            [g.id for g in response.context["gelir_giderler"]], self.beklenen[3:6]
+        )
+
+    def test_mesai_ve_personel_listeleri_imlec_modunda_acilir(self):
+        personel = Personel.objects.create(
+            sube=self.sube, ad="A", soyad="B", pozisyon="Garson",
+            ise_baslama_tarihi=date(2024, 1, 1), telefon="3",
+        )
+        Mesai.objects.create(personel=personel, tarih=timezone.localdate(), saat=Decimal("2"))
+        for ad in ["yonetim:mesai_listesi", "yonetim:personel_listesi"]:
+            response = self.client.get(reverse(ad), {"sayfalama": "imlec"})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.context["page_obj"]), 1)
+
+
+class SorguButcesiMiddlewareTestCase(TestCase):
+    AYARLAR = {
+        "ETKIN": True,
+        "VARSAYILAN_LIMIT": 3,
+        "SURE_LIMITI_MS": 10_000,
+        "TEKRAR_ESIGI": 3,
+        "VIEW_LIMITLERI": {},
+        "BASLIKLAR": True,
+    }
+
+    def setUp(self):
+        cache.clear()
+        self.subeler = [
+            Sube.objects.create(ad=f"Şube {i}", tur="cafe", adres="A", telefon="1", yonetici="Y")
+            for i in range(4)
+        ]
+
+    def test_sorgu_kalibi_parametreleri_ayiklar(self):
+        self.assertEqual(
+            sorgu_kalibi("SELECT * FROM t WHERE id = 1 AND ad = 'x'"),
+            sorgu_kalibi("SELECT * FROM t WHERE id = 25 AND ad = 'başka'"),
+        )
+        self.assertEqual(
+            sorgu_kalibi("SELECT * FROM t WHERE id IN (%s, %s, %s)"),
+            "SELECT * FROM t WHERE id IN (...)",
+        )
+
+    def test_tekrarlanan_sorgu_ve_butce_asimi_isaretlenir(self):
+        def n_arti_bir_view(request):
+            for sube in self.subeler:
+                Sube.objects.get(pk=sube.pk)
+            return HttpResponse("ok")
+
+        with override_settings(SORGU_BUTCESI=self.AYARLAR):
+            middleware = SorguButcesiMiddleware(n_arti_bir_view)
+        with self.assertLogs("yonetim.middleware", "WARNING") as loglar:
+            response = middleware(RequestFactory().get("/"))
+
+        self.assertEqual(response["X-Sorgu-Sayisi"], "4")
+        self.assertEqual(response["X-Sorgu-Butcesi-Asildi"], "1")
+        self.assertEqual(response["X-Sorgu-Tekrari"], "4")
+        self.assertTrue(response["Server-Timing"].startswith("db;dur="))
+        self.assertTrue(any("N+1" in satir for satir in loglar.output))
+
+    async def test_async_zincirde_adaptasyonsuz_sayar(self):
+        async def async_view(request):
+            for sube in self.subeler:
+                await Sube.objects.aget(pk=sube.pk)
+            return HttpResponse("ok")
+
+        with override_settings(SORGU_BUTCESI=self.AYARLAR):
+            middleware = SorguButcesiMiddleware(async_view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        with self.assertLogs("yonetim.middleware", "WARNING"):
+            response = await middleware(RequestFactory().get("/"))
+        self.assertEqual(response["X-Sorgu-Sayisi"], "4")
+        self.assertEqual(response["X-Sorgu-Butcesi-Asildi"], "1")
+
+    async def test_eszamanli_async_isteklerin_sorgulari_karismaz(self):
+        """Aynı bağlantıyı paylaşan eşzamanlı istekler yalnızca kendi sorgularını sayar."""
+
+        def view_uret(adet):
+            async def view(request):
+                for _ in range(adet):
+                    await Sube.objects.acount()
+                    await asyncio.sleep(0)
+                return HttpResponse("ok")
+
+            return view
+
+        with override_settings(SORGU_BUTCESI=dict(self.AYARLAR, VARSAYILAN_LIMIT=100)):
+            bir, uc = SorguButcesiMiddleware(view_uret(1)), SorguButcesiMiddleware(view_uret(3))
+        with self.assertLogs("yonetim.middleware", "WARNING"):
+            yanitlar = await asyncio.gather(
+                bir(RequestFactory().get("/")), uc(RequestFactory().get("/"))
+            )
+        self.assertEqual([y["X-Sorgu-Sayisi"] for y in yanitlar], ["1", "3"])
+        self.assertNotIn("X-Sorgu-Tekrari", yanitlar[0])
+
+    def test_kapaliyken_yuklenmez(self):
+        with override_settings(SORGU_BUTCESI={"ETKIN": False}):
+            with self.assertRaises(MiddlewareNotUsed):
+                SorguButcesiMiddleware(lambda request: HttpResponse())
+
+    def test_gercek_istekte_server_timing_basligi_eklenir(self):
+        user = User.objects.create_superuser("muhasebe", password="sifre12345")
+        ayarlar = dict(self.AYARLAR, VARSAYILAN_LIMIT=100)
+        with override_settings(SORGU_BUTCESI=ayarlar):
+            self.client.force_login(user)
+            response = self.client.get(reverse("yonetim:subeler_listesi"))
+        self.assertIn("Server-Timing", response)
+        self.assertGreater(int(response["X-Sorgu-Sayisi"]), 0)
+        self.assertNotIn("X-Sorgu-Butcesi-Asildi", response)
+
+
+@override_settings(ONBELLEK_PAYLASIMLI=True, REPLIKA_VERITABANLARI=[])
+class RolOnbellegiTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.grup, _ = Group.objects.get_or_create(name="Şube Müdürü")
+        self.grup.permissions.clear()
+        self.grup.permissions.add(
+            Permission.objects.get(codename="view_mesai", content_type__app_label="yonetim")
+        )
+        self.user = User.objects.create_user(username="mudur", password="test12345")
+        self.user.groups.add(self.grup)
+        self.client.login(username="mudur", password="test12345")
+
+    def _rol_sorgulari(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [q["sql"] for q in ctx.captured_queries if "auth_group" in q["sql"] or "auth_permission" in q["sql"]]
+
+    def test_giristen_sonra_render_rol_sorgusu_calistirmaz(self):
+        """İlk istekten sonra rol/izin kontrolleri veritabanına gitmez."""
+        url = reverse("yonetim:mesai_listesi")
+        self.assertTrue(self._rol_sorgulari(url))
+        self.assertEqual(self._rol_sorgulari(url), [])
+
+    def test_grup_uyeligi_degisince_onbellek_temizlenir(self):
+        """Kullanıcı gruptan çıkarıldığında yeni rol hemen geçerli olur."""
+        self.assertTrue(sube_muduru_mu(User.objects.get(pk=self.user.pk)))
+        self.user.groups.remove(self.grup)
+        self.assertFalse(sube_muduru_mu(User.objects.get(pk=self.user.pk)))
+        response = self.client.get(reverse("yonetim:mesai_listesi"))
+        self.assertEqual(response.status_code, 403)
+
+    def test_grup_izinleri_degisince_onbellek_temizlenir(self):
+        """Grubun izinleri değiştiğinde (ör. setup_roles) kullanıcıların izinleri yenilenir."""
+        self.assertTrue(User.objects.get(pk=self.user.pk).has_perm("yonetim.view_mesai"))
+        self.grup.permissions.clear()
+        self.assertFalse(User.objects.get(pk=self.user.pk).has_perm("yonetim.view_mesai"))
+        self.grup.user_set.clear()
+        self.assertFalse(sube_muduru_mu(User.objects.get(pk=self.user.pk)))
+
+    @override_settings(ONBELLEK_PAYLASIMLI=False)
+    def test_paylasilmayan_onbellekte_roller_istekler_arasi_saklanmaz(self):
+        """Başka süreçte geri alınan izin bir sonraki istekte geçersiz olur."""
+        url = reverse("yonetim:mesai_listesi")
+        self.assertTrue(self._rol_sorgulari(url))
+        self.assertTrue(self._rol_sorgulari(url))
+        # Sinyal göndermeyen bir değişiklik (başka bir süreçteki yazma gibi)
+        self.grup.permissions.through.objects.filter(group=self.grup).delete()
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+@override_settings(ONBELLEK_PAYLASIMLI=True, REPLIKA_VERITABANLARI=[])
+class ParcaOnbellegiTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.sube = Sube.objects.create(
+            ad="Cafe Şube", tur="cafe", adres="Adres", telefon="1", yonetici="Y"
+        )
+        GelirGider.objects.create(
+            sube=self.sube, tip="gelir", tutar=Decimal("100.00"), tarih=date(2025, 1, 10)
+        )
+        self.user = User.objects.create_superuser("patron", password="sifre12345")
+        self.client.force_login(self.user)
+
+    def _yonetim_sorgulari(self, url, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response, [q["sql"] for q in ctx.captured_queries if "yonetim_" in q["sql"]]
+
+    def test_ana_sayfa_parcasi_onbellekten_gelir(self):
+        """Aynı ay ikinci kez açıldığında toplamlar için sorgu çalışmaz."""
+        url = reverse("yonetim:ana_sayfa")
+        _, ilk = self._yonetim_sorgulari(url, {"year": 2025, "month": 1})
+        response, ikinci = self._yonetim_sorgulari(url, {"year": 2025, "month": 1})
+        self.assertEqual(len(ilk), 2)
+        self.assertEqual(ikinci, [])
+        self.assertContains(response, "100,00")
+
+        # Farklı ay ayrı anahtardır
+        _, baska_ay = self._yonetim_sorgulari(url, {"year": 2025, "month": 2})
+        self.assertEqual(len(baska_ay), 2)
+
+    def test_gelir_gider_yazimi_parcalari_gecersiz_kilar(self):
+        """GelirGider, Personel veya Şube yazıldığında parçalar yeniden üretilir."""
+        url = reverse("yonetim:ana_sayfa")
+        self._yonetim_sorgulari(url, {"year": 2025, "month": 1})
+        with self.captureOnCommitCallbacks(execute=True):
+            GelirGider.objects.create(
+                sube=self.sube, tip="gelir", tutar=Decimal("50.00"), tarih=date(2025, 1, 11)
+            )
+        response, sorgular = self._yonetim_sorgulari(url, {"year": 2025, "month": 1})
+        self.assertEqual(len(sorgular), 2)
+        self.assertContains(response, "150,00")
+
+    def test_subeler_listesi_parcasi_sube_yazimiyla_yenilenir(self):
+        url = reverse("yonetim:subeler_listesi")
+        _, ilk = self._yonetim_sorgulari(url)
+        _, ikinci = self._yonetim_sorgulari(url)
+        self.assertTrue(ilk)
+        self.assertEqual(ikinci, [])
+
+        self.sube.ad = "Yeni Ad"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sube.save()
+        response, ucuncu = self._yonetim_sorgulari(url)
+        self.assertTrue(ucuncu)
+        self.assertContains(response, "Yeni Ad")
+
+    def test_surum_commit_edilince_artar(self):
+        """Commit'ten önce çizilen parça eski sürümün anahtarında kalır."""
+        once = onbellek.surum(onbellek.ANA_SAYFA)
+        with self.captureOnCommitCallbacks(execute=True):
+            GelirGider.objects.create(
+                sube=self.sube, tip="gelir", tutar=Decimal("5.00"), tarih=date(2025, 1, 12)
+            )
+            self.assertEqual(onbellek.surum(onbellek.ANA_SAYFA), once)
+        self.assertGreater(onbellek.surum(onbellek.ANA_SAYFA), once)
+
+        # Geri alınan yazma sürümü hiç artırmaz
+        once = onbellek.surum(onbellek.ANA_SAYFA)
+        with self.captureOnCommitCallbacks(execute=True) as geri_cagirmalar:
+            with transaction.atomic():
+                GelirGider.objects.create(
+                    sube=self.sube, tip="gelir", tutar=Decimal("5.00"), tarih=date(2025, 1, 12)
+                )
+                transaction.set_rollback(True)
+        self.assertEqual(geri_cagirmalar, [])
+        self.assertEqual(onbellek.surum(onbellek.ANA_SAYFA), once)
+
+    @override_settings(ONBELLEK_PAYLASIMLI=False)
+    def test_paylasilmayan_onbellekte_parca_ve_etag_kapali(self):
+        """locmem'de başka süreçlerin yazması görülmez; sayfa her seferinde çizilir."""
+        url = reverse("yonetim:ana_sayfa")
+        ilk, _ = self._yonetim_sorgulari(url, {"year": 2025, "month": 1})
+        _, ikinci = self._yonetim_sorgulari(url, {"year": 2025, "month": 1})
+        self.assertEqual(len(ikinci), 2)
+        self.assertNotIn("ETag", ilk)
+
+    @override_settings(ONBELLEK_PAYLASIMLI=False)
+    def test_dagitim_kontrolu_paylasilan_onbellek_ister(self):
+        from yonetim.checks import paylasimli_onbellek
+
+        self.assertEqual([h.id for h in paylasimli_onbellek(None)], ["yonetim.E001"])
+        with override_settings(ONBELLEK_PAYLASIMLI=True):
+            self.assertEqual(paylasimli_onbellek(None), [])
+
+
+@override_settings(ONBELLEK_PAYLASIMLI=True, REPLIKA_VERITABANLARI=[])
+class FiltreMotoruTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.sube = Sube.objects.create(
+            ad="Cafe Şube", tur="cafe", adres="Adres", telefon="1", yonetici="Y"
+        )
+        for gun, tip in [(5, "gelir"), (6, "gider"), (7, "gelir")]:
+            GelirGider.objects.create(
+                sube=self.sube, tip=tip, tutar=Decimal("10.00"), tarih=date(2025, 1, gun)
+            )
+        self.user = User.objects.create_superuser("patron", password="sifre12345")
+        self.client.force_login(self.user)
+
+    def test_replika_modunda_onbellege_yazilmaz(self):
+        """Replikadan okunan sonuç yeni sürümün anahtarıyla saklanmaz; varsa okunur."""
+        hesaplama = mock.Mock(return_value=1)
+        filtre = GelirGiderFiltresi({"tip": "gelir"})
+        with veritabani.replikadan_oku():
+            self.assertEqual(filtre.onbellekli("adet", hesaplama), 1)
+            self.assertEqual(filtre.onbellekli("adet", hesaplama), 1)
+        self.assertEqual(hesaplama.call_count, 2)
+
+        filtre.onbellekli("adet", hesaplama)
+        with veritabani.replikadan_oku():
+            self.assertEqual(filtre.onbellekli("adet", hesaplama), 1)
+        self.assertEqual(hesaplama.call_count, 3)
+
+    def test_ayni_filtreler_ayni_anahtar_ve_sql(self):
+        """Parametre sırası, boş değerler ve tarih biçimi kanonik anahtarı değiştirmez."""
+        a = GelirGiderFiltresi({"sube": str(self.sube.pk), "tip": "gelir", "bitis": ""})
+        b = GelirGiderFiltresi(
+            {"tip": "gelir", "baslangic": "", "sube": f" {self.sube.pk} "}
+        )
+        self.assertEqual(a.anahtar, b.anahtar)
+        self.assertEqual(str(a.queryset().query), str(b.queryset().query))
+        c = GelirGiderFiltresi({"baslangic": "01.01.2025"})
+        d = GelirGiderFiltresi({"baslangic": "2025-01-01"})
+        self.assertEqual(c.anahtar, d.anahtar)
+
+    def test_gecersiz_parametreler_yok_sayilir(self):
+        filtre = GelirGiderFiltresi({"tip": "hepsi", "sube": "abc", "baslangic": "dun"})
+        self.assertEqual(filtre.degerler, {})
+        self.assertEqual(set(filtre.hatalar), {"tip", "sube", "baslangic"})
+        self.assertEqual(filtre.queryset().count(), 3)
+
+        bugun = timezone.now().date()
+        mesai = MesaiFiltresi({"month": "13", "year": "x"})
+        self.assertEqual(mesai.ay_baslangici, bugun.replace(day=1))
+        self.assertEqual(MesaiFiltresi({"year": "2024", "month": "12"}).ay_bitisi, date(2025, 1, 1))
+
+    def test_liste_yazdirma_ve_disa_aktarim_ozeti_paylasir(self):
+        """Liste sayfasında hesaplanan özet aynı filtreyle yazdırmada tekrar sorgulanmaz."""
+        params = {"tip": "gelir", "baslangic": "2025-01-01"}
+        response = self.client.get(reverse("yonetim:gelir_gider_listesi"), params)
+        self.assertEqual(response.context["toplam_gelir"], Decimal("20.00"))
+
+        with CaptureQueriesContext(connection) as sorgular:
+            response = self.client.get(
+                reverse("yonetim:print_gelir_gider_listesi"),
+                {"baslangic": "2025-01-01", "tip": "gelir", "sube": ""},
+            )
+        self.assertEqual(response.context["ozet"]["toplam_gelir"], Decimal("20.00"))
+        self.assertFalse(any("SUM(" in q["sql"].upper() for q in sorgular))
+
+        # Commit sonrası sürüm artar, özet yeniden hesaplanır
+        with self.captureOnCommitCallbacks(execute=True):
+            GelirGider.objects.create(
+                sube=self.sube, tip="gelir", tutar=Decimal("5.00"), tarih=date(2025, 1, 8)
+            )
+        response = self.client.get(reverse("yonetim:gelir_gider_listesi"), params)
+        self.assertEqual(response.context["toplam_gelir"], Decimal("25.00"))
+
+
+class AramaTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.sube = Sube.objects.create(
+            ad="Cafe Şube", tur="cafe", adres="Adres", telefon="1", yonetici="Y"
+        )
+
+        def personel(ad, soyad, pozisyon):
+            return Personel.objects.create(
+                sube=self.sube, ad=ad, soyad=soyad, pozisyon=pozisyon,
+                ise_baslama_tarihi=date(2024, 1, 1), telefon="3",
+            )
+
+        self.isik = personel("IŞIK", "Yılmaz", "Garson")
+        self.ilker = personel("İlker", "Çelik", "Barista")
+        self.ayse = personel("Ayşe", "Işıklı", "Kasiyer")
+        Mesai.objects.create(
+            personel=self.ilker, tarih=date(2025, 1, 3), saat=Decimal("2.00"),
+            aciklama="Gece İŞLERİ",
+        )
+        self.user = User.objects.create_superuser("patron", password="sifre12345")
+        self.client.force_login(self.user)
+
+    def test_turkce_katlama(self):
+        self.assertEqual(turkce_katla("IŞIK İnce"), "isik ince")
+        self.assertEqual(turkce_katla("ışık"), turkce_katla("ISIK"))
+        self.assertEqual(turkce_katla("  Çağrı\tÖZGÜR "), "cagri ozgur")
+
+    def test_personel_aramasi_turkce_harflerden_bagimsiz(self):
+        url = reverse("yonetim:personel_listesi")
+        for q in ["ışık", "IŞIK", "isik"]:
+            response = self.client.get(url, {"q": q})
+            adlar = [p.ad for p in response.context["personeller"]]
+            # Adı "ışık" ile başlayan soyadında geçenden önce gelir
+            self.assertEqual(adlar, ["IŞIK", "Ayşe"], msg=q)
+        response = self.client.get(url, {"q": "isik", "sayfalama": "imlec"})
+        self.assertEqual([p.ad for p in response.context["personeller"]], ["IŞIK", "Ayşe"])
+
+        response = self.client.get(url, {"q": "ilker barista"})
+        self.assertEqual([p.pk for p in response.context["personeller"]], [self.ilker.pk])
+
+    def test_arama_metni_guncellemede_yenilenir(self):
+        self.ilker.pozisyon = "Şef"
+        self.ilker.save(update_fields=["pozisyon"])
+        self.ilker.refresh_from_db()
+        self.assertEqual(self.ilker.arama_metni, "ilker celik sef")
+
+    def test_mesai_aramasi_personel_adi_ve_aciklamada(self):
+        url = reverse("yonetim:mesai_listesi")
+        for q in ["İLKER", "isleri", "çelik gece"]:
+            response = self.client.get(url, {"q": q, "year": 2025, "month": 1})
+            self.assertEqual(len(response.context["mesailer"]), 1, msg=q)
+        response = self.client.get(url, {"q": "yılmaz", "year": 2025, "month": 1})
+        self.assertEqual(len(response.context["mesailer"]), 0)
+
+
+class TopluMesaiGirisiTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.sube = Sube.objects.create(
+            ad="Cafe Şube", tur="cafe", adres="Adres", telefon="1", yonetici="Y"
+        )
+        self.diger_sube = Sube.objects.create(
+            ad="Otel Şube", tur="otel", adres="Adres", telefon="2", yonetici="Y"
+        )
+        self.personeller = [
+            Personel.objects.create(
+                sube=self.sube, ad=ad, soyad="Test", pozisyon="Garson",
+                ise_baslama_tarihi=date(2024, 1, 1), telefon="3",
+            )
+            for ad in ["Ali", "Veli", "Zeynep"]
+        ]
+        self.yabanci = Personel.objects.create(
+            sube=self.diger_sube, ad="Yabancı", soyad="Test", pozisyon="Garson",
+            ise_baslama_tarihi=date(2024, 1, 1), telefon="4",
+        )
+        self.user = User.objects.create_superuser("patron", password="sifre12345")
+        self.client.force_login(self.user)
+        self.url = reverse("yonetim:mesai_toplu_ekle")
+
+    def _veri(self, satirlar):
+        veri = {
+            "sube": self.sube.pk,
+            "tarih": "2025-01-15",
+            "form-TOTAL_FORMS": len(satirlar),
+            "form-INITIAL_FORMS": len(satirlar),
+        }
+        for i, (personel, saat, aciklama) in enumerate(satirlar):
+            veri[f"form-{i}-personel"] = personel.pk
+            veri[f"form-{i}-saat"] = saat
+            veri[f"form-{i}-aciklama"] = aciklama
+        return veri
+
+    def test_subenin_tum_personeli_listelenir(self):
+        response = self.client.get(self.url, {"sube": self.sube.pk, "tarih": "2025-01-15"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [satir["personel"] for satir in response.context["satirlar"]], self.personeller
+        )
+
+    def test_satirlar_tek_bulk_create_ile_kaydedilir(self):
+        ali, veli, zeynep = self.personeller
+        veri = self._veri([(ali, "2", "Gece"), (veli, "", ""), (zeynep, "3.5", "")])
+        with CaptureQueriesContext(connection) as sorgular:
+            response = self.client.post(self.url, veri)
+        self.assertEqual(response.status_code, 302)
+        insertler = [q for q in sorgular if q["sql"].startswith("INSERT INTO \"yonetim_mesai\"")]
+        self.assertEqual(len(insertler), 1)
+
+        mesailer = Mesai.objects.filter(tarih=date(2025, 1, 15)).order_by("personel__ad")
+        self.assertEqual(
+            [(m.personel, m.saat) for m in mesailer],
+            [(ali, Decimal("2.00")), (zeynep, Decimal("3.50"))],
+        )
+        self.assertEqual(mesailer[0].arama_metni, "gece")
+
+        # Aynı formun tekrar gönderilmesi mükerrer kayıt oluşturmaz
+        response = self.client.post(self.url, veri)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Mesai.objects.count(), 2)
+
+    def test_hatali_satir_varsa_hicbiri_kaydedilmez(self):
+        ali, veli, _ = self.personeller
+        veri = self._veri([(ali, "2", ""), (veli, "-1", ""), (self.yabanci, "4", "")])
+        response = self.client.post(self.url, veri)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Mesai.objects.count(), 0)
+
+        hatalar = [satir["form"].errors for satir in response.context["satirlar"]]
+        self.assertFalse(hatalar[0])
+        self.assertIn("saat", hatalar[1])
+        self.assertIn("__all__", hatalar[2])
+
+
+class GelirGiderIceAktarimTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.sube = Sube.objects.create(
+            ad="Çamlık Cafe", tur="cafe", adres="Adres", telefon="1", yonetici="Y"
+        )
+        self.user = User.objects.create_superuser("patron", password="sifre12345")
+        self.client.force_login(self.user)
+        self.url = reverse("yonetim:gelir_gider_ice_aktar")
+
+    def _csv(self, satirlar, ayrac=";"):
+        baslik = ayrac.join(["Şube", "Tip", "Kategori", "Tutar", "Tarih", "Açıklama"])
+        metin = "\n".join([baslik] + [ayrac.join(s) for s in satirlar]) + "\n"
+        return BytesIO(metin.encode("utf-8-sig"))
+
+    def _aktar(self, dosya, bicim="csv", **kwargs):
+        from yonetim.ice_aktarim import GelirGiderIceAktarici
+
+        return GelirGiderIceAktarici(parca_boyutu=2).ice_aktar(dosya, bicim, **kwargs)
+
+    def test_turkce_tutar_ve_sube_adi_cozulur(self):
+        sonuc = self._aktar(
+            self._csv(
+                [
+                    ["ÇAMLIK CAFE", "Gelir", "NAKİT", "1.234,56", "15.01.2025", "POS"],
+                    [str(self.sube.pk), "gider", "", "99.5", "2025-01-20", ""],
+                ]
+            )
+        )
+        self.assertEqual((sonuc.okunan, sonuc.eklenen, sonuc.reddedilen), (2, 2, 0))
+        kayitlar = GelirGider.objects.order_by("tarih")
+        self.assertEqual(
+            [(k.tip, k.kategori, k.tutar, k.tarih) for k in kayitlar],
+            [
+                ("gelir", "nakit", Decimal("1234.56"), date(2025, 1, 15)),
+                ("gider", "nakit", Decimal("99.50"), date(2025, 1, 20)),
+            ],
+        )
+        ozet = SubeAylikOzet.objects.get(sube=self.sube, ay=date(2025, 1, 1), tip="gelir")
+        self.assertEqual((ozet.toplam, ozet.kayit_sayisi), (Decimal("1234.56"), 1))
+
+    def test_mukerrer_ve_hatali_satirlar_atlanir(self):
+        GelirGider.objects.create(
+            sube=self.sube, tip="gelir", tutar=Decimal("100"), tarih=date(2025, 1, 1),
+            aciklama="Mevcut",
+        )
+        satirlar = [
+            ["Çamlık Cafe", "gelir", "nakit", "100", "2025-01-01", "Mevcut"],
+            ["Çamlık Cafe", "gelir", "nakit", "50", "2025-01-02", "Yeni"],
+            ["Çamlık Cafe", "gelir", "nakit", "50,00", "02.01.2025", "Yeni"],
+            ["Yok Şube", "gelir", "nakit", "10", "2025-01-03", ""],
+            ["Çamlık Cafe", "gelir", "nakit", "-5", "2025-01-03", ""],
+            ["Çamlık Cafe", "transfer", "nakit", "5", "2025-01-03", ""],
+            ["Çamlık Cafe", "gider", "nakit", "5", "31.02.2025", ""],
+        ]
+        sonuc = self._aktar(self._csv(satirlar))
+        self.assertEqual(
+            (sonuc.okunan, sonuc.eklenen, sonuc.mukerrer, sonuc.reddedilen), (7, 1, 2, 4)
+        )
+        self.assertEqual([satir_no for satir_no, _ in sonuc.hatalar], [5, 6, 7, 8])
+        self.assertEqual(GelirGider.objects.count(), 2)
+
+    def test_xlsx_dosyasi_okunur(self):
+        from openpyxl import Workbook
+
+        kitap = Workbook()
+        sayfa = kitap.active
+        sayfa.append(["Şube", "Tip", "Tutar", "Tarih"])
+        sayfa.append(["Çamlık Cafe", "Gelir", 250.75, date(2025, 3, 5)])
+        dosya = BytesIO()
+        kitap.save(dosya)
+        dosya.seek(0)
+
+        sonuc = self._aktar(dosya, "xlsx")
+        self.assertEqual(sonuc.eklenen, 1)
+        kayit = GelirGider.objects.get()
+        self.assertEqual((kayit.tutar, kayit.tarih), (Decimal("250.75"), date(2025, 3, 5)))
+
+    def test_kuru_calistirma_hicbir_sey_yazmaz(self):
+        sonuc = self._aktar(
+            self._csv([["Çamlık Cafe", "gelir", "nakit", "10", "2025-01-01", ""]]), kuru=True
+        )
+        self.assertEqual(sonuc.eklenen, 1)
+        self.assertFalse(GelirGider.objects.exists())
+        self.assertFalse(SubeAylikOzet.objects.exists())
+
+    def test_eksik_sutun_dosyayi_reddeder(self):
+        from yonetim.ice_aktarim import IceAktarimHatasi
+
+        with self.assertRaises(IceAktarimHatasi):
+            self._aktar(BytesIO("Şube;Tutar\nÇamlık Cafe;10\n".encode()))
+
+    def test_komut_ozet_yazar(self):
+        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as dosya:
+            dosya.write(
+                self._csv(
+                    [
+                        ["Çamlık Cafe", "gelir", "nakit", "10", "2025-01-01", ""],
+                        ["Çamlık Cafe", "gelir", "nakit", "abc", "2025-01-01", ""],
+                    ],
+                    ayrac=",",
+                ).getvalue()
+            )
+        out = StringIO()
+        call_command("import_gelir_gider", dosya.name, "--parca", "1", stdout=out)
+        self.assertIn("Satır 3: Geçersiz tutar: abc", out.getvalue())
+        self.assertIn("1 kayıt içe aktarıldı.", out.getvalue())
+        self.assertEqual(GelirGider.objects.count(), 1)
+
+    def test_yukleme_sayfasi(self):
+        dosya = self._csv([["Çamlık Cafe", "gider", "nakit", "42", "2025-02-01", "Fatura"]])
+        dosya.name = "pos.csv"
+        response = self.client.post(self.url, {"dosya": dosya})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["sonuc"].eklenen, 1)
+        self.assertTrue(GelirGider.objects.filter(aciklama="Fatura").exists())
+
+        yanlis = BytesIO(b"x")
+        yanlis.name = "pos.pdf"
+        response = self.client.post(self.url, {"dosya": yanlis})
+        self.assertIsNone(response.context["sonuc"])
+        self.assertTrue(response.context["form"].errors["dosya"])
+
+    def test_her_parca_ayri_commit_edilir(self):
+        satirlar = [
+            ["Çamlık Cafe", "gelir", "nakit", str(tutar), "2025-01-01", ""]
+            for tutar in (10, 20, 30, 40)
+        ]
+        gercek = SubeAylikOzet.farklari_ekle
+        cagri = []
+
+        def ikinci_parcada_hata(*args):
+            cagri.append(args)
+            if len(cagri) > 1:
+                raise DatabaseError("bağlantı koptu")
+            return gercek(*args)
+
+        with mock.patch.object(SubeAylikOzet, "farklari_ekle", side_effect=ikinci_parcada_hata):
+            with self.assertRaises(DatabaseError):
+                self._aktar(self._csv(satirlar))
+        # İlk parça özet ve sayacıyla yazılmış kalır, ikincisi geri alınır
+        self.assertEqual(GelirGider.objects.count(), 2)
+        self.sube.refresh_from_db()
+        self.assertEqual(self.sube.toplam_gelir(), Decimal("30.00"))
+
+        # Yeniden çalıştırma yazılmış parçayı mükerrer sayıp kalanları ekler
+        sonuc = self._aktar(self._csv(satirlar))
+        self.assertEqual((sonuc.eklenen, sonuc.mukerrer), (2, 2))
+        self.sube.refresh_from_db()
+        self.assertEqual(self.sube.toplam_gelir(), Decimal("100.00"))
+
+    def test_buyuk_dosya_kuyrukta_ice_aktarilir(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        dosya = self._csv(
+            [
+                ["Çamlık Cafe", "gelir", "nakit", "10", "2025-01-01", ""],
+                ["Çamlık Cafe", "gelir", "nakit", "-5", "2025-01-02", ""],
+            ]
+        )
+        dosya.name = "pos.csv"
+        with override_settings(MEDIA_ROOT=media.name, ICE_AKTARIM_KUYRUK_ESIGI=10):
+            response = self.client.post(self.url, {"dosya": dosya})
+            self.assertIsNone(response.context["sonuc"])
+            self.assertFalse(GelirGider.objects.exists())
+            is_ = DisaAktarimIsi.objects.get(rapor="gelir_gider_ice_aktarim")
+            self.assertEqual(response.context["kuyruk_isi"]["id"], is_.pk)
+
+            call_command("run_export_worker", "--tek-sefer", stdout=StringIO())
+
+            is_.refresh_from_db()
+            self.assertEqual(is_.durum, "tamamlandi")
+            self.assertEqual(GelirGider.objects.count(), 1)
+            rapor = is_.dosya.open("rb").read().decode("utf-8-sig")
+            self.assertIn("2;1;0;1", rapor)
+            self.assertIn("Satır", rapor)
+            # Yüklenen kaynak dosya iş bitince silinir
+            self.assertFalse(default_storage.exists(is_.parametreler["kaynak"]))
+
+    def test_ice_aktarim_isi_disaridan_baslatilamaz(self):
+        response = self.client.post(
+            reverse("yonetim:disa_aktarim_baslat", args=["gelir_gider_ice_aktarim"])
+            + "?kaynak=ice_aktarimlar/baska.csv&bicim=csv"
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(DisaAktarimIsi.objects.exists())
+
+
+class PersonelAylikMesaiTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.sube = Sube.objects.create(
+            ad="Cafe Şube", tur="cafe", adres="Adres", telefon="1", yonetici="Y"
+        )
+        self.ali, self.veli = [
+            Personel.objects.create(
+                sube=self.sube, ad=ad, soyad="Test", pozisyon="Garson",
+                ise_baslama_tarihi=date(2024, 1, 1), telefon="3",
+            )
+            for ad in ["Ali", "Veli"]
+        ]
+        self.bugun = timezone.localdate()
+        self.user = User.objects.create_superuser("patron", password="sifre12345")
+        self.client.force_login(self.user)
+
+    def _ozet(self, personel, ay):
+        return PersonelAylikMesai.objects.filter(personel=personel, ay=ay.replace(day=1)).first()
+
+    def test_ozet_kayit_guncelleme_ve_silmede_guncel_kalir(self):
+        mesai = Mesai.objects.create(personel=self.ali, tarih=date(2025, 1, 10), saat=Decimal("2"))
+        Mesai.objects.create(personel=self.ali, tarih=date(2025, 1, 20), saat=Decimal("1.5"))
+        ozet = self._ozet(self.ali, date(2025, 1, 1))
+        self.assertEqual((ozet.toplam_saat, ozet.kayit_sayisi), (Decimal("3.50"), 2))
+
+        # Başka personele ve aya taşınan mesai iki kovayı da günceller
+        mesai.personel = self.veli
+        mesai.tarih = date(2025, 2, 1)
+        mesai.save()
+        ozet.refresh_from_db()
+        self.assertEqual(ozet.toplam_saat, Decimal("1.50"))
+        self.assertEqual(self._ozet(self.veli, date(2025, 2, 1)).toplam_saat, Decimal("2.00"))
+
+        mesai.delete()
+        self.assertIsNone(self._ozet(self.veli, date(2025, 2, 1)))
+
+    def test_toplu_olusturma_ozeti_gunceller(self):
+        Mesai.toplu_olustur(
+            [
+                Mesai(personel=self.ali, tarih=date(2025, 3, 1), saat=Decimal("4")),
+                Mesai(personel=self.ali, tarih=date(2025, 3, 2), saat=Decimal("1")),
+                Mesai(personel=self.veli, tarih=date(2025, 4, 1), saat=Decimal("2")),
+            ]
+        )
+        self.assertEqual(self._ozet(self.ali, date(2025, 3, 1)).toplam_saat, Decimal("5.00"))
+        self.assertEqual(self._ozet(self.veli, date(2025, 4, 1)).toplam_saat, Decimal("2.00"))
+
+    def test_kova_yeniden_toplanmaz_fark_eklenir(self):
+        """Eşzamanlı bir yazmanın kovaya eklediği saat sonraki yazmalarda ezilmez."""
+        mesai = Mesai.objects.create(personel=self.ali, tarih=date(2025, 1, 10), saat=Decimal("2"))
+        kova = PersonelAylikMesai.objects.filter(personel=self.ali, ay=date(2025, 1, 1))
+        # Başka bir transaction'ın henüz görünmeyen mesaisinin farkı
+        kova.update(toplam_saat=F("toplam_saat") + 3, kayit_sayisi=F("kayit_sayisi") + 1)
+
+        with CaptureQueriesContext(connection) as sorgular:
+            mesai.saat = Decimal("4")
+            mesai.save()
+        self.assertFalse(any("SUM(" in q["sql"].upper() for q in sorgular))
+        self.assertEqual(kova.get().toplam_saat, Decimal("7.00"))
+
+        Mesai.toplu_olustur(
+            [Mesai(personel=self.ali, tarih=date(2025, 1, 11), saat=Decimal("1"))]
+        )
+        self.assertEqual((kova.get().toplam_saat, kova.get().kayit_sayisi), (Decimal("8.00"), 3))
+
+    def test_bu_ay_ve_tum_zamanlar_mesai_tablosunu_taramaz(self):
+        Mesai.objects.create(personel=self.ali, tarih=self.bugun, saat=Decimal("3"))
+        Mesai.objects.create(personel=self.ali, tarih=date(2020, 1, 1), saat=Decimal("5"))
+        with CaptureQueriesContext(connection) as sorgular:
+            personeller = {p.ad: p for p in Personel.objects.mesai_toplamlari()}
+        self.assertNotIn("yonetim_mesai\"", sorgular[0]["sql"])
+        self.assertEqual(personeller["Ali"].bu_ay_mesai, Decimal("3.00"))
+        self.assertEqual(personeller["Ali"].toplam_mesai, Decimal("8.00"))
+        self.assertEqual(personeller["Veli"].toplam_mesai, Decimal("0.00"))
+        self.assertEqual(self.ali.toplam_mesai_saati(), Decimal("8.00"))
+
+    def test_liste_yazdirma_ve_admin_ozetten_okur(self):
+        Mesai.objects.create(personel=self.ali, tarih=self.bugun, saat=Decimal("3"))
+        response = self.client.get(reverse("yonetim:personel_listesi"))
+        ali = next(p for p in response.context["personeller"] if p.pk == self.ali.pk)
+        self.assertEqual((ali.bu_ay_mesai, ali.toplam_mesai), (Decimal("3.00"), Decimal("3.00")))
+
+        response = self.client.get(reverse("yonetim:print_personel_listesi"))
+        self.assertContains(response, "3,00 saat", count=2)
+
+        response = self.client.get(reverse("admin:yonetim_personel_changelist"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "3.00 saat", count=2)
+
+    def test_komut_ozeti_yeniden_olusturur(self):
+        Mesai.objects.create(personel=self.ali, tarih=date(2025, 1, 10), saat=Decimal("2"))
+        PersonelAylikMesai.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_aylik_mesai", stdout=out)
+        self.assertIn("1 adet özet satırı", out.getvalue())
+        self.assertEqual(self._ozet(self.ali, date(2025, 1, 1)).toplam_saat, Decimal("2.00"))
+
+
+class SubeSayaclariTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cafe = Sube.objects.create(
+            ad="Cafe Şube", tur="cafe", adres="Adres", telefon="1", yonetici="Y"
+        )
+        self.otel = Sube.objects.create(
+            ad="Otel Şube", tur="otel", adres="Adres", telefon="2", yonetici="Y"
+        )
+
+    def _personel(self, sube, ad="Ali"):
+        return Personel.objects.create(
+            sube=sube, ad=ad, soyad="Test", pozisyon="Garson",
+            ise_baslama_tarihi=date(2024, 1, 1), telefon="3",
+        )
+
+    def _sayaclar(self, sube):
+        sube.refresh_from_db()
+        return sube.toplam_gelir(), sube.toplam_gider(), sube.personel_sayisi()
+
+    def test_sayaclar_kayit_guncelleme_ve_silmeyi_izler(self):
+        kayit = GelirGider.objects.create(
+            sube=self.cafe, tip="gelir", tutar=Decimal("100"), tarih=date(2025, 1, 1)
+        )
+        GelirGider.objects.create(
+            sube=self.cafe, tip="gider", tutar=Decimal("30"), tarih=date(2025, 1, 2)
+        )
+        personel = self._personel(self.cafe)
+        self._personel(self.cafe, "Veli")
+        self.assertEqual(self._sayaclar(self.cafe), (Decimal("100"), Decimal("30"), 2))
+        self.assertEqual(self.cafe.net_kar(), Decimal("70"))
+
+        # Tutar, tip ve şube değişikliği eski değeri düşüp yenisini ekler
+        kayit.tutar = Decimal("40")
+        kayit.tip = "gider"
+        kayit.sube = self.otel
+        kayit.save()
+        personel.sube = self.otel
+        personel.save()
+        self.assertEqual(self._sayaclar(self.cafe), (Decimal("0"), Decimal("30"), 1))
+        self.assertEqual(self._sayaclar(self.otel), (Decimal("0"), Decimal("40"), 1))
+
+        kayit.delete()
+        personel.delete()
+        self.assertEqual(self._sayaclar(self.otel), (Decimal("0"), Decimal("0"), 0))
+
+    def test_model_metotlari_sorgu_atmaz(self):
+        GelirGider.objects.create(
+            sube=self.cafe, tip="gelir", tutar=Decimal("10"), tarih=date(2025, 1, 1)
+        )
+        sube = Sube.objects.get(pk=self.cafe.pk)
+        with self.assertNumQueries(0):
+            sube.toplam_gelir(), sube.toplam_gider(), sube.net_kar(), sube.personel_sayisi()
+
+    def test_toplu_silme_kovalari_ve_sayaclari_bir_kez_gunceller(self):
+        for gun in range(1, 31):
+            GelirGider.objects.create(
+                sube=self.cafe, tip="gelir", tutar=Decimal("10"), tarih=date(2025, 1, gun)
+            )
+        GelirGider.objects.create(
+            sube=self.cafe, tip="gider", tutar=Decimal("5"), tarih=date(2025, 2, 1)
+        )
+        with CaptureQueriesContext(connection) as sorgular:
+            GelirGider.objects.filter(sube=self.cafe, tip="gelir").delete()
+        # Satır başına değil, kova ve şube başına birkaç sorgu
+        self.assertLess(len(sorgular), 10)
+        self.assertEqual(self._sayaclar(self.cafe), (Decimal("0"), Decimal("5"), 0))
+        self.assertFalse(SubeAylikOzet.objects.filter(sube=self.cafe, tip="gelir").exists())
+        self.assertTrue(SubeAylikOzet.objects.filter(sube=self.cafe, tip="gider").exists())
+
+    def test_sube_silme_sorgu_sayisi_satir_sayisindan_bagimsiz(self):
+        def sil(adet):
+            sube = Sube.objects.create(
+                ad=f"Silinecek {adet}", tur="cafe", adres="A", telefon="9", yonetici="Y"
+            )
+            GelirGider.objects.bulk_create(
+                GelirGider(
+                    sube=sube, tip="gelir", tutar=Decimal("1"),
+                    tarih=date(2025, 1, 1) + timedelta(days=i % 60),
+                )
+                for i in range(adet)
+            )
+            personel = self._personel(sube)
+            Mesai.toplu_olustur(
+                Mesai(personel=personel, tarih=date(2025, 1, 1) + timedelta(days=i % 60),
+                      saat=Decimal("1"))
+                for i in range(adet)
+            )
+            with CaptureQueriesContext(connection) as sorgular:
+                sube.delete()
+            return len(sorgular)
+
+        az, cok = sil(5), sil(400)
+        # Kalan fark yalnızca Django'nun toplu DELETE parçalarından gelir
+        self.assertLess(cok - az, 20)
+        self.assertEqual(SubeAylikOzet.objects.count(), 0)
+        self.assertEqual(PersonelAylikMesai.objects.count(), 0)
+
+    def test_sube_formu_sayaclari_ezmez(self):
+        eski = Sube.objects.get(pk=self.cafe.pk)
+        GelirGider.objects.create(
+            sube=self.cafe, tip="gelir", tutar=Decimal("10"), tarih=date(2025, 1, 1)
+        )
+        eski.ad = "Yeni Ad"
+        eski.save()
+        self.assertEqual(self._sayaclar(self.cafe)[0], Decimal("10"))
+
+    def test_toplu_ice_aktarim_sayaclari_gunceller(self):
+        from yonetim.ice_aktarim import GelirGiderIceAktarici
+
+        dosya = BytesIO(
+            "Şube;Tip;Tutar;Tarih\nCafe Şube;gelir;10;2025-01-01\nCafe Şube;gelir;5;2025-01-02\n".encode()
+        )
+        GelirGiderIceAktarici().ice_aktar(dosya, "csv")
+        self.assertEqual(self._sayaclar(self.cafe)[0], Decimal("15"))
+
+    def test_denetim_komutu_tutarsizligi_bulur_ve_onarir(self):
+        GelirGider.objects.create(
+            sube=self.cafe, tip="gelir", tutar=Decimal("10"), tarih=date(2025, 1, 1)
+        )
+        self._personel(self.cafe)
+        Sube.objects.filter(pk=self.cafe.pk).update(gelir_toplami=0, personel_adedi=5)
+
+        out = StringIO()
+        call_command("sube_sayaclarini_denetle", stdout=out)
+        self.assertIn("1 şubenin sayaçları tutarsız", out.getvalue())
+        self.assertEqual(self._sayaclar(self.cafe)[2], 5)
+
+        call_command("sube_sayaclarini_denetle", "--onar", stdout=StringIO())
+        self.assertEqual(self._sayaclar(self.cafe), (Decimal("10"), Decimal("0"), 1))
+        out = StringIO()
+        call_command("sube_sayaclarini_denetle", stdout=out)
+        self.assertIn("2 şubenin sayaçları tutarlı", out.getvalue())
+
+
+class SubeAdminTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.subeler = [
+            Sube.objects.create(
+                ad=f"Şube {i}", tur="cafe", adres="Adres", telefon="1", yonetici="Y"
+            )
+            for i in range(5)
+        ]
+        for sube in self.subeler:
+            Personel.objects.bulk_create(
+                Personel(
+                    sube=sube, ad=f"P{i}", soyad="Test", pozisyon="Garson",
+                    ise_baslama_tarihi=date(2024, 1, 1), telefon="3",
+                )
+                for i in range(20)
+            )
+            GelirGider.objects.bulk_create(
+                GelirGider(
+                    sube=sube,
+                    tip="gelir" if i % 2 else "gider",
+                    tutar=Decimal("10.00"),
+                    tarih=date(2025, 1, 1 + i % 28),
+                )
+                for i in range(1000)
+            )
+        # bulk_create sinyal göndermez; sayaçlar denetim komutuyla doldurulur
+        call_command("sube_sayaclarini_denetle", "--onar", stdout=StringIO())
+        self.user = User.objects.create_superuser("patron", password="sifre12345")
+        self.client.force_login(self.user)
+        self.url = reverse("admin:yonetim_sube_changelist")
+
+    def test_changelist_dogru_toplamlari_sorgu_butcesiyle_gosterir(self):
+        baslangic = time.perf_counter()
+        with CaptureQueriesContext(connection) as sorgular:
+            response = self.client.get(self.url, {"o": "5"})
+        sure = time.perf_counter() - baslangic
+
+        self.assertEqual(response.status_code, 200)
+        # Personel sayısıyla çarpılmamış toplamlar: 500 × 10 ₺
+        self.assertContains(response, "5,000.00 ₺", count=10)
+        self.assertContains(response, "<td class=\"field-personel_sayisi_display\">20</td>", count=5)
+        self.assertLessEqual(len(sorgular), 10)
+        self.assertFalse(
+            any("yonetim_gelirgider" in q["sql"] or "yonetim_personel" in q["sql"] for q in sorgular)
+        )
+        self.assertLess(sure, 2)
+
+
+class SubelerListesiToplamlariTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.kalabalik = Sube.objects.create(
+            ad="Kalabalık Şube", tur="cafe", adres="Adres", telefon="1", yonetici="Y"
+        )
+        self.bos = Sube.objects.create(
+            ad="Boş Şube", tur="otel", adres="Adres", telefon="2", yonetici="Y"
+        )
+        for i in range(4):
+            Personel.objects.create(
+                sube=self.kalabalik, ad=f"P{i}", soyad="Test", pozisyon="Garson",
+                ise_baslama_tarihi=date(2024, 1, 1), telefon="3",
+            )
+        for tip, tutar in [("gelir", "100"), ("gelir", "50"), ("gider", "30")]:
+            GelirGider.objects.create(
+                sube=self.kalabalik, tip=tip, tutar=Decimal(tutar), tarih=date(2025, 1, 1)
+            )
+        self.user = User.objects.create_superuser("patron", password="sifre12345")
+        self.client.force_login(self.user)
+
+    def test_toplamlar_personel_sayisiyla_carpilmaz(self):
+        response = self.client.get(reverse("yonetim:subeler_listesi"))
+        subeler = {s.ad: s for s in response.context["subeler"]}
+
+        kalabalik = subeler["Kalabalık Şube"]
+        self.assertEqual(kalabalik.personel_sayisi, 4)
+        self.assertEqual(kalabalik.toplam_gelir, Decimal("150"))
+        self.assertEqual(kalabalik.toplam_gider, Decimal("30"))
+        self.assertEqual(kalabalik.net_kar, Decimal("120"))
+
+        bos = subeler["Boş Şube"]
+        self.assertEqual(
+            (bos.personel_sayisi, bos.toplam_gelir, bos.toplam_gider, bos.net_kar),
+            (0, Decimal("0"), Decimal("0"), Decimal("0")),
+        )
+
+    def test_personel_ve_gelir_gider_ayni_sorguda_birlestirilmez(self):
+        with CaptureQueriesContext(connection) as sorgular:
+            response = self.client.get(reverse("yonetim:subeler_listesi"))
+            list(response.context["subeler"])
+        liste_sorgusu = next(
+            q["sql"] for q in sorgular if "yonetim_gelirgider" in q["sql"]
+        )
+        self.assertNotIn("JOIN", liste_sorgusu.upper())
+        self.assertNotIn("GROUP BY \"yonetim_sube\"", liste_sorgusu)
+
+
+class PersonelSecenekleriApiTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cafe = Sube.objects.create(
+            ad="Cafe Şube", tur="cafe", adres="Adres", telefon="1", yonetici="Y"
+        )
+        self.otel = Sube.objects.create(
+            ad="Otel Şube", tur="otel", adres="Adres", telefon="2", yonetici="Y"
+        )
+        self.ali = self._personel(self.cafe, "Ali")
+        self._personel(self.otel, "Veli")
+        self.user = User.objects.create_superuser("patron", password="sifre12345")
+        self.client.force_login(self.user)
+        self.url = reverse("yonetim:api_personel_by_sube")
+
+    def _personel(self, sube, ad):
+        return Personel.objects.create(
+            sube=sube, ad=ad, soyad="Test", pozisyon="Garson",
+            ise_baslama_tarihi=date(2024, 1, 1), telefon="3",
+        )
+
+    def test_kompakt_liste_doner(self):
+        response = self.client.get(self.url, {"sube_id": self.cafe.pk})
+        self.assertEqual(response.json(), {"personeller": [[self.ali.pk, "Ali Test", self.cafe.pk]]})
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_sube_verilmezse_bos_liste_doner(self):
+        """Şube seçilmeden tüm personel tablosu istemciye gönderilmez."""
+        with CaptureQueriesContext(connection) as sorgular:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"personeller": []})
+        self.assertFalse([q for q in sorgular if "yonetim_personel" in q["sql"]])
+
+    def test_degismeyen_liste_icin_304_doner(self):
+        etag = self.client.get(self.url, {"sube_id": self.cafe.pk})["ETag"]
+        with CaptureQueriesContext(connection) as sorgular:
+            response = self.client.get(
+                self.url, {"sube_id": self.cafe.pk}, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 304)
+        # Liste okunmaz; yalnızca sürümü veren tek aggregate çalışır
+        personel_sorgulari = [q["sql"] for q in sorgular if "yonetim_personel" in q["sql"]]
+        self.assertEqual(len(personel_sorgulari), 1)
+        self.assertIn("COUNT(", personel_sorgulari[0])
+
+        # Ekleme ve silme ETag'i değiştirir
+        yeni = self._personel(self.cafe, "Zeynep")
+        response = self.client.get(self.url, {"sube_id": self.cafe.pk}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        yeni.delete()
+        response = self.client.get(self.url, {"sube_id": self.cafe.pk}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_mesai_listesi_personel_seceneklerini_gommez(self):
+        response = self.client.get(reverse("yonetim:mesai_listesi"))
+        self.assertNotContains(response, "Veli Test")
+        self.assertIsNone(response.context["secili_personel_nesnesi"])
+
+        response = self.client.get(reverse("yonetim:mesai_listesi"), {"personel": self.ali.pk})
+        self.assertContains(response, "Ali Test - Cafe Şube")
+        self.assertNotContains(response, "Veli Test")
+
+
+@override_settings(ONBELLEK_PAYLASIMLI=True, REPLIKA_VERITABANLARI=[])
+class KosulluSayfaTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.sube = Sube.objects.create(
+            ad="Cafe Şube", tur="cafe", adres="Adres", telefon="1", yonetici="Y"
+        )
+        self.user = User.objects.create_superuser("patron", password="sifre12345")
+        self.client.force_login(self.user)
+        # İlk sayfa CSRF çerezini oluşturur; çerez ETag'e dahil olduğundan önce alınır
+        self.client.get(reverse("yonetim:ana_sayfa"))
+
+    def _kosullu_get(self, url, etag):
+        with CaptureQueriesContext(connection) as sorgular:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        return response, [q["sql"] for q in sorgular]
+
+    def test_replika_modunda_etag_uretilmez(self):
+        url = reverse("yonetim:gelir_gider_listesi")
+        etag = self.client.get(url)["ETag"]
+        with veritabani.replikadan_oku():
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("ETag"))
+
+    def test_etag_commit_edilince_degisir(self):
+        """Commit'ten önce üretilen sayfa yeni ETag'i taşımaz."""
+        url = reverse("yonetim:gelir_gider_listesi")
+        etag = self.client.get(url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                GelirGider.objects.create(
+                    sube=self.sube, tip="gelir", tutar=Decimal("10"), tarih=date(2025, 1, 1)
+                )
+                self.assertEqual(self.client.get(url)["ETag"], etag)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_degismeyen_sayfalar_sorgusuz_304_doner(self):
+        for ad in [
+            "ana_sayfa",
+            "subeler_listesi",
+            "personel_listesi",
+            "mesai_listesi",
+            "gelir_gider_listesi",
+        ]:
+            with self.subTest(sayfa=ad):
+                url = reverse(f"yonetim:{ad}")
+                ilk = self.client.get(url)
+                self.assertEqual(ilk.status_code, 200)
+                self.assertIn("no-cache", ilk["Cache-Control"])
+                response, sorgular = self._kosullu_get(url, ilk["ETag"])
+                self.assertEqual(response.status_code, 304)
+                self.assertFalse([sql for sql in sorgular if "yonetim_" in sql])
+
+    def test_veri_degisince_sayfa_yeniden_uretilir(self):
+        url = reverse("yonetim:gelir_gider_listesi")
+        etag = self.client.get(url)["ETag"]
+        # Mesai gelir/gider listesini etkilemez
+        personel = Personel.objects.create(
+            sube=self.sube, ad="Ali", soyad="Test", pozisyon="Garson",
+            ise_baslama_tarihi=date(2024, 1, 1), telefon="3",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Mesai.objects.create(personel=personel, tarih=date(2025, 1, 1), saat=Decimal("2"))
+        self.assertEqual(self._kosullu_get(url, etag)[0].status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            GelirGider.objects.create(
+                sube=self.sube, tip="gelir", tutar=Decimal("10"), tarih=date(2025, 1, 1)
+            )
+        self.assertEqual(self._kosullu_get(url, etag)[0].status_code, 200)
+
+    def test_etag_kullaniciya_ve_mesajlara_baglidir(self):
+        url = reverse("yonetim:subeler_listesi")
+        etag = self.client.get(url)["ETag"]
+
+        baska = User.objects.create_superuser("baska", password="sifre12345")
+        self.client.force_login(baska)
+        self.assertEqual(self._kosullu_get(url, etag)[0].status_code, 200)
+
+        # Bekleyen mesaj varsa sayfa 304 ile geçilmez (mesaj gösterilmeli)
+        self.client.force_login(self.user)
+        self.client.get(url)
+        etag = self.client.get(url)["ETag"]
+        self.client.post(
+            reverse("yonetim:sube_ekle"),
+            {"ad": "Yeni", "tur": "cafe", "adres": "A", "telefon": "1", "yonetici": "Y"},
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Şube başarıyla eklendi.")
+
+
+@override_settings(
+    REPLIKA_VERITABANLARI=["replika_1"],
+    REPLIKA={"GECIKME_LIMITI": 5, "KONTROL_ARALIGI": 60, "YAPISKANLIK_SURESI": 10},
+)
+class ReplikaRouterTestCase(SimpleTestCase):
+    """Router kararları; gerçek bir replika bağlantısı gerektirmez."""
+
+    def setUp(self):
+        veritabani._replika_sagligi.clear()
+        self.router = veritabani.ReplikaRouter()
+
+    def test_replika_modu_disinda_birincilden_okur(self):
+        with mock.patch.object(veritabani, "gecikme", return_value=0):
+            self.assertIsNone(self.router.db_for_read(Sube))
+
+    def test_replika_modunda_replikadan_okur(self):
+        with mock.patch.object(veritabani, "gecikme", return_value=0):
+            with veritabani.replikadan_oku():
+                self.assertEqual(self.router.db_for_read(Sube), "replika_1")
+                # Oturum/kullanıcı tabloları hep birincilden
+                self.assertIsNone(self.router.db_for_read(User))
+            self.assertIsNone(self.router.db_for_read(Sube))
+
+    def test_yazma_her_zaman_birincile(self):
+        with veritabani.replikadan_oku():
+            self.assertEqual(self.router.db_for_write(Sube), "default")
+
+    def test_geride_kalan_replika_atlanir(self):
+        with mock.patch.object(veritabani, "gecikme", return_value=30):
+            with veritabani.replikadan_oku(), self.assertLogs("yonetim.veritabani", "WARNING"):
+                self.assertIsNone(self.router.db_for_read(Sube))
+
+    def test_birincilden_kopan_replika_atlanir(self):
+        with mock.patch.object(veritabani, "gecikme", return_value=None):
+            with veritabani.replikadan_oku(), self.assertLogs("yonetim.veritabani", "WARNING"):
+                self.assertIsNone(self.router.db_for_read(Sube))
+
+    def test_gecikme_wal_alicisi_akista_degilse_bilinmez(self):
+        baglanti = mock.MagicMock(vendor="postgresql")
+        cursor = baglanti.cursor.return_value.__enter__.return_value
+        for satir, beklenen in [
+            ((False, True, None), None),  # kopmuş: her şeyi uygulamış ama akış yok
+            ((True, True, 7200.0), 0.0),  # boşta bekleyen birincil
+            ((True, False, 3.5), 3.5),
+            ((True, False, None), None),
+        ]:
+            cursor.fetchone.return_value = satir
+            with mock.patch.object(veritabani, "connections", {"replika_1": baglanti}):
+                self.assertEqual(veritabani.gecikme("replika_1"), beklenen)
+
+    def test_erisilemeyen_replika_atlanir(self):
+        with mock.patch.object(veritabani, "gecikme", side_effect=DatabaseError):
+            with veritabani.replikadan_oku(), self.assertLogs("yonetim.veritabani", "ERROR"):
+                self.assertIsNone(self.router.db_for_read(Sube))
+
+    def test_saglik_kontrolu_onbellekte_tutulur(self):
+        with mock.patch.object(veritabani, "gecikme", return_value=0) as gecikme:
+            with veritabani.replikadan_oku():
+                for _ in range(3):
+                    self.router.db_for_read(Sube)
+        self.assertEqual(gecikme.call_count, 1)
+
+    def test_replikaya_migrate_edilmez(self):
+        self.assertFalse(self.router.allow_migrate("replika_1", "yonetim"))
+        self.assertIsNone(self.router.allow_migrate("default", "yonetim"))
+
+
+@override_settings(
+    REPLIKA_VERITABANLARI=["replika_1"],
+    REPLIKA={"GECIKME_LIMITI": 5, "KONTROL_ARALIGI": 60, "YAPISKANLIK_SURESI": 10},
+)
+class ReplikaMiddlewareTestCase(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.modlar = []
+
+        def get_response(request):
+            self.modlar.append(veritabani._replika_modu.get())
+            return HttpResponse("ok")
+
+        self.middleware = veritabani.ReplikaMiddleware(get_response)
+
+    def test_replika_yoksa_yuklenmez(self):
+        with override_settings(REPLIKA_VERITABANLARI=[]):
+            with self.assertRaises(MiddlewareNotUsed):
+                veritabani.ReplikaMiddleware(lambda request: HttpResponse())
+
+    def test_isaretli_view_replika_modunda_calisir(self):
+        self.middleware(self.factory.get(reverse("yonetim:ana_sayfa")))
+        self.middleware(self.factory.get(reverse("yonetim:export_personel_excel")))
+        self.assertEqual(self.modlar, [True, True])
+
+    def test_isaretsiz_view_birincilde_calisir(self):
+        self.middleware(self.factory.get(reverse("yonetim:sube_ekle")))
+        self.middleware(self.factory.get("/olmayan-sayfa/"))
+        self.assertEqual(self.modlar, [False, False])
+
+    async def test_async_zincirde_replika_modu_korunur(self):
+        async def get_response(request):
+            self.modlar.append(veritabani._replika_modu.get())
+            return HttpResponse("ok")
+
+        middleware = veritabani.ReplikaMiddleware(get_response)
+        await middleware(self.factory.get(reverse("yonetim:api_personel_by_sube")))
+        self.assertEqual(self.modlar, [True])
+        self.assertFalse(veritabani._replika_modu.get())
+
+    def test_yazmadan_sonra_birincile_yapisir(self):
+        response = self.middleware(self.factory.post(reverse("yonetim:sube_ekle")))
+        cerez = response.cookies["yonetim_birincil"]
+        self.assertEqual(cerez["max-age"], 10)
+        self.assertTrue(cerez["httponly"])
+
+        istek = self.factory.get(reverse("yonetim:ana_sayfa"))
+        istek.COOKIES["yonetim_birincil"] = "1"
+        self.middleware(istek)
+        self.assertEqual(self.modlar, [False, False])
+
+
+@skipUnless(
+    settings.REPLIKA_VERITABANLARI,
+    "DATABASE_REPLICA_URLS tanımlı değil (ör. sqlite:////tmp/replika.sqlite3)",
+)
+@override_settings(REPLIKA_VERITABANLARI=settings.REPLIKA_VERITABANLARI[:1])
+class ReplikaVeritabaniTestCase(TransactionTestCase):
+    """Gerçek ikinci bağlantıyla uçtan uca; testte replika birincilin aynasıdır."""
+
+    databases = {"default", *settings.REPLIKA_VERITABANLARI[:1]}
+
+    def setUp(self):
+        cache.clear()
+        veritabani._replika_sagligi.clear()
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "sifre")
+        self.sube = Sube.objects.create(
+            ad="Replika Şube", tur="cafe", adres="A", telefon="1", yonetici="Y"
+        )
+
+    def test_okumalar_replikaya_yazmalar_birincile_gider(self):
+        with veritabani.replikadan_oku():
+            with CaptureQueriesContext(connections["replika_1"]) as replika:
+                sube = Sube.objects.get(pk=self.sube.pk)
+            self.assertEqual(sube._state.db, "replika_1")
+            self.assertEqual(len(replika), 1)
+
+            sube.telefon = "2"
+            with CaptureQueriesContext(connections["replika_1"]) as replika:
+                sube.save()
+            self.assertEqual(len(replika), 0)
+
+    def test_rapor_sayfasi_replikadan_okur(self):
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connections["replika_1"]) as replika:
+            response = self.client.get(reverse("yonetim:subeler_listesi"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Replika Şube")
+        self.assertTrue(replika.captured_queries)
+
+    @override_settings(ONBELLEK_PAYLASIMLI=True)
+    def test_replikadan_okunan_sayfa_etag_tasimaz(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("yonetim:subeler_listesi"))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("ETag"))
+
+    def test_post_sonrasi_birincilden_okur(self):
+        self.client.force_login(self.user)
+        self.client.post(reverse("yonetim:sube_sil", args=[self.sube.pk]))
+        with CaptureQueriesContext(connections["replika_1"]) as replika:
+            self.client.get(reverse("yonetim:subeler_listesi"))
+        self.assertEqual(len(replika), 0)
+
+
+class VeritabaniDurumuTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("kullanici", password="sifre")
+        self.yonetici = User.objects.create_user("yonetici", password="sifre", is_staff=True)
+        self.url = reverse("yonetim:api_veritabani_durumu")
+
+    def test_yalnizca_yoneticiler_gorur(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_havuz_yoksa_bos_doner(self):
+        self.client.force_login(self.yonetici)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.json()["havuzlar"]["default"])
+
+    def test_havuz_istatistikleri_okunur(self):
+        havuz = mock.Mock()
+        havuz.get_stats.return_value = {"pool_size": 4, "pool_available": 3, "requests_waiting": 0}
+        with mock.patch.object(connections["default"], "pool", havuz, create=True):
+            self.assertEqual(veritabani.havuz_istatistikleri()["default"]["pool_size"], 4)
+
+
+@override_settings(ONBELLEK_PAYLASIMLI=True, REPLIKA_VERITABANLARI=[])
+class AnaSayfaOzetiApiTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cafe = Sube.objects.create(ad="Cafe", tur="cafe", adres="A", telefon="1", yonetici="Y")
+        self.otel = Sube.objects.create(ad="Otel", tur="otel", adres="A", telefon="2", yonetici="Y")
+        Personel.objects.create(
+            sube=self.cafe, ad="Ali", soyad="Test", pozisyon="Garson",
+            ise_baslama_tarihi=date(2024, 1, 1), telefon="3",
+        )
+        bugun = timezone.localdate()
+        GelirGider.objects.create(sube=self.cafe, tip="gelir", kategori="nakit", tutar=Decimal("300"), tarih=bugun)
+        GelirGider.objects.create(sube=self.cafe, tip="gider", kategori="nakit", tutar=Decimal("100"), tarih=bugun)
+        GelirGider.objects.create(sube=self.otel, tip="gelir", kategori="nakit", tutar=Decimal("50"), tarih=bugun)
+        self.user = User.objects.create_superuser("patron", password="sifre12345")
+        self.url = reverse("yonetim:api_ana_sayfa_ozeti")
+
+    async def test_async_ozet_toplamlari(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        veri = response.json()
+        self.assertEqual(veri["ay"], timezone.localdate().strftime("%Y-%m"))
+        self.assertEqual(Decimal(veri["toplam_gelir"]), Decimal("350"))
+        self.assertEqual(Decimal(veri["cafe_net"]), Decimal("200"))
+        self.assertEqual(veri["cafe_personel"], 1)
+        self.assertEqual(veri["toplam_sube"], 2)
+        cafe = next(s for s in veri["sube_ozetleri"] if s["id"] == self.cafe.pk)
+        self.assertEqual(Decimal(cafe["aylik_net_kar"]), Decimal("200"))
+        self.assertEqual(cafe["personel_sayisi"], 1)
+
+    def test_sube_muduru_goremez(self):
+        mudur = User.objects.create_user("mudur", password="sifre12345")
+        mudur.groups.add(Group.objects.get_or_create(name="Şube Müdürü")[0])
+        self.client.force_login(mudur)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_gecersiz_ay_bu_aya_duser(self):
+        self.client.force_login(self.user)
+        bu_ay = timezone.localdate().strftime("%Y-%m")
+        for params in [{"month": 13}, {"month": 0}, {"year": 99999}, {"month": "x"}]:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()["ay"], bu_ay)
+                response = self.client.get(reverse("yonetim:ana_sayfa"), params)
+                self.assertEqual(response.status_code, 200)
+
+    def test_giris_yapmamis_kullanici_yonlendirilir(self):
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+    def test_tur_ozetleri(self):
+        self.client.force_login(self.user)
+        turler = self.client.get(self.url).json()["turler"]
+        self.assertEqual(turler["cafe"]["sube_sayisi"], 1)
+        self.assertEqual(Decimal(turler["cafe"]["aylik_net"]), Decimal("200"))
+        self.assertEqual(Decimal(turler["otel"]["gelir"]), Decimal("50"))
+        self.assertEqual(turler["otel"]["personel"], 0)
+
+    def test_ozet_veri_surumu_boyunca_onbellekten_gelir(self):
+        self.client.force_login(self.user)
+        ilk = self.client.get(self.url)
+        self.assertIn("no-cache", ilk["Cache-Control"])
+        with CaptureQueriesContext(connection) as sorgular:
+            ikinci = self.client.get(self.url)
+        self.assertEqual(ikinci.json(), ilk.json())
+        self.assertFalse([q for q in sorgular if "yonetim_" in q["sql"]])
+
+        # ETag'i tutan istemci gövdesiz 304 alır
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=ilk["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_kayit_degisince_ozet_yenilenir(self):
+        self.client.force_login(self.user)
+        ilk = self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            GelirGider.objects.create(
+                sube=self.otel, tip="gelir", kategori="nakit", tutar=Decimal("25"),
+                tarih=timezone.localdate(),
+            )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=ilk["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], ilk["ETag"])
+        self.assertEqual(Decimal(response.json()["toplam_gelir"]), Decimal("375"))
+
+
+@override_settings(ONBELLEK_PAYLASIMLI=True, REPLIKA_VERITABANLARI=[])
+class ZamanSerisiApiTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.bugun = timezone.localdate()
+        self.bu_ay = self.bugun.replace(day=1)
+        self.gecen_ay = (self.bu_ay - timedelta(days=1)).replace(day=1)
+        self.cafe = Sube.objects.create(ad="Cafe", tur="cafe", adres="A", telefon="1", yonetici="Y")
+        self.otel = Sube.objects.create(ad="Otel", tur="otel", adres="A", telefon="2", yonetici="Y")
+        self._kayit(self.cafe, "gelir", "100", self.gecen_ay)
+        self._kayit(self.cafe, "gelir", "50", self.gecen_ay)
+        self._kayit(self.cafe, "gider", "30", self.gecen_ay)
+        self._kayit(self.otel, "gelir", "200", self.bu_ay)
+        personel = Personel.objects.create(
+            sube=self.cafe, ad="Ali", soyad="Test", pozisyon="Garson",
+            ise_baslama_tarihi=date(2024, 1, 1), telefon="3",
+        )
+        Mesai.objects.create(personel=personel, tarih=self.gecen_ay, saat=Decimal("2.5"))
+        Mesai.objects.create(personel=personel, tarih=self.bu_ay, saat=Decimal("4"))
+        self.user = User.objects.create_superuser("patron", password="sifre12345")
+        self.client.force_login(self.user)
+        self.url = reverse("yonetim:api_zaman_serisi", args=["gelir-gider"])
+
+    def _kayit(self, sube, tip, tutar, tarih):
+        return GelirGider.objects.create(
+            sube=sube, tip=tip, kategori="nakit", tutar=Decimal(tutar), tarih=tarih
+        )
+
+    def _seriler(self, veri):
+        return {
+            (s["ad"], s["sube"]): [Decimal(d) for d in s["degerler"]] for s in veri["seriler"]
+        }
+
+    def test_aylik_kovalar(self):
+        veri = self.client.get(
+            self.url, {"baslangic": self.gecen_ay, "bitis": self.bugun, "aralik": "ay"}
+        ).json()
+        self.assertEqual(veri["etiketler"], [self.gecen_ay.isoformat(), self.bu_ay.isoformat()])
+        seriler = self._seriler(veri)
+        self.assertEqual(seriler["gelir", None], [Decimal("150"), Decimal("200")])
+        self.assertEqual(seriler["gider", None], [Decimal("30"), Decimal("0")])
+
+    def test_gunluk_kovalar_bos_gunleri_sifirla_doldurur(self):
+        veri = self.client.get(
+            self.url, {"baslangic": self.gecen_ay, "bitis": self.gecen_ay + timedelta(days=2)}
+        ).json()
+        self.assertEqual(veri["aralik"], "gun")
+        self.assertEqual(self._seriler(veri)["gelir", None], [Decimal("150"), 0, 0])
+
+    def test_sube_ve_tur_filtreleri(self):
+        parametreler = {"baslangic": self.gecen_ay, "bitis": self.bugun, "aralik": "ay"}
+        veri = self.client.get(self.url, {**parametreler, "tur": "otel", "tip": "gelir"}).json()
+        self.assertEqual(self._seriler(veri), {("gelir", None): [0, Decimal("200")]})
+
+        veri = self.client.get(self.url, {**parametreler, "sube_bazinda": "1"}).json()
+        seriler = self._seriler(veri)
+        self.assertEqual(seriler["gelir", self.cafe.pk], [Decimal("150"), 0])
+        self.assertEqual(seriler["gelir", self.otel.pk], [0, Decimal("200")])
+        self.assertEqual(veri["seriler"][0]["sube_adi"], "Cafe")
+
+    def test_mesai_serisi(self):
+        url = reverse("yonetim:api_zaman_serisi", args=["mesai"])
+        veri = self.client.get(
+            url, {"baslangic": self.gecen_ay, "bitis": self.bugun, "aralik": "ay", "sube": self.cafe.pk}
+        ).json()
+        self.assertEqual(self._seriler(veri), {("mesai", None): [Decimal("2.5"), Decimal("4")]})
+
+    def test_uzun_aralik_seyreltilir_ve_sinirlanir(self):
+        veri = self.client.get(
+            self.url, {"baslangic": self.bugun - timedelta(days=1000), "bitis": self.bugun}
+        ).json()
+        self.assertEqual((veri["istenen_aralik"], veri["aralik"]), ("gun", "hafta"))
+        self.assertLessEqual(len(veri["etiketler"]), 400)
+
+        response = self.client.get(
+            self.url, {"baslangic": self.bugun - timedelta(days=5000), "bitis": self.bugun}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("hatalar", response.json())
+
+    def test_gecmis_kovalar_onbellekten_gelir(self):
+        parametreler = {"baslangic": self.gecen_ay, "bitis": self.bugun, "aralik": "ay"}
+        self.client.get(self.url, parametreler)
+        with CaptureQueriesContext(connection) as sorgular:
+            self.client.get(self.url, parametreler)
+        # Yalnızca bu ayın kovası yeniden hesaplanır
+        self.assertEqual(len([q for q in sorgular if "yonetim_gelirgider" in q["sql"]]), 1)
+
+        # Bu aya yazmak geçmişi eskitmez, geriye dönük yazmak eskitir
+        gecmis = onbellek.surum("gelir_gider_gecmis")
+        with self.captureOnCommitCallbacks(execute=True):
+            self._kayit(self.cafe, "gelir", "5", self.bugun)
+        self.assertEqual(onbellek.surum("gelir_gider_gecmis"), gecmis)
+        with self.captureOnCommitCallbacks(execute=True):
+            self._kayit(self.cafe, "gelir", "10", self.gecen_ay)
+            # Commit'ten önce dolan kapanmış kova yeni sürümün anahtarına düşmez
+            self.assertEqual(onbellek.surum("gelir_gider_gecmis"), gecmis)
+        self.assertGreater(onbellek.surum("gelir_gider_gecmis"), gecmis)
+        veri = self.client.get(self.url, parametreler).json()
+        self.assertEqual(self._seriler(veri)["gelir", None], [Decimal("160"), Decimal("205")])
+
+    def test_izin_ve_kaynak_denetlenir(self):
+        self.client.force_login(User.objects.create_user("misafir", password="sifre12345"))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.force_login(self.user)
+        url = reverse("yonetim:api_zaman_serisi", args=["bilinmeyen"])
+        self.assertEqual(self.client.get(url).status_code, 404)
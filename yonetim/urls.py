@@ -27,6 +27,7 @@ urlpatterns = [
     # Mesai işlemleri
     path("mesai/", views.mesai_listesi, name="mesai_listesi"),
     path("mesai/ekle/", views.mesai_ekle, name="mesai_ekle"),
+    path("mesai/toplu-ekle/", views.mesai_toplu_ekle, name="mesai_toplu_ekle"),
     path("mesai/<int:pk>/duzenle/", views.mesai_duzenle, name="mesai_duzenle"),
     path("mesai/<int:pk>/sil/", views.mesai_sil, name="mesai_sil"),
     path("mesai/print/", views.print_mesai_listesi, name="print_mesai_listesi"),
@@ -34,6 +35,11 @@ urlpatterns = [
     # Gelir/Gider işlemleri
     path("gelir-gider/", views.gelir_gider_listesi, name="gelir_gider_listesi"),
     path("gelir-gider/ekle/", views.gelir_gider_ekle, name="gelir_gider_ekle"),
+    path(
+        "gelir-gider/ice-aktar/",
+        views.gelir_gider_ice_aktar,
+        name="gelir_gider_ice_aktar",
+    ),
     path(
         "gelir-gider/<int:pk>/duzenle/",
         views.gelir_gider_duzenle,
@@ -50,8 +56,31 @@ urlpatterns = [
         views.export_gelir_gider_excel,
         name="export_gelir_gider_excel",
     ),
+    # Arka plan dışa aktarım işleri
+    path(
+        "disa-aktarim/<str:rapor>/baslat/",
+        views.disa_aktarim_baslat,
+        name="disa_aktarim_baslat",
+    ),
+    path(
+        "disa-aktarim/<int:pk>/", views.disa_aktarim_durum, name="disa_aktarim_durum"
+    ),
+    path(
+        "disa-aktarim/<int:pk>/indir/",
+        views.disa_aktarim_indir,
+        name="disa_aktarim_indir",
+    ),
     # API Endpoint'leri
     path(
         "api/personel-by-sube/", views.api_personel_by_sube, name="api_personel_by_sube"
     ),
+    path("api/ana-sayfa-ozeti/", views.api_ana_sayfa_ozeti, name="api_ana_sayfa_ozeti"),
+    path(
+        "api/zaman-serisi/<str:kaynak>/", views.api_zaman_serisi, name="api_zaman_serisi"
+    ),
+    path(
+        "api/veritabani-durumu/",
+        views.api_veritabani_durumu,
+        name="api_veritabani_durumu",
+    ),
 ]
@@ -0,0 +1,225 @@
+"""Rapor okumalarının replika veritabanlarına yönlendirilmesi.
+
+Ana sayfa, liste/yazdırma/dışa aktarım sayfaları ve personel seçenek API'si
+yalnızca okur; ay sonu raporları yöneticilerin mesai girişleriyle aynı
+veritabanında yarışmasın diye bu view'lar ``replikadan_okunabilir`` ile
+işaretlenir. ``ReplikaMiddleware`` işaretli bir view'a gelen güvenli (GET/HEAD)
+isteği ``replikadan_oku()`` bağlamında çalıştırır; ``ReplikaRouter`` da bu
+bağlamda ``yonetim`` modellerinin okumalarını gecikmesi sınırın altındaki
+replikalardan birine gönderir. Yazmalar, transaction içindeki okumalar ve
+diğer uygulamaların (oturum, kullanıcı) okumaları her zaman birincildedir.
+
+Yazdığını okuma: POST gibi veri değiştiren her istekten sonra tarayıcıya kısa
+ömürlü bir çerez bırakılır; çerez duruyorken o kullanıcının okumaları da
+birincile gider, az önce kaydettiği satırı replikada henüz yok diye kaçırmaz.
+
+Replikalar ``DATABASE_REPLICA_URLS`` ortam değişkeninden okunur (bkz.
+settings.py); tanımlı değilse middleware yüklenmez ve router hiçbir şeyi
+değiştirmez.
+
+Replika birincilin ``GECIKME_LIMITI`` kadar gerisinde olabilirken önbellek
+sürümleri birincilde çoktan artmıştır; replikadan okunan veri yeni sürümün
+anahtarıyla saklanırsa bir sonraki yazmaya kadar eski kalır. Bu yüzden
+``replika_modunda()`` iken önbellekten okunur ama yazılmaz, ETag de üretilmez
+(bkz. ``onbellek.yazilabilir``).
+
+``DB_POOL`` açıkken her bağlantının psycopg havuzu vardır;
+``havuz_istatistikleri`` havuz doluluğunu ve bekleyen istekleri döner.
+"""
+
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.urls import Resolver404, resolve
+
+logger = logging.getLogger(__name__)
+
+GUVENLI_METOTLAR = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+_replika_modu = ContextVar("yonetim_replika_modu", default=False)
+# alias -> (kontrol zamanı, uygun mu); süreç içinde kısa süreli saklanır
+_replika_sagligi = {}
+
+
+def replikalar():
+    return getattr(settings, "REPLIKA_VERITABANLARI", [])
+
+
+def _ayar(ad, varsayilan):
+    return getattr(settings, "REPLIKA", {}).get(ad, varsayilan)
+
+
+def replikadan_okunabilir(view):
+    """View'ı replikadan okunabilir olarak işaretler.
+
+    ``login_required`` gibi dekoratörler ``functools.wraps`` ile işareti dış
+    sarmalayıcıya taşıdığından en içte kullanılmalıdır.
+    """
+    view.replikadan_okunabilir = True
+    return view
+
+
+@contextmanager
+def replikadan_oku():
+    """Bu bağlamdaki ``yonetim`` okumalarının replikaya gitmesine izin verir."""
+    belirtec = _replika_modu.set(True)
+    try:
+        yield
+    finally:
+        _replika_modu.reset(belirtec)
+
+
+def replika_modunda():
+    """Bu bağlamdaki ``yonetim`` okumaları replikaya gidebiliyorsa True."""
+    return _replika_modu.get()
+
+
+def gecikme(alias):
+    """Replikanın birincilin kaç saniye gerisinde olduğunu döner.
+
+    Yalnızca PostgreSQL akış replikasyonunda ölçülebilir. Alınan ve uygulanan
+    WAL konumlarının eşitliği tek başına yetmez: birincilden kopmuş bir replika
+    da aldığı her şeyi uygulamıştır. Bu yüzden önce WAL alıcısının akışta
+    olduğuna bakılır; değilse ya da gecikme bilinemiyorsa (hiç işlem
+    uygulanmamış) None döner. Akıştaki replika tüm WAL'i uygulamışsa (boşta
+    bekleyen birincil) gecikme 0 sayılır. Diğer veritabanlarında 0 döner.
+    """
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return 0.0
+    with connection.cursor() as cursor:
+        # status yalnızca pg_read_all_stats üyelerine görünür, diğerlerine NULL
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE pid IS NOT NULL "
+            "AND COALESCE(status, 'streaming') = 'streaming'), "
+            "pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn(), "
+            "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+        )
+        akista, hepsi_uygulandi, saniye = cursor.fetchone()
+    if not akista:
+        return None
+    if hepsi_uygulandi:
+        return 0.0
+    return None if saniye is None else float(saniye)
+
+
+def replika_uygun_mu(alias):
+    """Replika erişilebilir, birincile bağlı ve gecikmesi ``GECIKME_LIMITI`` altındaysa True.
+
+    Sonuç ``KONTROL_ARALIGI`` saniye boyunca süreç içinde saklanır; her okuma
+    için ayrıca gecikme sorgusu atılmaz.
+    """
+    simdi = time.monotonic()
+    kayit = _replika_sagligi.get(alias)
+    if kayit and simdi - kayit[0] < _ayar("KONTROL_ARALIGI", 5):
+        return kayit[1]
+    try:
+        saniye = gecikme(alias)
+        uygun = saniye is not None and saniye <= _ayar("GECIKME_LIMITI", 5)
+        if saniye is None:
+            logger.warning("Replika %s birincile bağlı değil, birincil kullanılacak.", alias)
+        elif not uygun:
+            logger.warning("Replika %s %.1f sn geride, birincil kullanılacak.", alias, saniye)
+    except DatabaseError:
+        logger.exception("Replika %s erişilemiyor, birincil kullanılacak.", alias)
+        uygun = False
+    _replika_sagligi[alias] = (simdi, uygun)
+    return uygun
+
+
+def havuz_istatistikleri():
+    """Bu süreçteki bağlantı havuzlarının anlık durumu (alias -> istatistik).
+
+    Havuz kullanılmayan bağlantılar için değer None'dır. Alanların anlamı için
+    psycopg_pool ``ConnectionPool.get_stats`` belgesine bakılabilir; en
+    önemlileri ``pool_size``, ``pool_available`` ve ``requests_waiting``.
+    """
+    sonuc = {}
+    for alias in connections:
+        havuz = getattr(connections[alias], "pool", None)
+        sonuc[alias] = havuz.get_stats() if havuz is not None else None
+    return sonuc
+
+
+class ReplikaRouter:
+    def db_for_read(self, model, **hints):
+        if not replika_modunda() or model._meta.app_label != "yonetim":
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        adaylar = [alias for alias in replikalar() if replika_uygun_mu(alias)]
+        return random.choice(adaylar) if adaylar else None
+
+    def db_for_write(self, model, **hints):
+        # Replikadan okunmuş bir nesne kaydedilirken de birincile yazılsın
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Tüm veritabanları aynı verinin kopyasıdır
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in replikalar():
+            return False
+        return None
+
+
+class ReplikaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replikalar():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.cerez_adi = _ayar("YAPISKANLIK_CEREZI", "yonetim_birincil")
+        self.yapiskanlik_suresi = _ayar("YAPISKANLIK_SURESI", 10)
+
+    def _replikadan_okunabilir(self, request):
+        if request.method not in GUVENLI_METOTLAR or self.cerez_adi in request.COOKIES:
+            return False
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return False
+        return getattr(match.func, "replikadan_okunabilir", False)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if self._replikadan_okunabilir(request):
+            with replikadan_oku():
+                response = self.get_response(request)
+        else:
+            response = self.get_response(request)
+        return self._yapiskan_yap(request, response)
+
+    async def __acall__(self, request):
+        # Bağlam değişkeni sync_to_async ile çalışan ORM çağrılarına da geçer
+        if self._replikadan_okunabilir(request):
+            with replikadan_oku():
+                response = await self.get_response(request)
+        else:
+            response = await self.get_response(request)
+        return self._yapiskan_yap(request, response)
+
+    def _yapiskan_yap(self, request, response):
+        if request.method not in GUVENLI_METOTLAR:
+            response.set_cookie(
+                self.cerez_adi,
+                "1",
+                max_age=self.yapiskanlik_suresi,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
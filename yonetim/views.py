@@ -1,133 +1,162 @@
+from collections import defaultdict
 from datetime import timedelta
-import pandas as pd
-from openpyxl import Workbook
-from openpyxl.styles import Font
-from openpyxl.utils import get_column_letter
+from decimal import Decimal
 
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, FileResponse, Http404
+from django.core.exceptions import PermissionDenied
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import require_POST
+from django.conf import settings
 from django.contrib import messages
-from django.db.models import Sum, Count, Q, Case, When, Value, F
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db.models import Sum, Count, Max, Q, Value, F, OuterRef, Subquery
 from django.db.models.fields import DecimalField
+from django.db.models.functions import Coalesce, Concat
 from django.core.paginator import Paginator
 from django.utils import timezone
 from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib.auth import login
 from django.contrib.auth.forms import AuthenticationForm
 from django.urls import reverse
-
-from .models import Sube, Personel, GelirGider, Mesai
-from .forms import SubeForm, PersonelForm, GelirGiderForm, MesaiForm
-
-def _get_month_date_range(request):
-    today = timezone.now().date()
-    try:
-        year = int(request.GET.get("year", today.year))
-        month = int(request.GET.get("month", today.month))
-    except (ValueError, TypeError):
-        year = today.year
-        month = today.month
-
-    start_date = today.replace(year=year, month=month, day=1)
-    if month == 12:
-        end_date = start_date.replace(year=year + 1, month=1)
-    else:
-        end_date = start_date.replace(month=month + 1)
-    return start_date, end_date, year, month
-
-
-@login_required
-def ana_sayfa(request):
-    if request.user.groups.filter(name="Şube Müdürü").exists():
-        return redirect("yonetim:mesai_listesi")
-
-    today = timezone.now().date()
-    try:
-        year = int(request.GET.get("year", today.year))
-        month = int(request.GET.get("month", today.month))
-    except (ValueError, TypeError):
-        year = today.year
-        month = today.month
-
-    start_date = today.replace(year=year, month=month, day=1)
-    if month == 12:
-        end_date = start_date.replace(year=year + 1, month=1) - timedelta(days=1)
-    else:
-        end_date = start_date.replace(month=month + 1) - timedelta(days=1)
-
-    # Optimize edilmiş sorgu
-    sube_ozetleri = Sube.objects.annotate(
-        aylik_gelir=Sum(
-            Case(
-                When(
-                    gelirgider__tip="gelir",
-                    gelirgider__tarih__range=[start_date, end_date],
-                    then="gelirgider__tutar",
+from django.utils.functional import SimpleLazyObject
+
+from .models import Sube, Personel, GelirGider, Mesai, SubeAylikOzet, DisaAktarimIsi
+from .forms import (
+    SubeForm,
+    PersonelForm,
+    GelirGiderForm,
+    MesaiForm,
+    GelirGiderIceAktarimForm,
+    TopluMesaiFormSet,
+    TopluMesaiSecimForm,
+)
+from .ice_aktarim import GelirGiderIceAktarici, IceAktarimHatasi, dosya_bicimi
+from . import onbellek
+from .excel import xlsx_yaniti
+from .roller import sube_muduru_mu
+from .veritabani import (
+    havuz_istatistikleri,
+    replika_uygun_mu,
+    replikadan_okunabilir,
+    replikalar,
+)
+from .sayfalama import (
+    VARSAYILAN_SAYFA_BOYUTU,
+    SayisiBilinenPaginator,
+    imlec_modu,
+    imlec_sayfasi,
+    sayfa_boyutu,
+)
+from .filtreler import AySecimFormu, GelirGiderFiltresi, MesaiFiltresi, PersonelFiltresi
+from .zaman_serisi import SERILER, ZamanSerisiFormu
+from .raporlar import (
+    RAPORLAR,
+    BosRaporHatasi,
+    personel_excel_yaz,
+    gelir_gider_excel_yaz,
+    mesai_excel_yaz,
+    personel_yazdir_baglami,
+    mesai_yazdir_baglami,
+    gelir_gider_yazdir_baglami,
+)
+
+
+def _sube_ozetleri_sorgusu(start_date):
+    """Şube bazında aylık özet ve personel sayısı tek sorguda, özet tablosundan."""
+    return (
+        Sube.objects.annotate(
+            aylik_gelir=Coalesce(
+                Sum(
+                    "aylik_ozetler__toplam",
+                    filter=Q(aylik_ozetler__ay=start_date, aylik_ozetler__tip="gelir"),
                 ),
-                default=Value(0),
+                Value(Decimal("0.00")),
                 output_field=DecimalField(),
-            )
-        ),
-        aylik_gider=Sum(
-            Case(
-                When(
-                    gelirgider__tip="gider",
-                    gelirgider__tarih__range=[start_date, end_date],
-                    then="gelirgider__tutar",
+            ),
+            aylik_gider=Coalesce(
+                Sum(
+                    "aylik_ozetler__toplam",
+                    filter=Q(aylik_ozetler__ay=start_date, aylik_ozetler__tip="gider"),
                 ),
-                default=Value(0),
+                Value(Decimal("0.00")),
                 output_field=DecimalField(),
-            )
-        ),
-    ).annotate(aylik_net_kar=F("aylik_gelir") - F("aylik_gider"))
-
-    # Genel toplamlar için ayrı sorgular (bunlar zaten verimli)
-    toplam_gelir = (
-        GelirGider.objects.filter(tip="gelir").aggregate(toplam=Sum("tutar"))["toplam"]
-        or 0
-    )
-    toplam_gider = (
-        GelirGider.objects.filter(tip="gider").aggregate(toplam=Sum("tutar"))["toplam"]
-        or 0
+            ),
+            _personel_sayisi=Coalesce(
+                Subquery(
+                    Personel.objects.filter(sube=OuterRef("pk"))
+                    .order_by()
+                    .values("sube")
+                    .annotate(adet=Count("id"))
+                    .values("adet")
+                ),
+                0,
+            ),
+        ).annotate(aylik_net_kar=F("aylik_gelir") - F("aylik_gider"))
     )
-    net_kar = toplam_gelir - toplam_gider
-    toplam_personel = Personel.objects.count()
-    toplam_sube = Sube.objects.count()
-    cafe_sube_sayisi = Sube.objects.filter(tur="cafe").count()
-    otel_sube_sayisi = Sube.objects.filter(tur="otel").count()
-    cafe_gelir = (
-        GelirGider.objects.filter(tip="gelir", sube__tur="cafe").aggregate(
-            toplam=Sum("tutar")
-        )["toplam"]
-        or 0
+
+
+def _tur_toplamlari_sorgusu():
+    """Tüm zamanlar için tür/tip kırılımlı toplamlar tek gruplu sorguda."""
+    return (
+        SubeAylikOzet.objects.values("sube__tur", "tip")
+        .annotate(toplam=Sum("toplam"))
+        .order_by()
     )
-    cafe_gider = (
-        GelirGider.objects.filter(tip="gider", sube__tur="cafe").aggregate(
-            toplam=Sum("tutar")
-        )["toplam"]
-        or 0
+
+
+def _ana_sayfa_istatistikleri(start_date):
+    """Ana sayfadaki genel, tür bazında ve aylık şube toplamları."""
+    return _istatistikleri_birlestir(
+        list(_sube_ozetleri_sorgusu(start_date)), list(_tur_toplamlari_sorgusu())
     )
+
+
+async def _ana_sayfa_istatistikleri_async(start_date):
+    """``_ana_sayfa_istatistikleri``'nin async ORM ile yazılmışı.
+
+    Async ORM sorguları tek bir thread-sensitive iş parçacığında sırayla
+    çalıştığından iki sorgu da sırayla beklenir; kazanç sorgu sürerken event
+    loop'un başka istekleri işleyebilmesidir, sorguların paralel koşması değil.
+    """
+    sube_ozetleri = [satir async for satir in _sube_ozetleri_sorgusu(start_date)]
+    tur_satirlari = [satir async for satir in _tur_toplamlari_sorgusu()]
+    return _istatistikleri_birlestir(sube_ozetleri, tur_satirlari)
+
+
+def _istatistikleri_birlestir(sube_ozetleri, tur_satirlari):
+    tur_toplamlari = {
+        (satir["sube__tur"], satir["tip"]): satir["toplam"] for satir in tur_satirlari
+    }
+
+    def _tur_toplami(tur, tip):
+        return tur_toplamlari.get((tur, tip)) or 0
+
+    cafe_gelir = _tur_toplami("cafe", "gelir")
+    cafe_gider = _tur_toplami("cafe", "gider")
     cafe_net = cafe_gelir - cafe_gider
-    cafe_personel = Personel.objects.filter(sube__tur="cafe").count()
-    otel_gelir = (
-        GelirGider.objects.filter(tip="gelir", sube__tur="otel").aggregate(
-            toplam=Sum("tutar")
-        )["toplam"]
-        or 0
+    otel_gelir = _tur_toplami("otel", "gelir")
+    otel_gider = _tur_toplami("otel", "gider")
+    otel_net = otel_gelir - otel_gider
+
+    toplam_gelir = sum(
+        (t for (tur, tip), t in tur_toplamlari.items() if tip == "gelir"), 0
     )
-    otel_gider = (
-        GelirGider.objects.filter(tip="gider", sube__tur="otel").aggregate(
-            toplam=Sum("tutar")
-        )["toplam"]
-        or 0
+    toplam_gider = sum(
+        (t for (tur, tip), t in tur_toplamlari.items() if tip == "gider"), 0
     )
-    otel_net = otel_gelir - otel_gider
-    otel_personel = Personel.objects.filter(sube__tur="otel").count()
+    net_kar = toplam_gelir - toplam_gider
 
-    prev_month_date = start_date - timedelta(days=1)
-    next_month_date = end_date + timedelta(days=1)
+    toplam_sube = len(sube_ozetleri)
+    cafe_sube_sayisi = sum(1 for s in sube_ozetleri if s.tur == "cafe")
+    otel_sube_sayisi = sum(1 for s in sube_ozetleri if s.tur == "otel")
+    toplam_personel = sum(s._personel_sayisi for s in sube_ozetleri)
+    cafe_personel = sum(s._personel_sayisi for s in sube_ozetleri if s.tur == "cafe")
+    otel_personel = sum(s._personel_sayisi for s in sube_ozetleri if s.tur == "otel")
 
-    context = {
+    return {
         "toplam_gelir": toplam_gelir,
         "toplam_gider": toplam_gider,
         "net_kar": net_kar,
@@ -144,38 +173,96 @@ def ana_sayfa(request):
         "otel_net": otel_net,
         "otel_personel": otel_personel,
         "sube_ozetleri": sube_ozetleri,
+    }
+
+
+def _secili_ay(request):
+    """``year``/``month`` parametrelerindeki ayın ilk günü; geçersizse bu ay.
+
+    ``month=13`` gibi aralık dışı değerler de geçersizdir; önbellek anahtarına
+    yalnızca doğrulanmış ay girer.
+    """
+    today = timezone.now().date()
+    form = AySecimFormu(request.GET)
+    if not form.is_valid():
+        return today.replace(day=1)
+    year = form.cleaned_data["year"] or today.year
+    month = form.cleaned_data["month"] or today.month
+    return today.replace(year=year, month=month, day=1)
+
+
+@login_required
+@onbellek.kosullu_sayfa(GelirGider, Personel, Sube)
+@replikadan_okunabilir
+def ana_sayfa(request):
+    if sube_muduru_mu(request.user):
+        return redirect("yonetim:mesai_listesi")
+
+    today = timezone.now().date()
+    start_date = _secili_ay(request)
+    if start_date.month == 12:
+        end_date = start_date.replace(year=start_date.year + 1, month=1) - timedelta(days=1)
+    else:
+        end_date = start_date.replace(month=start_date.month + 1) - timedelta(days=1)
+
+    prev_month_date = start_date - timedelta(days=1)
+    next_month_date = end_date + timedelta(days=1)
+
+    context = {
+        # Ağır toplamlar yalnızca şablon parçası önbellekte yoksa hesaplanır
+        "istatistik": SimpleLazyObject(lambda: _ana_sayfa_istatistikleri(start_date)),
         "current_date": start_date,
         "prev_month": {"year": prev_month_date.year, "month": prev_month_date.month},
         "next_month": {"year": next_month_date.year, "month": next_month_date.month},
         "today": today,
+        **onbellek.parca_baglami(onbellek.ANA_SAYFA),
     }
     return render(request, "yonetim/ana_sayfa.html", context)
 
 
+def _sube_toplamlari(subeler):
+    """Şubelere personel sayısı ve gelir/gider/net toplamlarını ekler.
+
+    Her toplam şube başına ayrı bir ilişkili alt sorgudur (``Subquery`` +
+    ``OuterRef``). Personel ve gelir/gider tabloları aynı sorguda
+    birleştirilmediği için toplamlar personel sayısıyla çarpılmaz; maliyet
+    gelir/gider satır sayısıyla doğrusal artar ve ``(sube, tip, ...)``
+    indeksini kullanır.
+    """
+    tutar_alani = DecimalField(max_digits=14, decimal_places=2)
+    gelir_giderler = GelirGider.objects.filter(sube=OuterRef("pk")).order_by().values("sube")
+
+    def tip_toplami(tip):
+        return Coalesce(
+            Subquery(
+                gelir_giderler.filter(tip=tip).annotate(toplam=Sum("tutar")).values("toplam")
+            ),
+            Value(Decimal("0.00")),
+            output_field=tutar_alani,
+        )
+
+    return subeler.annotate(
+        personel_sayisi=Coalesce(
+            Subquery(
+                Personel.objects.filter(sube=OuterRef("pk"))
+                .order_by()
+                .values("sube")
+                .annotate(adet=Count("id"))
+                .values("adet")
+            ),
+            0,
+        ),
+        toplam_gelir=tip_toplami("gelir"),
+        toplam_gider=tip_toplami("gider"),
+    ).annotate(net_kar=F("toplam_gelir") - F("toplam_gider"))
+
+
 @login_required
 @permission_required("yonetim.view_sube", raise_exception=True)
+@onbellek.kosullu_sayfa(Sube, Personel, GelirGider)
+@replikadan_okunabilir
 def subeler_listesi(request):
-    subeler_query = (
-        Sube.objects.annotate(
-            personel_sayisi=Count("personel", distinct=True),
-            toplam_gelir=Sum(
-                Case(
-                    When(gelirgider__tip="gelir", then="gelirgider__tutar"),
-                    default=Value(0),
-                    output_field=DecimalField(),
-                )
-            ),
-            toplam_gider=Sum(
-                Case(
-                    When(gelirgider__tip="gider", then="gelirgider__tutar"),
-                    default=Value(0),
-                    output_field=DecimalField(),
-                )
-            ),
-        )
-        .annotate(net_kar=F("toplam_gelir") - F("toplam_gider"))
-        .order_by("-ad")
-    )
+    subeler_query = _sube_toplamlari(Sube.objects.all()).order_by("-ad")
 
     q = request.GET.get("q")
     if q:
@@ -183,11 +270,14 @@ def subeler_listesi(request):
 
     paginator = Paginator(subeler_query, 10)
     page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    # Sayfa (COUNT + toplamlar) yalnızca şablon parçası önbellekte yoksa sorgulanır
+    page_obj = SimpleLazyObject(lambda: paginator.get_page(page_number))
     context = {
         "page_obj": page_obj,
         "subeler": page_obj,
+        "page_number": page_number,
         "q": q,
+        **onbellek.parca_baglami(onbellek.SUBELER_LISTESI),
     }
     return render(request, "yonetim/subeler_listesi.html", context)
 
@@ -240,33 +330,30 @@ def sube_sil(request, pk):
 
 @login_required
 @permission_required("yonetim.view_personel", raise_exception=True)
+@onbellek.kosullu_sayfa(Personel, Sube, Mesai)
+@replikadan_okunabilir
 def personel_listesi(request):
-    personeller_query = (
-        Personel.objects.select_related("sube")
-        .annotate(toplam_mesai_saati=Sum("mesai__saat"))
-        .order_by("ad", "soyad")
-    )
+    filtre = PersonelFiltresi(request.GET)
+    personeller_query = filtre.queryset().mesai_toplamlari()
 
-    sube_id = request.GET.get("sube")
-    if sube_id:
-        personeller_query = personeller_query.filter(sube_id=sube_id)
-
-    q = request.GET.get("q")
-    if q:
-        personeller_query = personeller_query.filter(
-            Q(ad__icontains=q) | Q(soyad__icontains=q) | Q(pozisyon__icontains=q)
+    if imlec_modu(request):
+        page_obj = imlec_sayfasi(
+            request, personeller_query, filtre.siralama, VARSAYILAN_SAYFA_BOYUTU
         )
-
-    paginator = Paginator(personeller_query, 15)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    else:
+        paginator = SayisiBilinenPaginator(
+            personeller_query, VARSAYILAN_SAYFA_BOYUTU, count=filtre.sayi()
+        )
+        page_number = request.GET.get("page")
+        page_obj = paginator.get_page(page_number)
 
     context = {
+        "imlec_modu": imlec_modu(request),
         "page_obj": page_obj,
         "personeller": page_obj,
         "subeler": Sube.objects.all(),
-        "q": q,
-        "secili_sube": sube_id,
+        "q": filtre.metin("q"),
+        "secili_sube": filtre.metin("sube"),
     }
     return render(request, "yonetim/personel_listesi.html", context)
 
@@ -319,48 +406,49 @@ def personel_sil(request, pk):
 
 @login_required
 @permission_required("yonetim.view_mesai", raise_exception=True)
+@onbellek.kosullu_sayfa(Mesai, Personel, Sube)
+@replikadan_okunabilir
 def mesai_listesi(request):
-    start_date, end_date, year, month = _get_month_date_range(request)
-
-    mesailer_query = Mesai.objects.select_related("personel", "personel__sube").filter(
-        tarih__gte=start_date, tarih__lt=end_date
-    )
-
-    personel_id = request.GET.get("personel")
-    if personel_id:
-        mesailer_query = mesailer_query.filter(personel_id=personel_id)
-    sube_id = request.GET.get("sube")
-    if sube_id:
-        mesailer_query = mesailer_query.filter(personel__sube_id=sube_id)
-    q = request.GET.get("q")
-    if q:
-        mesailer_query = mesailer_query.filter(
-            Q(personel__ad__icontains=q)
-            | Q(personel__soyad__icontains=q)
-            | Q(aciklama__icontains=q)
-        )
-
-    mesailer_query = mesailer_query.order_by("-tarih", "-saat")
-
-    toplam_mesai = mesailer_query.aggregate(Sum("saat"))["saat__sum"] or 0
-    personel_sayisi = mesailer_query.values("personel").distinct().count()
+    filtre = MesaiFiltresi(request.GET)
+    start_date, end_date = filtre.ay_baslangici, filtre.ay_bitisi
+    mesailer_query = filtre.queryset()
+
+    # Kayıt sayısı, toplam saat ve personel sayısı tek sorguda (yazdırma/dışa
+    # aktarımla aynı filtre anahtarı altında önbelleklenir)
+    ozet = filtre.ozet()
+    toplam_mesai = ozet["toplam_mesai"]
+    personel_sayisi = ozet["personel_sayisi"]
     ortalama_mesai = (toplam_mesai / personel_sayisi) if personel_sayisi > 0 else 0
 
-    paginator = Paginator(mesailer_query, 15)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    if imlec_modu(request):
+        # İmleç modunda sıralama benzersiz olmalı: "-saat" yerine "-id"
+        page_obj = imlec_sayfasi(
+            request, mesailer_query, ("-tarih", "-id"), VARSAYILAN_SAYFA_BOYUTU
+        )
+    else:
+        paginator = SayisiBilinenPaginator(
+            mesailer_query, VARSAYILAN_SAYFA_BOYUTU, count=ozet["kayit_sayisi"]
+        )
+        page_number = request.GET.get("page")
+        page_obj = paginator.get_page(page_number)
 
     prev_month_date = start_date - timedelta(days=1)
     next_month_date = end_date
 
     context = {
+        "imlec_modu": imlec_modu(request),
         "page_obj": page_obj,
         "mesailer": page_obj,
-        "personeller": Personel.objects.all(),
+        # Personel seçenekleri sayfaya gömülmez, açılınca API'den yüklenir
+        "secili_personel_nesnesi": (
+            Personel.objects.select_related("sube").filter(pk=filtre.get("personel")).first()
+            if filtre.get("personel")
+            else None
+        ),
         "subeler": Sube.objects.all(),
-        "q": q,
-        "secili_personel": personel_id,
-        "secili_sube": sube_id,
+        "q": filtre.metin("q"),
+        "secili_personel": filtre.metin("personel"),
+        "secili_sube": filtre.metin("sube"),
         "current_date": start_date,
         "prev_month": {"year": prev_month_date.year, "month": prev_month_date.month},
         "next_month": {"year": next_month_date.year, "month": next_month_date.month},
@@ -368,11 +456,11 @@ def mesai_listesi(request):
         "personel_sayisi": personel_sayisi,
         "ortalama_mesai": ortalama_mesai,
         "filtreler": {
-            "year": year,
-            "month": month,
-            "personel_id": personel_id,
-            "sube_id": sube_id,
-            "q": q,
+            "year": filtre.get("year"),
+            "month": filtre.get("month"),
+            "personel_id": filtre.metin("personel"),
+            "sube_id": filtre.metin("sube"),
+            "q": filtre.metin("q"),
         }
     }
     return render(request, "yonetim/mesai_listesi.html", context)
@@ -393,6 +481,86 @@ def mesai_ekle(request):
     return render(request, "yonetim/mesai_form.html", context)
 
 
+@login_required
+@permission_required("yonetim.add_mesai", raise_exception=True)
+def mesai_toplu_ekle(request):
+    """Bir şubenin tüm personeli için seçilen günün mesailerini tek seferde kaydeder.
+
+    Satırlar birlikte doğrulanır; herhangi bir satırda hata varsa hiçbir kayıt
+    eklenmez ve hatalar satırların yanında gösterilir.
+    """
+    veri = request.POST if request.method == "POST" else request.GET
+    secim_formu = TopluMesaiSecimForm(
+        veri if "sube" in veri else None,
+        initial={"tarih": timezone.localtime().date()},
+    )
+    formset = None
+    satirlar = []
+
+    if secim_formu.is_valid():
+        sube = secim_formu.cleaned_data["sube"]
+        tarih = secim_formu.cleaned_data["tarih"]
+        personeller = {p.pk: p for p in sube.personel_set.order_by("ad", "soyad", "id")}
+        mevcut_mesailer = defaultdict(list)
+        for personel_id, saat, aciklama in Mesai.objects.filter(
+            personel__sube=sube, tarih=tarih
+        ).values_list("personel_id", "saat", "aciklama"):
+            mevcut_mesailer[personel_id].append((saat, aciklama))
+
+        if request.method == "POST":
+            formset = TopluMesaiFormSet(request.POST, personeller=personeller)
+            if formset.is_valid():
+                for form in formset.forms:
+                    satir = form.cleaned_data
+                    if satir.get("saat") is not None and (
+                        satir["saat"],
+                        satir["aciklama"],
+                    ) in mevcut_mesailer[satir["personel"]]:
+                        form.add_error("saat", "Bu mesai kaydı zaten girilmiş.")
+                if not any(form.errors for form in formset.forms):
+                    yeni_mesailer = [
+                        Mesai(
+                            personel_id=satir["personel"],
+                            tarih=tarih,
+                            saat=satir["saat"],
+                            aciklama=satir["aciklama"],
+                        )
+                        for satir in formset.doldurulan_satirlar()
+                    ]
+                    if yeni_mesailer:
+                        Mesai.toplu_olustur(yeni_mesailer)
+                        messages.success(
+                            request, f"{len(yeni_mesailer)} mesai kaydı başarıyla eklendi."
+                        )
+                    else:
+                        messages.warning(request, "Saat girilmediği için kayıt eklenmedi.")
+                    return redirect(
+                        f"{reverse('yonetim:mesai_listesi')}?year={tarih.year}"
+                        f"&month={tarih.month}&sube={sube.pk}"
+                    )
+        else:
+            formset = TopluMesaiFormSet(
+                initial=[{"personel": pk} for pk in personeller], personeller=personeller
+            )
+
+        for form in formset.forms:
+            try:
+                personel_id = int(form["personel"].value())
+            except (TypeError, ValueError):
+                personel_id = None
+            mevcut = mevcut_mesailer.get(personel_id, [])
+            satirlar.append(
+                {
+                    "form": form,
+                    "personel": personeller.get(personel_id),
+                    "mevcut_saat": sum(saat for saat, _ in mevcut) if mevcut else None,
+                }
+            )
+
+    context = {"secim_formu": secim_formu, "formset": formset, "satirlar": satirlar}
+    return render(request, "yonetim/mesai_toplu_form.html", context)
+
+
 @login_required
 @permission_required("yonetim.change_mesai", raise_exception=True)
 def mesai_duzenle(request, pk):
@@ -426,270 +594,252 @@ def mesai_sil(request, pk):
 
 @login_required
 @permission_required("yonetim.view_mesai", raise_exception=True)
+@replikadan_okunabilir
 def print_mesai_listesi(request):
     """Mesai listesinin yazıcı dostu versiyonunu hazırlar."""
-    start_date, end_date, year, month = _get_month_date_range(request)
-
-    mesailer_query = Mesai.objects.select_related("personel", "personel__sube").filter(
-        tarih__gte=start_date, tarih__lt=end_date
-    )
-
-    personel_id = request.GET.get("personel")
-    if personel_id:
-        mesailer_query = mesailer_query.filter(personel_id=personel_id)
-    sube_id = request.GET.get("sube")
-    if sube_id:
-        mesailer_query = mesailer_query.filter(personel__sube_id=sube_id)
-    q = request.GET.get("q")
-    if q:
-        mesailer_query = mesailer_query.filter(
-            Q(personel__ad__icontains=q)
-            | Q(personel__soyad__icontains=q)
-            | Q(aciklama__icontains=q)
-        )
-
-    mesailer_query = mesailer_query.order_by("-tarih", "-saat")
-
-    context = {
-        "mesailer": mesailer_query,
-        "current_date": start_date,
-    }
+    context = mesai_yazdir_baglami(request.GET)
     return render(request, "yonetim/mesai_listesi_print.html", context)
 
 
 @login_required
 @permission_required("yonetim.view_personel", raise_exception=True)
+@replikadan_okunabilir
 def print_personel_listesi(request):
     """Personel listesinin yazıcı dostu versiyonunu hazırlar."""
-    personeller_query = (
-        Personel.objects.select_related("sube")
-        .annotate(toplam_mesai_saati=Sum("mesai__saat"))
-        .order_by("ad", "soyad")
-    )
-
-    sube_id = request.GET.get("sube")
-    if sube_id:
-        personeller_query = personeller_query.filter(sube_id=sube_id)
-
-    q = request.GET.get("q")
-    if q:
-        personeller_query = personeller_query.filter(
-            Q(ad__icontains=q) | Q(soyad__icontains=q) | Q(pozisyon__icontains=q)
-        )
-    context = {"personeller": personeller_query}
+    context = personel_yazdir_baglami(request.GET)
     return render(request, "yonetim/personel_listesi_print.html", context)
 
 
 @login_required
 @permission_required("yonetim.view_personel", raise_exception=True)
+@replikadan_okunabilir
 def export_personel_excel(request):
     """Personel listesini .xlsx olarak dışa aktarır."""
-    response = HttpResponse(
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-    )
-    response["Content-Disposition"] = 'attachment; filename="personel_listesi.xlsx"'
-
-    workbook = Workbook()
-    worksheet = workbook.active
-    worksheet.title = "Personel Listesi"
-
-    # Başlıkları yaz
-    headers = [
-        "Ad",
-        "Soyad",
-        "Pozisyon",
-        "Şube",
-        "İşe Başlama Tarihi",
-        "Telefon",
-        "Email",
-    ]
-    for col_num, header in enumerate(headers, 1):
-        cell = worksheet.cell(row=1, column=col_num)
-        cell.value = header
-
-    # Verileri filtrele ve yaz
-    personeller = Personel.objects.select_related("sube").all()
-    sube_id = request.GET.get("sube")
-    if sube_id:
-        personeller = personeller.filter(sube_id=sube_id)
-    q = request.GET.get("q")
-    if q:
-        personeller = personeller.filter(
-            Q(ad__icontains=q) | Q(soyad__icontains=q) | Q(pozisyon__icontains=q)
-        )
-
-    for row_num, personel in enumerate(personeller, 2):
-        worksheet.cell(row=row_num, column=1).value = personel.ad
-        worksheet.cell(row=row_num, column=2).value = personel.soyad
-        worksheet.cell(row=row_num, column=3).value = personel.pozisyon
-        worksheet.cell(row=row_num, column=4).value = personel.sube.ad
-        worksheet.cell(row=row_num, column=5).value = personel.ise_baslama_tarihi
-        worksheet.cell(row=row_num, column=6).value = personel.telefon
-        worksheet.cell(row=row_num, column=7).value = personel.email
-
-    workbook.save(response)
-    return response
+    return xlsx_yaniti(personel_excel_yaz, request.GET)
 
 
 @login_required
 @permission_required("yonetim.view_gelirgider", raise_exception=True)
+@replikadan_okunabilir
 def export_gelir_gider_excel(request):
     """Gelir/Gider listesini tek sayfalı bir .xlsx olarak dışa aktarır."""
-    gelir_giderler_qs = GelirGider.objects.select_related("sube").all()
-    tip = request.GET.get("tip")
-    if tip:
-        gelir_giderler_qs = gelir_giderler_qs.filter(tip=tip)
-    sube_id = request.GET.get("sube")
-    if sube_id:
-        gelir_giderler_qs = gelir_giderler_qs.filter(sube_id=sube_id)
-    baslangic = request.GET.get("baslangic")
-    if baslangic:
-        gelir_giderler_qs = gelir_giderler_qs.filter(tarih__gte=baslangic)
-    bitis = request.GET.get("bitis")
-    if bitis:
-        gelir_giderler_qs = gelir_giderler_qs.filter(tarih__lte=bitis)
-
-    if not gelir_giderler_qs.exists():
-        messages.warning(request, "Dışa aktarılacak veri bulunamadı.")
+    try:
+        return xlsx_yaniti(gelir_gider_excel_yaz, request.GET)
+    except BosRaporHatasi as e:
+        messages.warning(request, str(e))
         return redirect("yonetim:gelir_gider_listesi")
 
-    df = pd.DataFrame.from_records(
-        gelir_giderler_qs.values_list(
-            "sube__ad", "tip", "kategori", "tutar", "tarih", "aciklama"
-        ),
-        columns=["Şube", "Tip", "Kategori", "Tutar", "Tarih", "Açıklama"],
-    )
-    df["Kategori"] = df["Kategori"].apply(
-        lambda x: dict(GelirGider.KATEGORI_SECENEKLERI).get(x, x)
-    )
-    df["Tip"] = df["Tip"].apply(lambda x: dict(GelirGider.TIP_SECENEKLERI).get(x, x))
-
-    response = HttpResponse(
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-    )
-    response["Content-Disposition"] = (
-        f'attachment; filename="Gelir_Gider_Detay_{timezone.now().strftime("%Y-%m-%d")}.xlsx'
-    )
-
-    with pd.ExcelWriter(response, engine="openpyxl") as writer:
-        df.to_excel(writer, sheet_name="Gelir Gider Listesi", index=False)
-        worksheet = writer.sheets["Gelir Gider Listesi"]
-        header_font = Font(bold=True)
-        for cell in worksheet["1:1"]:
-            cell.font = header_font
-        for col_idx, col in enumerate(df.columns, 1):
-            worksheet.column_dimensions[get_column_letter(col_idx)].width = 20
-
-    return response
-
 
 @login_required
 @permission_required("yonetim.view_mesai", raise_exception=True)
+@replikadan_okunabilir
 def export_mesai_excel(request):
     """Mesai listesini ve personel bazında özetini .xlsx olarak dışa aktarır."""
-    today = timezone.now().date()
     try:
-        year = int(request.GET.get("year", today.year))
-        month = int(request.GET.get("month", today.month))
-    except (ValueError, TypeError):
-        year = today.year
-        month = today.month
-    start_date = today.replace(year=year, month=month, day=1)
-    if month == 12:
-        end_date = start_date.replace(year=year + 1, month=1)
-    else:
-        end_date = start_date.replace(month=month + 1)
+        return xlsx_yaniti(mesai_excel_yaz, request.GET)
+    except BosRaporHatasi as e:
+        messages.warning(request, str(e))
+        return redirect("yonetim:mesai_listesi")
 
-    mesailer_qs = Mesai.objects.select_related("personel", "personel__sube").filter(
-        tarih__gte=start_date, tarih__lt=end_date
-    )
 
-    personel_id = request.GET.get("personel")
-    if personel_id:
-        mesailer_qs = mesailer_qs.filter(personel_id=personel_id)
-    sube_id = request.GET.get("sube")
-    if sube_id:
-        mesailer_qs = mesailer_qs.filter(personel__sube_id=sube_id)
-    q = request.GET.get("q")
-    if q:
-        mesailer_qs = mesailer_qs.filter(
-            Q(personel__ad__icontains=q)
-            | Q(personel__soyad__icontains=q)
-            | Q(aciklama__icontains=q)
-        )
+def _is_durumu(is_):
+    veri = {
+        "id": is_.pk,
+        "rapor": is_.rapor,
+        "durum": is_.durum,
+        "durum_etiketi": is_.get_durum_display(),
+        "hata_mesaji": is_.hata_mesaji,
+        "durum_url": reverse("yonetim:disa_aktarim_durum", args=[is_.pk]),
+        "indir_url": None,
+    }
+    if is_.durum == "tamamlandi":
+        veri["indir_url"] = reverse("yonetim:disa_aktarim_indir", args=[is_.pk])
+    return veri
 
-    if not mesailer_qs.exists():
-        messages.warning(request, "Dışa aktarılacak mesai verisi bulunamadı.")
-        return redirect("yonetim:mesai_listesi")
 
-    df = pd.DataFrame.from_records(
-        mesailer_qs.values(
-            "personel__ad",
-            "personel__soyad",
-            "personel__sube__ad",
-            "tarih",
-            "saat",
-            "aciklama",
-        )
-    )
-    df["Personel"] = df["personel__ad"] + " " + df["personel__soyad"]
-    df = df.rename(
-        columns={
-            "personel__sube__ad": "Şube",
-            "tarih": "Tarih",
-            "saat": "Saat",
-            "aciklama": "Açıklama",
-        }
+@login_required
+@require_POST
+def disa_aktarim_baslat(request, rapor):
+    """Raporu arka plan kuyruğuna ekler ve hemen 202 ile döner.
+
+    Filtreler, senkron dışa aktarım linklerinde olduğu gibi sorgu dizesinden alınır.
+    """
+    if rapor not in RAPORLAR:
+        raise Http404("Bilinmeyen rapor.")
+    izin, _ = RAPORLAR[rapor]
+    if not request.user.has_perm(izin):
+        raise PermissionDenied
+    is_ = DisaAktarimIsi.objects.create(
+        kullanici=request.user, rapor=rapor, parametreler=request.GET.dict()
     )
-    df = df[["Personel", "Şube", "Tarih", "Saat", "Açıklama"]]
+    return JsonResponse(_is_durumu(is_), status=202)
+
+
+@login_required
+def disa_aktarim_durum(request, pk):
+    is_ = get_object_or_404(DisaAktarimIsi, pk=pk, kullanici=request.user)
+    return JsonResponse(_is_durumu(is_))
 
-    personel_ozet = df.groupby("Personel")["Saat"].sum().reset_index()
-    personel_ozet = personel_ozet.rename(columns={"Saat": "Toplam Mesai Saati"})
-    personel_ozet = personel_ozet.sort_values(by="Toplam Mesai Saati", ascending=False)
 
-    response = HttpResponse(
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+@login_required
+def disa_aktarim_indir(request, pk):
+    is_ = get_object_or_404(
+        DisaAktarimIsi, pk=pk, kullanici=request.user, durum="tamamlandi"
     )
-    response["Content-Disposition"] = (
-        f'attachment; filename="Mesai_Raporu_{year}-{month}.xlsx"'
+    return FileResponse(is_.dosya.open("rb"), as_attachment=True, filename=is_.dosya_adi)
+
+
+def _personel_secenekleri(request):
+    """``sube_id`` şubesinin personel sorgusu; şube verilmemişse boş sorgu.
+
+    Seçenekler şube seçildikçe yüklenir; tüm personel tablosu hiç dönmez.
+    """
+    sube_id = request.GET.get("sube_id")
+    if not sube_id:
+        return Personel.objects.none()
+    if not sube_id.isdigit():
+        raise Http404("Geçersiz şube.")
+    return Personel.objects.filter(sube_id=sube_id).order_by()
+
+
+def _personel_secenekleri_etag(request, surum):
+    son = surum["son"].timestamp() if surum["son"] else 0
+    return f"personel-{request.GET.get('sube_id', '')}-{surum['adet']}-{son}"
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@replikadan_okunabilir
+async def api_personel_by_sube(request):
+    """Personel seçenekleri: ``{"personeller": [[id, tam_ad, sube_id], ...]}``.
+
+    Model nesnesi oluşturulmaz; ad soyad veritabanında birleştirilir. İstemci
+    ``If-None-Match`` gönderirse ve liste değişmemişse 304 döner.
+    """
+    secenekler = _personel_secenekleri(request)
+    # Sürüm: kayıt sayısı ve son güncelleme zamanı. Sayı, silinen personeli de
+    # (son güncelleme değişmese bile) ETag'e yansıtır.
+    surum = await secenekler.aaggregate(adet=Count("id"), son=Max("guncelleme_tarihi"))
+
+    async def uret():
+        personeller = secenekler.order_by("ad", "soyad", "id").values_list(
+            "id", Concat("ad", Value(" "), "soyad"), "sube_id"
+        )
+        return JsonResponse({"personeller": [p async for p in personeller]})
+
+    return await onbellek.kosullu_yanit(
+        request, _personel_secenekleri_etag(request, surum), surum["son"], uret
     )
 
-    with pd.ExcelWriter(response, engine="openpyxl") as writer:
-        personel_ozet.to_excel(writer, sheet_name="Personel Mesai Özeti", index=False)
-        df.to_excel(writer, sheet_name="Tüm Mesai Kayıtları", index=False)
 
-        ozet_sheet = writer.sheets["Personel Mesai Özeti"]
-        detay_sheet = writer.sheets["Tüm Mesai Kayıtları"]
+def _sube_ozeti_json(sube):
+    return {
+        "id": sube.pk,
+        "ad": sube.ad,
+        "tur": sube.tur,
+        "aylik_gelir": sube.aylik_gelir,
+        "aylik_gider": sube.aylik_gider,
+        "aylik_net_kar": sube.aylik_net_kar,
+        "personel_sayisi": sube._personel_sayisi,
+    }
 
-        header_font = Font(bold=True)
-        for cell in ozet_sheet["1:1"]:
-            cell.font = header_font
-        for cell in detay_sheet["1:1"]:
-            cell.font = header_font
 
-        ozet_sheet.column_dimensions["A"].width = 30
-        ozet_sheet.column_dimensions["B"].width = 25
+def _tur_ozetleri(istatistik):
+    """Şube türü başına tüm zamanlar ve seçili ay toplamları."""
+    turler = {}
+    for tur, _ in Sube.TUR_SECENEKLERI:
+        subeler = [s for s in istatistik["sube_ozetleri"] if s["tur"] == tur]
+        aylik_gelir = sum((s["aylik_gelir"] for s in subeler), Decimal("0.00"))
+        aylik_gider = sum((s["aylik_gider"] for s in subeler), Decimal("0.00"))
+        turler[tur] = {
+            "sube_sayisi": len(subeler),
+            "personel": istatistik[f"{tur}_personel"],
+            "gelir": istatistik[f"{tur}_gelir"],
+            "gider": istatistik[f"{tur}_gider"],
+            "net": istatistik[f"{tur}_net"],
+            "aylik_gelir": aylik_gelir,
+            "aylik_gider": aylik_gider,
+            "aylik_net": aylik_gelir - aylik_gider,
+        }
+    return turler
 
-        detay_sheet.column_dimensions["A"].width = 30
-        detay_sheet.column_dimensions["B"].width = 20
-        detay_sheet.column_dimensions["C"].width = 15
-        detay_sheet.column_dimensions["D"].width = 10
-        detay_sheet.column_dimensions["E"].width = 40
 
-    return response
+async def _ana_sayfa_ozeti(start_date):
+    istatistik = await _ana_sayfa_istatistikleri_async(start_date)
+    istatistik["sube_ozetleri"] = [_sube_ozeti_json(s) for s in istatistik["sube_ozetleri"]]
+    return {
+        "ay": start_date.strftime("%Y-%m"),
+        **istatistik,
+        "turler": _tur_ozetleri(istatistik),
+    }
 
 
 @login_required
-def api_personel_by_sube(request):
-    sube_id = request.GET.get("sube_id")
-    personeller = Personel.objects.filter(sube_id=sube_id).order_by("ad")
-    data = {"personeller": [{"id": p.id, "tam_ad": p.tam_ad} for p in personeller]}
-    return JsonResponse(data)
+@cache_control(private=True, no_cache=True)
+@replikadan_okunabilir
+async def api_ana_sayfa_ozeti(request):
+    """Ana sayfadaki toplamların JSON hâli; ay ``year``/``month`` ile seçilir.
+
+    Yanıt veri sürümüne göre önbellekte tutulur: ana sayfayı etkileyen bir
+    kayıt değişene kadar her istek tek önbellek okumasıyla karşılanır, ETag'i
+    tutan istemciye gövdesiz 304 döner. Sonuç önbelleğe yazılamıyorsa
+    (paylaşılmayan önbellek, replikadan okuma) her istekte hesaplanır.
+    """
+    kullanici = await request.auser()
+    if await sync_to_async(sube_muduru_mu)(kullanici):
+        raise PermissionDenied
+    start_date = _secili_ay(request)
+    if not onbellek.yazilabilir():
+        return JsonResponse(await _ana_sayfa_ozeti(start_date))
+    surum = await onbellek.asurum(onbellek.ANA_SAYFA)
+    ay = start_date.strftime("%Y-%m")
+    anahtar = f"yonetim:ana_sayfa_ozeti:{surum}:{ay}"
+
+    async def uret():
+        ozet = await cache.aget(anahtar)
+        if ozet is None:
+            ozet = await _ana_sayfa_ozeti(start_date)
+            await cache.aset(anahtar, ozet, settings.PARCA_ONBELLEK_SURESI)
+        return JsonResponse(ozet)
+
+    return await onbellek.kosullu_yanit(request, f"ozet-{ay}-{surum}", None, uret)
+
+
+@login_required
+@replikadan_okunabilir
+def api_zaman_serisi(request, kaynak):
+    """Günlük/haftalık/aylık gelir-gider veya mesai serileri (bkz. zaman_serisi.py).
+
+    Parametreler: ``baslangic``, ``bitis``, ``aralik`` (gun/hafta/ay), ``sube``,
+    ``tur``, ``tip`` ve şube başına ayrı seri için ``sube_bazinda=1``.
+    """
+    if kaynak not in SERILER:
+        raise Http404("Bilinmeyen seri.")
+    izin, seri_sinifi = SERILER[kaynak]
+    if not request.user.has_perm(izin):
+        raise PermissionDenied
+    form = ZamanSerisiFormu(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"hatalar": form.errors.get_json_data()}, status=400)
+    return JsonResponse(seri_sinifi(form.cleaned_data).hesapla())
+
+
+@login_required
+def api_veritabani_durumu(request):
+    """Bağlantı havuzu ve replika durumu; yük testinde izlemek için (yalnızca yöneticiler)."""
+    if not request.user.is_staff:
+        raise PermissionDenied
+    return JsonResponse(
+        {
+            "havuzlar": havuz_istatistikleri(),
+            "replikalar": {alias: replika_uygun_mu(alias) for alias in replikalar()},
+        }
+    )
 
 
 def custom_login_view(request):
     if request.user.is_authenticated:
-        if request.user.groups.filter(name="Şube Müdürü").exists():
+        if sube_muduru_mu(request.user):
             return redirect("yonetim:mesai_listesi")
         return redirect("yonetim:ana_sayfa")
 
@@ -698,7 +848,7 @@ def custom_login_view(request):
         if form.is_valid():
             user = form.get_user()
             login(request, user)
-            if user.groups.filter(name="Şube Müdürü").exists():
+            if sube_muduru_mu(user):
                 return redirect("yonetim:mesai_listesi")
             if user.is_staff or user.is_superuser:
                 return redirect("/admin/")
@@ -712,50 +862,38 @@ def custom_login_view(request):
 
 @login_required
 @permission_required("yonetim.view_gelirgider", raise_exception=True)
+@onbellek.kosullu_sayfa(GelirGider, Sube)
+@replikadan_okunabilir
 def gelir_gider_listesi(request):
-    gelir_giderler_query = GelirGider.objects.select_related("sube").all()
-
-    tip = request.GET.get("tip")
-    if tip:
-        gelir_giderler_query = gelir_giderler_query.filter(tip=tip)
-    sube_id = request.GET.get("sube")
-    if sube_id:
-        gelir_giderler_query = gelir_giderler_query.filter(sube_id=sube_id)
-    baslangic = request.GET.get("baslangic")
-    if baslangic:
-        gelir_giderler_query = gelir_giderler_query.filter(tarih__gte=baslangic)
-    bitis = request.GET.get("bitis")
-    if bitis:
-        gelir_giderler_query = gelir_giderler_query.filter(tarih__lte=bitis)
-
-    gelir_giderler_query = gelir_giderler_query.order_by("-tarih", "-id")
-
-    per_page = request.GET.get("per_page", 15)  # Default to 15 items per page
-    try:
-        per_page = int(per_page)
-    except ValueError:
-        per_page = 15
+    filtre = GelirGiderFiltresi(request.GET)
+    gelir_giderler_query = filtre.queryset()
 
-    paginator = Paginator(gelir_giderler_query, per_page)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    per_page = sayfa_boyutu(request.GET.get("per_page"))
+    # Kayıt sayısı ve toplamlar tek sorguda; sayfalayıcı ayrıca COUNT(*) çalıştırmaz
+    ozet = filtre.ozet()
 
-    toplam_gelir = gelir_giderler_query.filter(tip="gelir").aggregate(toplam=Sum("tutar"))["toplam"] or 0
-    toplam_gider = gelir_giderler_query.filter(tip="gider").aggregate(toplam=Sum("tutar"))["toplam"] or 0
-    net_kar = toplam_gelir - toplam_gider
+    if imlec_modu(request):
+        page_obj = imlec_sayfasi(request, gelir_giderler_query, filtre.siralama, per_page)
+    else:
+        paginator = SayisiBilinenPaginator(
+            gelir_giderler_query, per_page, count=ozet["kayit_sayisi"]
+        )
+        page_number = request.GET.get("page")
+        page_obj = paginator.get_page(page_number)
 
     context = {
+        "imlec_modu": imlec_modu(request),
         "page_obj": page_obj,
         "gelir_giderler": page_obj,
         "subeler": Sube.objects.all(),
-        "secili_tip": tip,
-        "secili_sube": sube_id,
-        "baslangic": baslangic,
-        "bitis": bitis,
+        "secili_tip": filtre.metin("tip"),
+        "secili_sube": filtre.metin("sube"),
+        "baslangic": filtre.metin("baslangic"),
+        "bitis": filtre.metin("bitis"),
         "per_page": per_page,
-        "toplam_gelir": toplam_gelir,
-        "toplam_gider": toplam_gider,
-        "net_kar": net_kar,
+        "toplam_gelir": ozet["toplam_gelir"],
+        "toplam_gider": ozet["toplam_gider"],
+        "net_kar": ozet["net_kar"],
     }
     return render(request, "yonetim/gelir_gider_listesi.html", context)
 
@@ -775,6 +913,52 @@ def gelir_gider_ekle(request):
     return render(request, "yonetim/gelir_gider_form.html", context)
 
 
+@login_required
+@permission_required("yonetim.add_gelirgider", raise_exception=True)
+def gelir_gider_ice_aktar(request):
+    """POS/kasa dökümünü (.csv/.xlsx) toplu olarak içe aktarır.
+
+    ``ICE_AKTARIM_KUYRUK_ESIGI``'nden büyük dosyalar istek içinde işlenmez;
+    dosya saklanır ve içe aktarım ``run_export_worker`` kuyruğuna alınır.
+    Sonuç raporu iş bitince indirilebilir.
+    """
+    sonuc = kuyruk_isi = None
+    if request.method == "POST":
+        form = GelirGiderIceAktarimForm(request.POST, request.FILES)
+        dosya = form.cleaned_data["dosya"] if form.is_valid() else None
+        if dosya and dosya.size > settings.ICE_AKTARIM_KUYRUK_ESIGI:
+            is_ = DisaAktarimIsi.objects.create(
+                kullanici=request.user,
+                rapor="gelir_gider_ice_aktarim",
+                parametreler={
+                    "kaynak": default_storage.save(f"ice_aktarimlar/{dosya.name}", dosya),
+                    "bicim": dosya_bicimi(dosya.name),
+                    "kuru": form.cleaned_data["kuru"],
+                },
+            )
+            kuyruk_isi = _is_durumu(is_)
+            messages.info(request, f"Dosya arka planda içe aktarılıyor (iş #{is_.pk}).")
+        elif dosya:
+            try:
+                sonuc = GelirGiderIceAktarici().ice_aktar(
+                    dosya.file, dosya_bicimi(dosya.name), kuru=form.cleaned_data["kuru"]
+                )
+            except IceAktarimHatasi as e:
+                form.add_error("dosya", str(e))
+            else:
+                if form.cleaned_data["kuru"]:
+                    messages.info(request, f"Doğrulama tamamlandı: {sonuc.eklenen} kayıt eklenebilir.")
+                else:
+                    messages.success(request, f"{sonuc.eklenen} kayıt içe aktarıldı.")
+    else:
+        form = GelirGiderIceAktarimForm()
+    return render(
+        request,
+        "yonetim/gelir_gider_ice_aktar.html",
+        {"form": form, "sonuc": sonuc, "kuyruk_isi": kuyruk_isi},
+    )
+
+
 @login_required
 @permission_required("yonetim.change_gelirgider", raise_exception=True)
 def gelir_gider_duzenle(request, pk):
@@ -808,30 +992,10 @@ def gelir_gider_sil(request, pk):
 
 @login_required
 @permission_required("yonetim.view_gelirgider", raise_exception=True)
+@replikadan_okunabilir
 def print_gelir_gider_listesi(request):
     """Gelir/Gider listesinin yazıcı dostu versiyonunu hazırlar."""
-    gelir_giderler_query = GelirGider.objects.select_related("sube").all()
-
-    tip = request.GET.get("tip")
-    if tip:
-        gelir_giderler_query = gelir_giderler_query.filter(tip=tip)
-    sube_id = request.GET.get("sube")
-    if sube_id:
-        gelir_giderler_query = gelir_giderler_query.filter(sube_id=sube_id)
-    baslangic = request.GET.get("baslangic")
-    if baslangic:
-        gelir_giderler_query = gelir_giderler_query.filter(tarih__gte=baslangic)
-    bitis = request.GET.get("bitis")
-    if bitis:
-        gelir_giderler_query = gelir_giderler_query.filter(tarih__lte=bitis)
-
-    gelir_giderler_query = gelir_giderler_query.order_by("-tarih", "-id")
-
-    context = {
-        "gelir_giderler": gelir_giderler_query,
-        "baslangic": baslangic,
-        "bitis": bitis,
-    }
+    context = gelir_gider_yazdir_baglami(request.GET)
     return render(request, "yonetim/gelir_gider_listesi_print.html", context)
 
 # Kullanılmayan API endpointleri kaldırıldı veya yetkilendirildi.
\ No newline at end of file
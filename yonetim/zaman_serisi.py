@@ -0,0 +1,252 @@
+"""GelirGider ve Mesai için tarih kovalı zaman serileri (grafikler için).
+
+Kayıtlar veritabanında ``TruncDay``/``TruncWeek``/``TruncMonth`` ile günlük,
+haftalık veya aylık kovalara toplanır; uygulamaya yalnızca kova başına bir
+satır gelir. Boş kovalar sıfırla doldurulur, böylece her seri ``etiketler``
+ile aynı uzunluktadır.
+
+Uzun aralıklar seyreltilir: istenen aralıkla ``MAKS_NOKTA``'dan fazla kova
+çıkacaksa bir üst aralığa (gün -> hafta -> ay) geçilir. ``MAKS_GUN``'den uzun
+tarih aralıkları reddedilir.
+
+Bu aydan önceki kovalar kapanmış sayılır ve önbellekte tutulur; her istekte
+yalnızca içinde bulunulan dönem yeniden hesaplanır. Kapanmış kovalar geriye
+dönük bir kayıt yazıldığında ``onbellek.gecmis_yazildi`` ile eskir.
+"""
+
+import hashlib
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+from django import forms
+from django.db.models import Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from . import onbellek
+from .filtreler import TARIH_GIRIS_BICIMLERI
+from .models import GelirGider, Mesai, Personel, Sube
+
+ARALIKLAR = {"gun": TruncDay, "hafta": TruncWeek, "ay": TruncMonth}
+ARALIK_SECENEKLERI = [("gun", "Günlük"), ("hafta", "Haftalık"), ("ay", "Aylık")]
+MAKS_NOKTA = 400
+MAKS_GUN = 3660
+VARSAYILAN_GUN = 90
+# Kapanmış kovalar sürümle eskidiğinden süre yalnızca belleği geri kazanmak için
+GECMIS_ONBELLEK_SURESI = 24 * 60 * 60
+SIFIR = Decimal("0.00")
+
+
+def kova_baslangici(tarih, aralik):
+    if aralik == "hafta":
+        return tarih - timedelta(days=tarih.weekday())
+    if aralik == "ay":
+        return tarih.replace(day=1)
+    return tarih
+
+
+def sonraki_kova(kova, aralik):
+    if aralik == "hafta":
+        return kova + timedelta(days=7)
+    if aralik == "ay":
+        return (kova.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return kova + timedelta(days=1)
+
+
+def kovalar(baslangic, bitis, aralik):
+    kova = kova_baslangici(baslangic, aralik)
+    while kova <= bitis:
+        yield kova
+        kova = sonraki_kova(kova, aralik)
+
+
+class ZamanSerisiFormu(forms.Form):
+    baslangic = forms.DateField(required=False, input_formats=TARIH_GIRIS_BICIMLERI)
+    bitis = forms.DateField(required=False, input_formats=TARIH_GIRIS_BICIMLERI)
+    aralik = forms.ChoiceField(required=False, choices=ARALIK_SECENEKLERI)
+    sube = forms.IntegerField(required=False, min_value=1)
+    tur = forms.ChoiceField(required=False, choices=Sube.TUR_SECENEKLERI)
+    tip = forms.ChoiceField(required=False, choices=GelirGider.TIP_SECENEKLERI)
+    sube_bazinda = forms.BooleanField(required=False)
+
+    def clean(self):
+        veri = super().clean()
+        bitis = veri.get("bitis") or timezone.localdate()
+        baslangic = veri.get("baslangic") or bitis - timedelta(days=VARSAYILAN_GUN - 1)
+        if baslangic > bitis:
+            raise forms.ValidationError("Başlangıç tarihi bitişten sonra olamaz.")
+        if (bitis - baslangic).days + 1 > MAKS_GUN:
+            raise forms.ValidationError(f"Tarih aralığı en fazla {MAKS_GUN} gün olabilir.")
+        veri["baslangic"], veri["bitis"] = baslangic, bitis
+        return veri
+
+
+class ZamanSerisi:
+    """Doğrulanmış parametrelerden bir kaynağın kovalı serilerini üretir.
+
+    Alt sınıflar ``ad``, ``model``, ``deger_alani``, ``sube_alani`` ve
+    ``bagimli_modeller`` tanımlar; ``seri_alani`` verilirse (ör. gelir/gider
+    tipi) her değeri ayrı bir seri olur.
+    """
+
+    ad = None
+    model = None
+    deger_alani = None
+    sube_alani = None
+    seri_alani = None
+    seri_degerleri = ()
+    # Filtre sonucunu etkileyen diğer modeller (ör. şubenin türü)
+    bagimli_modeller = ()
+
+    def __init__(self, degerler):
+        self.degerler = degerler
+        self.baslangic = degerler["baslangic"]
+        self.bitis = degerler["bitis"]
+        self.istenen_aralik = degerler.get("aralik") or "gun"
+        self.aralik = self._aralik_sec()
+
+    def _aralik_sec(self):
+        """İstenen aralık ``MAKS_NOKTA``'dan fazla kova üretiyorsa seyreltir."""
+        sira = list(ARALIKLAR)
+        for aralik in sira[sira.index(self.istenen_aralik):]:
+            adet = sum(1 for _ in kovalar(self.baslangic, self.bitis, aralik))
+            if adet <= MAKS_NOKTA:
+                return aralik
+        return sira[-1]
+
+    def _sorgu(self, baslangic, bitis):
+        sorgu = self.model.objects.filter(tarih__gte=baslangic, tarih__lte=bitis)
+        if self.degerler.get("sube"):
+            sorgu = sorgu.filter(**{self.sube_alani: self.degerler["sube"]})
+        if self.degerler.get("tur"):
+            sorgu = sorgu.filter(**{f"{self.sube_alani}__tur": self.degerler["tur"]})
+        return sorgu
+
+    def _gruplar(self):
+        gruplar = []
+        if self.seri_alani:
+            gruplar.append(self.seri_alani)
+        if self.degerler.get("sube_bazinda"):
+            gruplar.append(self.sube_alani)
+        return gruplar
+
+    def _satirlar(self, baslangic, bitis):
+        """``[(kova, seri, şube, toplam), ...]``; tek bir gruplu sorgu."""
+        gruplar = self._gruplar()
+        sorgu = (
+            self._sorgu(baslangic, bitis)
+            .annotate(kova=ARALIKLAR[self.aralik]("tarih"))
+            .values("kova", *gruplar)
+            .annotate(toplam=Sum(self.deger_alani))
+            .order_by()
+        )
+        return [
+            (
+                satir["kova"],
+                satir.get(self.seri_alani) if self.seri_alani else self.ad,
+                satir.get(self.sube_alani),
+                satir["toplam"],
+            )
+            for satir in sorgu
+        ]
+
+    def _gecmis_anahtari(self, baslangic, bitis):
+        parametreler = {
+            "aralik": self.aralik,
+            "baslangic": baslangic.isoformat(),
+            "bitis": bitis.isoformat(),
+            **{
+                alan: self.degerler.get(alan)
+                for alan in ("sube", "tur", "tip", "sube_bazinda")
+            },
+        }
+        surumler = [onbellek.surum(onbellek.GECMIS_GRUPLARI[self.model._meta.model_name])]
+        surumler += [onbellek.surum(m._meta.model_name) for m in self.bagimli_modeller]
+        veri = json.dumps([parametreler, surumler], sort_keys=True)
+        return f"yonetim:zaman_serisi:{self.ad}:{hashlib.sha1(veri.encode()).hexdigest()}"
+
+    def hesapla(self):
+        # Bu ayın ilk gününü içeren kovadan öncesi kapanmıştır
+        kesim = kova_baslangici(timezone.localdate().replace(day=1), self.aralik)
+        satirlar = []
+        if self.baslangic < kesim:
+            gecmis_bitis = min(self.bitis, kesim - timedelta(days=1))
+            satirlar += onbellek.getir(
+                self._gecmis_anahtari(self.baslangic, gecmis_bitis),
+                lambda: self._satirlar(self.baslangic, gecmis_bitis),
+                GECMIS_ONBELLEK_SURESI,
+            )
+        if self.bitis >= kesim:
+            satirlar += self._satirlar(max(self.baslangic, kesim), self.bitis)
+        return self._seriler(satirlar)
+
+    def _seriler(self, satirlar):
+        etiketler = list(kovalar(self.baslangic, self.bitis, self.aralik))
+        sira = {kova: i for i, kova in enumerate(etiketler)}
+        seriler = {}
+        if not self.degerler.get("sube_bazinda"):
+            secili = self.degerler.get("tip") if self.seri_alani else None
+            for seri in self.seri_degerleri or (self.ad,):
+                if not secili or seri == secili:
+                    seriler[seri, None] = [SIFIR] * len(etiketler)
+        for kova, seri, sube_id, toplam in satirlar:
+            # Trunc sonucu saat dilimine göre datetime olabilir
+            kova = kova.date() if hasattr(kova, "date") else kova
+            degerler = seriler.setdefault((seri, sube_id), [SIFIR] * len(etiketler))
+            degerler[sira[kova]] += toplam
+        sube_adlari = {}
+        if self.degerler.get("sube_bazinda"):
+            sube_adlari = dict(
+                Sube.objects.filter(pk__in={s for _, s in seriler}).values_list("id", "ad")
+            )
+        return {
+            "kaynak": self.ad,
+            "aralik": self.aralik,
+            "istenen_aralik": self.istenen_aralik,
+            "baslangic": self.baslangic,
+            "bitis": self.bitis,
+            "etiketler": etiketler,
+            "seriler": [
+                {
+                    "ad": seri,
+                    "sube": sube_id,
+                    "sube_adi": sube_adlari.get(sube_id),
+                    "degerler": degerler,
+                }
+                for (seri, sube_id), degerler in sorted(
+                    seriler.items(), key=lambda x: (x[0][1] or 0, x[0][0])
+                )
+            ],
+        }
+
+
+class GelirGiderSerisi(ZamanSerisi):
+    ad = "gelir_gider"
+    model = GelirGider
+    deger_alani = "tutar"
+    sube_alani = "sube"
+    seri_alani = "tip"
+    seri_degerleri = tuple(kod for kod, _ in GelirGider.TIP_SECENEKLERI)
+    bagimli_modeller = (Sube,)
+
+    def _sorgu(self, baslangic, bitis):
+        sorgu = super()._sorgu(baslangic, bitis)
+        if self.degerler.get("tip"):
+            sorgu = sorgu.filter(tip=self.degerler["tip"])
+        return sorgu
+
+
+class MesaiSerisi(ZamanSerisi):
+    ad = "mesai"
+    model = Mesai
+    deger_alani = "saat"
+    sube_alani = "personel__sube"
+    # Personelin şubesi değişirse geçmiş mesailerin şube kırılımı da değişir
+    bagimli_modeller = (Sube, Personel)
+
+
+SERILER = {
+    "gelir-gider": ("yonetim.view_gelirgider", GelirGiderSerisi),
+    "mesai": ("yonetim.view_mesai", MesaiSerisi),
+}